@@ -1,4 +1,5 @@
 from pathlib import Path
+import json
 import os
 from decouple import config
 from dotenv import load_dotenv
@@ -50,6 +51,77 @@ try:
 except ValueError:
     RF_CLASSIFY_THRESHOLD = 0.1
 
+# 외부 HTTP 호출 공통 설정 (services/http_client.py)
+# 우선순위: HTTP_PROFILES[서비스]의 키 > 아래 공통 값. 프로필에 없는 키/서비스는 공통 값을 씀
+HTTP_CONNECT_TIMEOUT = float(config("HTTP_CONNECT_TIMEOUT", default="3.05"))
+HTTP_READ_TIMEOUT = float(config("HTTP_READ_TIMEOUT", default="20"))
+HTTP_RETRIES = int(config("HTTP_RETRIES", default="2"))
+# 서비스별 프로필(JSON): {"서비스": {"connect_timeout", "read_timeout", "retries"}}. OCR은 유료 호출이라 재시도 최소화
+HTTP_PROFILES = config(
+    "HTTP_PROFILES",
+    default='{"ocr": {"read_timeout": 30, "retries": 1}, "roboflow": {"retries": 3}, '
+            '"naver_datalab": {"read_timeout": 5, "retries": 1}}',
+    cast=json.loads,
+)
+HTTP_POOL_MAXSIZE = int(config("HTTP_POOL_MAXSIZE", default="10"))
+# 연속 실패 N회면 쿨다운(초) 동안 호출 차단
+HTTP_BREAKER_FAILURES = int(config("HTTP_BREAKER_FAILURES", default="5"))
+HTTP_BREAKER_COOLDOWN = float(config("HTTP_BREAKER_COOLDOWN", default="30"))
+
+# OCR 응답 캐시 (services/ocr_cache.py): 이미지 SHA-256 키, TTL(초)/최대 개수 초과 시 LRU 제거
+OCR_CACHE_DIR = config("OCR_CACHE_DIR", default=str(BASE_DIR / "ocr_cache"))
+OCR_CACHE_TTL = int(config("OCR_CACHE_TTL", default=str(30 * 24 * 3600)))
+OCR_CACHE_MAX_ENTRIES = int(config("OCR_CACHE_MAX_ENTRIES", default="1000"))
+# 거의 같은 사진(dHash 해밍 거리 이하)도 재사용할지
+OCR_CACHE_PHASH = config("OCR_CACHE_PHASH", default="false").lower() in ("1", "true", "yes", "y")
+OCR_CACHE_PHASH_DISTANCE = int(config("OCR_CACHE_PHASH_DISTANCE", default="4"))
+
+# 업로드 작업 큐 모드 (services/jobs.py): true면 업로드가 작업 id만 받고 바로 반환
+RECOGNITION_ASYNC = config("RECOGNITION_ASYNC", default="false").lower() in ("1", "true", "yes", "y")
+RECOGNITION_WORKERS = int(config("RECOGNITION_WORKERS", default="2"))
+# running 상태로 이 시간(초) 이상 멈춘 작업은 재시작 시 다시 큐에 넣음
+RECOGNITION_JOB_STALE_SECONDS = int(config("RECOGNITION_JOB_STALE_SECONDS", default="600"))
+# OCR/분류 동시 요청 스레드 수 (services/recognition.py)
+RECOGNITION_FANOUT_WORKERS = int(config("RECOGNITION_FANOUT_WORKERS", default="8"))
+
+# 업로드 이미지 전처리 (services/image_prep.py): OCR/분류에는 축소본 전송, 원본은 보관
+IMAGE_PREP_ENABLED = config("IMAGE_PREP_ENABLED", default="true").lower() in ("1", "true", "yes", "y")
+IMAGE_PREP_MAX_SIDE = int(config("IMAGE_PREP_MAX_SIDE", default="1600"))
+IMAGE_PREP_QUALITY = int(config("IMAGE_PREP_QUALITY", default="85"))
+IMAGE_PREP_CROP = config("IMAGE_PREP_CROP", default="true").lower() in ("1", "true", "yes", "y")
+
+# 인식 결과는 RecognitionResult 테이블에 저장. true면 output/*_result.json 파일도 함께 기록
+RESULT_JSON_EXPORT = config("RESULT_JSON_EXPORT", default="true").lower() in ("1", "true", "yes", "y")
+
+# 사전 인기 검색어 (services/trends.py): 네이버 DataLab 순위를 TrendRanking에 캐시
+# TTL이 지나면 페이지 요청이 백그라운드 갱신을 걸고(NAVER_TREND_BACKGROUND), cron이면 `manage.py refresh_trends`
+NAVER_TREND_TTL = int(config("NAVER_TREND_TTL", default=str(24 * 3600)))
+NAVER_TREND_RETRY_SECONDS = int(config("NAVER_TREND_RETRY_SECONDS", default="600"))
+NAVER_TREND_MONTHS = int(config("NAVER_TREND_MONTHS", default="3"))
+NAVER_TREND_TOP = int(config("NAVER_TREND_TOP", default="5"))
+NAVER_TREND_BACKGROUND = config("NAVER_TREND_BACKGROUND", default="true").lower() in ("1", "true", "yes", "y")
+
+# 정적 이미지 매니페스트(services/asset_manifest.py). 없으면 첫 사용 시 생성, 배포 시 `manage.py build_asset_manifest`
+ASSET_MANIFEST_PATH = config("ASSET_MANIFEST_PATH", default=str(BASE_DIR / "asset_manifest.json"))
+
+# 사전 즐겨찾기 제목 캐시(services/favorites.py, Django 캐시) 유지 시간(초). 쓰기 시 즉시 무효화
+FAVORITES_CACHE_TTL = int(config("FAVORITES_CACHE_TTL", default="300"))
+
+# 빨래방 위치 데이터(정규화된 열 단위 파일, services/laundromat_dataset.py). `manage.py ingest_laundromats`로 생성
+LAUNDROMAT_DATASET_PATH = config("LAUNDROMAT_DATASET_PATH", default=str(BASE_DIR / "laundromats.lmds"))
+
+# 소재 × 얼룩 가이드 행렬(services/guide_matrix.py). `manage.py build_guide_matrix`로 생성
+GUIDE_MATRIX_PATH = config("GUIDE_MATRIX_PATH", default=str(BASE_DIR / "guide_matrix.pkl"))
+
+# 추천 엔진(services/recommendation.py) 가이드 LRU 최대 개수. 지식 베이스 내용이 바뀌면 자동 비움
+RECOMMENDATION_CACHE_SIZE = int(config("RECOMMENDATION_CACHE_SIZE", default="1024"))
+
+# 일괄 추천 API(POST /api/recommend/batch) 요청당 최대 의류 수
+RECOMMEND_BATCH_MAX = int(config("RECOMMEND_BATCH_MAX", default="100"))
+
+# 텍스트 룰 엔진 추가 룰 파일(.json/.yaml). 비우면 services/text_rules.RULES만 사용
+TEXT_RULES_PATH = config("TEXT_RULES_PATH", default="")
+
 
 
 # social login
@@ -1,7 +1,8 @@
-import os
 import json
 import re
-from django.conf import settings
+from ..services import alias_index
+from ..services import knowledge_base as kb
+from ..services import result_store
 
 #경로 받아와서 json 불러오기
 def load_json(path):
@@ -143,20 +144,13 @@ def load_json(path):
 
 def first_info(filename: str = None,
                selected_materials: list = None,
-               selected_stains: list = None) -> dict:
+               selected_stains: list = None,
+               session_key: str = None,
+               user=None) -> dict:
 
-    # 경로 설정
-    base_dir = settings.BASE_DIR
-    if filename:
-        ocr_path = os.path.join(base_dir, 'output', f"{os.path.splitext(filename)[0]}_result.json")
-    material_path = os.path.join(base_dir, 'laundry_temp_json', 'blackup.json')
-    symbol_path = os.path.join(base_dir, 'laundry_manager', 'washing_symbol.json')
-    stain_path = os.path.join(base_dir, 'laundry_temp_json', 'persil_v2.json')
-
-    # 기준 데이터 로드
-    materials_data = load_json(material_path).get("material_washing_tips", [])
-    symbols_data = load_json(symbol_path)
-    stains_data = load_json(stain_path).get("washing_tips_categories", [])
+    # 기준 데이터 로드 (지식 베이스 레지스트리 캐시)
+    materials_data = kb.get_json(kb.MATERIALS).get("material_washing_tips", [])
+    symbols_data = kb.get_json(kb.SYMBOLS)
 
     # 기준 소재 정리
     valid_materials = set()
@@ -169,25 +163,18 @@ def first_info(filename: str = None,
     # 기준 심볼 정리
     valid_symbols = set()
     for entry in symbols_data:
-        valid_symbols.update(entry.get("id", []))
-
-    # 얼룩 분류
-    valid_stains = set()
-    for entry in stains_data:
-        title = entry.get("title", "")
-        if title:
-            clean_title = title.replace("제거법", "").strip()
-            valid_stains.add(clean_title)
+        if entry.get("id"):
+            valid_symbols.add(entry["id"])
 
     materials = []
     symbols = []
     stains = []
 
-    # OCR 결과 처리
+    # OCR 결과 처리 (요청 세션/사용자 범위에서 파일명으로 인덱스 조회)
     ocr_words = set()
-    if filename and os.path.exists(ocr_path):
-        ocr_json = load_json(ocr_path)
-        raw_texts = ocr_json.get("recognized_texts", [])
+    row = result_store.for_filename(filename, session_key, user) if filename else None
+    if row is not None:
+        raw_texts = row.recognized_texts or []
         joined_text = " ".join(raw_texts).lower()
         ocr_words = set(re.findall(r'[가-힣a-zA-Z0-9]+', joined_text))
 
@@ -200,26 +187,27 @@ def first_info(filename: str = None,
         if symbol.lower() in ocr_words:
             symbols.append(symbol)
 
-    # ✅ 사용자 선택 소재 (기준과 유사하면 사용자가 선택한 값 그대로 추가)
-    if selected_materials:
-        for material in selected_materials:
-            for valid in valid_materials:
-                if material in valid or valid in material:
-                    materials.append(material)
-                    break
-
-    # ✅ 사용자 선택 얼룩 (기준과 유사하면 사용자가 선택한 값 그대로 추가)
-    if selected_stains:
-        for stain in selected_stains:
-            for valid in valid_stains:
-                if stain in valid or valid in stain:
-                    stains.append(stain)
-                    break
+    # ✅ 사용자 선택 소재/얼룩 (별칭 색인으로 기준과 대조 — 부분 포함/오타 허용,
+    #    확실히 일치하면 사용자가 선택한 값 그대로 추가, 애매해도 점수 순 후보는 함께 반환)
+    candidates = {"materials": {}, "stains": {}}
+    for key, selected, index, picked in (
+        ("materials", selected_materials, alias_index.materials(), materials),
+        ("stains", selected_stains, alias_index.stains(), stains),
+    ):
+        for value in selected or []:
+            matches = index.match(value)
+            if alias_index.confident(value, matches):
+                picked.append(value)
+            if matches:
+                candidates[key][value] = [
+                    {"name": m.name, "score": m.score, "kind": m.kind} for m in matches
+                ]
 
     return {
         "materials": sorted(set(materials)),
         "symbols": sorted(set(symbols)),
-        "stains": sorted(set(stains))
+        "stains": sorted(set(stains)),
+        "candidates": candidates,
     }
 
 
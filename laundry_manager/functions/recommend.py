@@ -1,17 +1,5 @@
-import os
-from django.conf import settings
-import json
-
-json_dir = os.path.join(settings.BASE_DIR, 'laundry_manager', 'json_data')
-
-with open(os.path.join(json_dir, 'blackup.json'), 'r', encoding='utf-8') as f:
-    material_json = json.load(f)
-
-with open(os.path.join(json_dir, 'persil_v2.json'), 'r', encoding='utf-8') as f:
-    stain_json = json.load(f)
-
-with open(os.path.join(json_dir, 'washing_symbol.json'), 'r', encoding='utf-8') as f:
-    symbol_json = json.load(f)
+# 데이터는 호출하는 쪽이 kb.get_json(...)으로 매번 넘김(파일이 바뀌면 새 스냅샷)
+from ..services.symbol_matcher import matcher_for
 
 
 
@@ -45,17 +33,15 @@ def is_similar(keyword, user_input):
 
 
 def get_symbol_guide(symbols, symbol_json):
+    # 입력마다 is_similar 규칙으로 파일 순서상 첫 매칭 항목의 설명을 모음
+    # (정의 파일당 1회 빌드되는 매처 사용: 역색인 + Aho-Corasick)
+    matcher = matcher_for(symbol_json)
     symbol_results = []
 
     for user_input in symbols:
-        for item in symbol_json:
-            for keyword in item.get("keywords", []):
-                if is_similar(keyword, user_input):
-                    symbol_results.append(item["description"])
-                    break  # 한 항목 매칭되면 다음 user_input으로
-            else:
-                continue
-            break  # 중첩된 for문 빠져나오기
+        item = matcher.match_input(user_input)
+        if item is not None:
+            symbol_results.append(item["description"])
 
     return symbol_results
 
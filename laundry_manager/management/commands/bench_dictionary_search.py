@@ -0,0 +1,64 @@
+# laundry_manager/management/commands/bench_dictionary_search.py
+"""
+사전 검색 인덱스 지연 시간 측정. dictionary.json을 --scale배로 복제해 큰 사전을 흉내 낸다.
+
+    python manage.py bench_dictionary_search --scale 50 --queries 2000
+"""
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from laundry_manager.services import dictionary_search
+from laundry_manager.services import knowledge_base as kb
+
+
+def _pct(samples, p):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * p))] * 1000
+
+
+class Command(BaseCommand):
+    help = "사전 전문 검색(search/suggest) p50/p99 지연 시간 측정"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scale", type=int, default=50, help="사전 복제 배수")
+        parser.add_argument("--queries", type=int, default=2000)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **opts):
+        rng = random.Random(opts["seed"])
+        snap = kb.load(kb.DICTIONARY)
+        docs = []
+        for n in range(opts["scale"]):
+            for doc in dictionary_search.build_docs(snap):
+                item = dict(doc["item"])
+                item["title"] = f"{item['title']} {n}" if n else item["title"]
+                docs.append({**doc, "title": item["title"], "item": item})
+
+        start = time.perf_counter()
+        index = dictionary_search.SearchIndex(docs)
+        self.stdout.write(f"문서 {len(index)}개, gram {len(index.postings)}개, 생성 {(time.perf_counter() - start):.2f}s")
+
+        titles = [d["title"] for d in dictionary_search.build_docs(snap)]
+        queries = []
+        for _ in range(opts["queries"]):
+            t = rng.choice(titles)
+            words = t.split()
+            kind = rng.random()
+            if kind < 0.4:
+                queries.append(rng.choice(words))
+            elif kind < 0.7:
+                queries.append(t[: rng.randint(1, max(1, len(t) - 1))])  # 입력 중 접두
+            else:
+                queries.append(" ".join(words[:2]))
+
+        for name, fn in (("search", index.search), ("suggest", index.suggest)):
+            samples = []
+            for q in queries:
+                t0 = time.perf_counter()
+                fn(q)
+                samples.append(time.perf_counter() - t0)
+            self.stdout.write(
+                f"{name:<8} p50 {_pct(samples, 0.5):.3f}ms  p99 {_pct(samples, 0.99):.3f}ms  max {max(samples) * 1000:.3f}ms"
+            )
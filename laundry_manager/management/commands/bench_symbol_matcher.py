@@ -0,0 +1,103 @@
+# laundry_manager/management/commands/bench_symbol_matcher.py
+"""
+세탁 기호 매칭 벤치마크.
+  python manage.py bench_symbol_matcher [--scales 1 4 16 64] [--repeat 200]
+
+washing_symbol.json에 합성 정의를 덧붙여 키우면서 기존 루프 방식과
+SymbolMatcher의 라벨당 비용을 비교하고, 실제 데이터에서 결과 일치도 확인한다.
+"""
+import glob
+import json
+import os
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from ...services import knowledge_base as kb
+from ...services.symbol_matcher import SymbolMatcher
+
+
+# ---- 기존 구현(비교 기준) -----------------------------------------------------
+def _legacy_symbol_guide(symbols, symbol_json):
+    results = []
+    for user_input in symbols:
+        for item in symbol_json:
+            if any(k in user_input or user_input in k for k in item.get("keywords", [])):
+                results.append(item["description"])
+                break
+    return results
+
+
+def _legacy_definition(lower_text, definitions):
+    for definition in definitions:
+        for keyword in definition.get("keywords", []):
+            if keyword.lower() in lower_text:
+                return definition["description"]
+    return None
+
+
+def _ocr_texts():
+    texts = []
+    for path in glob.glob(os.path.join(settings.BASE_DIR, "output", "*_result.json")):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            continue
+        joined = " ".join(t or "" for t in data.get("recognized_texts") or [])
+        if joined:
+            texts.append(joined + " ")
+    return texts
+
+
+def _grow(base, scale):
+    # 실제 데이터와 겹치지 않는 합성 키워드로 정의 파일 크기만 키움
+    out = list(base)
+    for n in range(len(base) * (scale - 1)):
+        out.append({"id": f"synthetic_{n}", "keywords": [f"ZQ{n}X", f"합성기호{n}호"], "description": f"합성 {n}"})
+    return out
+
+
+def _per_call_us(fn, args_list, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for args in args_list:
+            fn(*args)
+    return (time.perf_counter() - start) / (repeat * len(args_list)) * 1e6
+
+
+class Command(BaseCommand):
+    help = "세탁 기호 매칭: 기존 루프 vs SymbolMatcher 라벨당 비용 비교"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scales", nargs="+", type=int, default=[1, 4, 16, 64])
+        parser.add_argument("--repeat", type=int, default=50)
+
+    def handle(self, *args, **opts):
+        base = kb.thaw(kb.get_json(kb.SYMBOLS))
+        texts = _ocr_texts() or ["물세탁 40 손세탁 드라이클리닝 금지 "]
+        lowered = [t.lower() for t in texts]
+        labels = [k for item in base[:20] for k in item.get("keywords", [])][:40] + ["없는기호", "세탁"]
+
+        # 결과 일치 확인 (실제 정의 파일)
+        m_case, m_lower = SymbolMatcher(base), SymbolMatcher(base, lower=True)
+        new_guide = [it["description"] for it in map(m_case.match_input, labels) if it]
+        assert new_guide == _legacy_symbol_guide(labels, base), "get_symbol_guide 결과 불일치"
+        for t in texts:
+            hit = m_lower.first_in_text(t)
+            assert (hit and hit["description"]) == _legacy_definition(t.lower(), base), "정의 매칭 결과 불일치"
+        self.stdout.write(f"일치 확인: 라벨 {len(labels)}개, OCR 텍스트 {len(texts)}개")
+
+        self.stdout.write(f"{'정의 수':>8} | {'guide 기존':>10} {'guide 신규':>10} | {'OCR 기존':>10} {'OCR 신규':>10}  (µs/건)")
+        for scale in opts["scales"]:
+            defs = _grow(base, scale)
+            case_m, lower_m = SymbolMatcher(defs), SymbolMatcher(defs, lower=True)
+            repeat = max(1, opts["repeat"] // scale)
+            row = (
+                _per_call_us(lambda l: _legacy_symbol_guide([l], defs), [(l,) for l in labels], repeat),
+                _per_call_us(case_m.match_input, [(l,) for l in labels], repeat),
+                _per_call_us(lambda t: _legacy_definition(t, defs), [(t,) for t in lowered], repeat),
+                _per_call_us(lower_m.first_in_text, [(t,) for t in texts], repeat),
+            )
+            self.stdout.write(f"{len(defs):>8} | {row[0]:>10.1f} {row[1]:>10.1f} | {row[2]:>10.1f} {row[3]:>10.1f}")
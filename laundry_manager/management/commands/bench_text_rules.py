@@ -0,0 +1,94 @@
+# laundry_manager/management/commands/bench_text_rules.py
+"""
+텍스트 룰 엔진 마이크로 벤치마크.
+  python manage.py bench_text_rules [--repeat 200]
+
+output/*_result.json의 OCR 텍스트로 기존 analyze_texts + extract_rule_keywords
+(룰·패턴마다 re.search, 정규화 2회)와 RuleEngine.evaluate(1회 스캔)를 비교한다.
+"""
+import glob
+import json
+import os
+import re
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from ...services.text_rules import ENGINE, RULES
+
+
+# ---- 기존 구현(비교 기준) -----------------------------------------------------
+def _legacy_normalize(texts):
+    return re.sub(r"\s+", " ", " ".join([t or "" for t in texts])).strip()
+
+
+def _legacy_analyze(texts):
+    text = _legacy_normalize(texts)
+    results = []
+    for rule in RULES:
+        if not any(re.search(kw, text, re.IGNORECASE) for kw in rule["keywords"]):
+            continue
+        has_neg = any(re.search(ng, text, re.IGNORECASE) for ng in rule["negations"])
+        results.append({
+            "code": rule["code"],
+            "state": "deny" if has_neg else "allow",
+            "message": rule["negative_msg"] if has_neg else rule["positive_msg"],
+            "matched": rule["keywords"] + (rule["negations"] if has_neg else []),
+            "category": rule["category"],
+        })
+    return results
+
+
+def _legacy_keywords(texts):
+    text = _legacy_normalize(texts)
+    hits = []
+    for rule in RULES:
+        if any(re.search(p, text, re.IGNORECASE) for p in rule["keywords"]):
+            label = rule.get("display", rule["code"])
+            if label not in hits:
+                hits.append(label)
+    return hits
+
+
+class Command(BaseCommand):
+    help = "텍스트 룰: 기존 함수 vs RuleEngine 1회 스캔 비교"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=200)
+
+    def handle(self, *args, **opts):
+        samples = []
+        for path in sorted(glob.glob(os.path.join(settings.BASE_DIR, "output", "*_result.json"))):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    samples.append(json.load(f).get("recognized_texts") or [])
+            except (OSError, ValueError):
+                continue
+        if not samples:
+            self.stdout.write("output/*_result.json이 없습니다.")
+            return
+
+        for texts in samples:
+            got = ENGINE.evaluate(texts)
+            assert got["instructions"] == _legacy_analyze(texts), "analyze_texts 결과 불일치"
+            assert got["keywords"] == _legacy_keywords(texts), "extract_rule_keywords 결과 불일치"
+
+        repeat = opts["repeat"]
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for texts in samples:
+                _legacy_analyze(texts)
+                _legacy_keywords(texts)
+        legacy = (time.perf_counter() - start) / (repeat * len(samples)) * 1e6
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for texts in samples:
+                ENGINE.evaluate(texts)
+        engine = (time.perf_counter() - start) / (repeat * len(samples)) * 1e6
+
+        chars = sum(len(" ".join(t or "" for t in s)) for s in samples) // len(samples)
+        self.stdout.write(f"샘플 {len(samples)}개(평균 {chars}자), 결과 일치")
+        self.stdout.write(f"기존 analyze+extract: {legacy:8.1f} µs/요청")
+        self.stdout.write(f"RuleEngine.evaluate : {engine:8.1f} µs/요청  (x{legacy / engine:.2f})")
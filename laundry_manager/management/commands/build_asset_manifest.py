@@ -0,0 +1,22 @@
+# laundry_manager/management/commands/build_asset_manifest.py
+"""
+정적 이미지 매니페스트(존재 여부/크기/내용 해시) 다시 생성. 배포(collectstatic) 후 실행.
+
+    python manage.py build_asset_manifest
+"""
+from django.core.management.base import BaseCommand
+
+from laundry_manager.services import asset_manifest
+
+
+class Command(BaseCommand):
+    help = "dictionary_image/·stain_image/ 정적 파일 매니페스트를 만들어 ASSET_MANIFEST_PATH에 저장"
+
+    def handle(self, *args, **opts):
+        manifest = asset_manifest.reload(rebuild=True)
+        missing = sorted(path for path, entry in manifest.items() if not entry["exists"])
+        self.stdout.write(
+            f"{asset_manifest.manifest_path()}: {len(manifest)}개 경로, 누락 {len(missing)}개"
+        )
+        for path in missing:
+            self.stdout.write(f"  누락: {path}")
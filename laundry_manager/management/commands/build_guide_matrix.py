@@ -0,0 +1,27 @@
+# laundry_manager/management/commands/build_guide_matrix.py
+"""
+소재 × 얼룩 가이드 행렬(GUIDE_MATRIX_PATH) 다시 생성. blackup.json/persil_v2.json을 고친 뒤 배포 시 실행.
+
+    python manage.py build_guide_matrix
+"""
+import os
+
+from django.core.management.base import BaseCommand
+
+from laundry_manager.services import guide_matrix
+
+
+class Command(BaseCommand):
+    help = "blackup.json × persil_v2.json 모든 조합의 가이드를 미리 계산해 GUIDE_MATRIX_PATH에 저장"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--output", default=None, help="출력 경로 (기본: GUIDE_MATRIX_PATH)")
+
+    def handle(self, *args, **opts):
+        data = guide_matrix.build_current()
+        path = guide_matrix.save(data, opts["output"])
+        self.stdout.write(
+            f"{path}: 소재 {len(data['materials'])}개 × 얼룩 {len(data['stains'])}개, "
+            f"별칭 {sum(len(a) for _, a in data['material_aliases'] + data['stain_aliases'])}개, "
+            f"{os.path.getsize(path)} bytes"
+        )
@@ -0,0 +1,36 @@
+# laundry_manager/management/commands/ingest_laundromats.py
+"""
+laundromats.json 검증/정규화(TM 좌표 → WGS84, rating/hours 타입 정리) 후
+지도 검색용 열 단위 파일(LAUNDROMAT_DATASET_PATH) 생성. 원본을 고친 뒤 배포 시 실행.
+
+    python manage.py ingest_laundromats            # 문제 항목은 제외하고 생성
+    python manage.py ingest_laundromats --strict   # 제외되는 항목이 있으면 실패
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from laundry_manager.services import knowledge_base as kb
+from laundry_manager.services import laundromats
+from laundry_manager.services.laundromat_dataset import cell_of, ingest, source_digest, write
+
+
+class Command(BaseCommand):
+    help = "laundromats.json을 정규화해 빨래방 위치 데이터 파일을 생성"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--strict", action="store_true", help="제외되는 항목이 있으면 파일을 쓰지 않고 실패")
+        parser.add_argument("--output", default=None, help="출력 경로 (기본: LAUNDROMAT_DATASET_PATH)")
+
+    def handle(self, *args, **opts):
+        snap = kb.load(kb.LAUNDROMATS)
+        if snap.mtime is None:
+            raise CommandError(f"원본을 읽을 수 없음: {snap.path}")
+        rows, messages, dropped = ingest(snap.data)
+        for message in messages:
+            self.stdout.write(f"  {message}")
+        if dropped and opts["strict"]:
+            raise CommandError(f"{dropped}개 항목이 검증에 실패했습니다.")
+
+        path = opts["output"] or laundromats.dataset_path()
+        write(rows, path, source_digest(snap.path))
+        cells = {cell_of(r["lat"], r["lng"]) for r in rows}
+        self.stdout.write(f"{path}: {len(rows)}곳 저장, 제외 {dropped}곳, 격자 칸 {len(cells)}개")
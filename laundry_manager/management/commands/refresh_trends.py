@@ -0,0 +1,27 @@
+# laundry_manager/management/commands/refresh_trends.py
+"""
+사전 인기 검색어(네이버 DataLab) 순위 갱신. cron 등으로 주기 실행.
+
+    python manage.py refresh_trends            # 만료된 그룹만
+    python manage.py refresh_trends --force    # 전체 다시 계산
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from laundry_manager.models import TrendRanking
+from laundry_manager.services import trends
+
+
+class Command(BaseCommand):
+    help = "네이버 트렌드 기반 사전 인기 검색어 순위를 갱신해 TrendRanking에 저장"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--force", action="store_true", help="만료 여부와 상관없이 전체 갱신")
+
+    def handle(self, *args, **opts):
+        summary = trends.refresh(force=opts["force"])
+        if summary["error"]:
+            raise CommandError(f"갱신 실패: {summary['error']}")
+        self.stdout.write(f"갱신 {len(summary['refreshed'])}개 그룹, 건너뜀 {summary['skipped']}개")
+        for row in TrendRanking.objects.order_by("group"):
+            top = ", ".join(r["title"] for r in row.ranking[:5])
+            self.stdout.write(f"  {row.group:<24} 만료 {row.expires_at:%Y-%m-%d %H:%M}  {top}")
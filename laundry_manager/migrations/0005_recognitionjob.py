@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:25
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('laundry_manager', '0004_favoriteitem'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RecognitionJob',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('kind', models.CharField(default='ocr', help_text='ocr | classify', max_length=20)),
+                ('status', models.CharField(choices=[('queued', '대기'), ('running', '처리 중'), ('done', '완료'), ('failed', '실패')], db_index=True, default='queued', max_length=10)),
+                ('session_key', models.CharField(blank=True, db_index=True, max_length=40)),
+                ('result', models.JSONField(blank=True, null=True)),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('image', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='laundry_manager.uploadedimage')),
+            ],
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('laundry_manager', '0005_recognitionjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='uploadedimage',
+            name='derivative',
+            field=models.ImageField(blank=True, null=True, upload_to='laundry_symbols/derived/'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:32
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('laundry_manager', '0006_uploadedimage_derivative'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RecognitionResult',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('session_key', models.CharField(blank=True, max_length=40)),
+                ('filename', models.CharField(help_text='업로드 이미지 파일명(basename)', max_length=255)),
+                ('recognized_texts', models.JSONField(default=list)),
+                ('symbol_definition', models.TextField(blank=True)),
+                ('payload', models.BinaryField(help_text='zlib 압축 JSON: ocr_raw_response, roboflow_*_raw, fused_scores')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('image', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='laundry_manager.uploadedimage')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['session_key', '-created_at'], name='recresult_session_idx'), models.Index(fields=['user', '-created_at'], name='recresult_user_idx'), models.Index(fields=['session_key', 'filename', '-created_at'], name='recresult_file_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('laundry_manager', '0007_recognitionresult'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrendRanking',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('group', models.CharField(max_length=64, unique=True)),
+                ('ranking', models.JSONField(default=list, help_text='[{"title": ..., "score": ...}, ...] 점수 내림차순')),
+                ('refreshed_at', models.DateTimeField(blank=True, null=True)),
+                ('expires_at', models.DateTimeField(blank=True, db_index=True, null=True)),
+                ('error', models.TextField(blank=True, help_text='마지막 갱신 실패 사유(성공 시 비움)')),
+            ],
+        ),
+    ]
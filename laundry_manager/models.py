@@ -1,10 +1,15 @@
+import uuid
+
 from django.db import models
 from django.conf import settings
 from django.templatetags.static import static
+from django.utils import timezone
 
 
 class UploadedImage(models.Model):
     image = models.ImageField(upload_to="laundry_symbols/")
+    # OCR/분류 전송용 축소본 (EXIF 회전 보정 + 라벨 영역 크롭 + 리사이즈 + 재인코딩)
+    derivative = models.ImageField(upload_to="laundry_symbols/derived/", null=True, blank=True)
     uploaded_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
@@ -159,3 +164,91 @@ class FavoriteItem(models.Model):
 
     def __str__(self):
         return f"{self.user.username}의 즐겨찾기: {self.title}"
+
+
+class RecognitionJob(models.Model):
+    """업로드 후 백그라운드 워커가 처리하는 인식 작업(OCR/분류) 상태."""
+
+    STATUS_QUEUED = "queued"
+    STATUS_RUNNING = "running"
+    STATUS_DONE = "done"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, "대기"),
+        (STATUS_RUNNING, "처리 중"),
+        (STATUS_DONE, "완료"),
+        (STATUS_FAILED, "실패"),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    kind = models.CharField(max_length=20, default="ocr", help_text="ocr | classify")
+    status = models.CharField(
+        max_length=10, choices=STATUS_CHOICES, default=STATUS_QUEUED, db_index=True
+    )
+    image = models.ForeignKey(UploadedImage, on_delete=models.CASCADE, null=True, blank=True)
+    session_key = models.CharField(max_length=40, blank=True, db_index=True)
+    # 제출한 로그인 사용자(비로그인은 None) → 워커가 결과 행(RecognitionResult)에 그대로 연결
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True
+    )
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    @property
+    def is_finished(self):
+        return self.status in (self.STATUS_DONE, self.STATUS_FAILED)
+
+    def __str__(self):
+        return f"[{self.kind}] {self.id} ({self.status})"
+
+
+class RecognitionResult(models.Model):
+    """
+    업로드 인식 결과 (예전 output/*_result.json 대체).
+    세션/사용자 + 생성 시각 인덱스로 "이 세션의 최신 결과"를 바로 조회한다.
+    원본 응답(OCR/Roboflow/융합 점수)은 zlib 압축 JSON으로 payload에 보관.
+    """
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True
+    )
+    session_key = models.CharField(max_length=40, blank=True)
+    image = models.ForeignKey(UploadedImage, on_delete=models.SET_NULL, null=True, blank=True)
+    filename = models.CharField(max_length=255, help_text="업로드 이미지 파일명(basename)")
+    recognized_texts = models.JSONField(default=list)
+    symbol_definition = models.TextField(blank=True)
+    payload = models.BinaryField(help_text="zlib 압축 JSON: ocr_raw_response, roboflow_*_raw, fused_scores")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["session_key", "-created_at"], name="recresult_session_idx"),
+            models.Index(fields=["user", "-created_at"], name="recresult_user_idx"),
+            models.Index(fields=["session_key", "filename", "-created_at"], name="recresult_file_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.filename} ({self.created_at:%Y-%m-%d %H:%M})"
+
+
+class TrendRanking(models.Model):
+    """
+    사전 인기 검색어 순위 캐시 (services/trends.py가 주기적으로 갱신).
+    group: "all" 또는 사전 카테고리 키. 화면은 이 테이블만 읽는다.
+    """
+
+    group = models.CharField(max_length=64, unique=True)
+    ranking = models.JSONField(default=list, help_text='[{"title": ..., "score": ...}, ...] 점수 내림차순')
+    refreshed_at = models.DateTimeField(null=True, blank=True)
+    expires_at = models.DateTimeField(null=True, blank=True, db_index=True)
+    error = models.TextField(blank=True, help_text="마지막 갱신 실패 사유(성공 시 비움)")
+
+    @property
+    def is_expired(self):
+        return self.expires_at is None or self.expires_at <= timezone.now()
+
+    def __str__(self):
+        return f"{self.group} ({len(self.ranking)}개, {self.refreshed_at})"
@@ -0,0 +1,267 @@
+# laundry_manager/services/alias_index.py
+"""
+소재/얼룩 이름 → 정식 항목 id 별칭 색인.
+
+- 별칭: 제목/aliases/keywords + 파생형(소재 "면(Cotton)" → 면, cotton / 얼룩 "커피 얼룩" → 커피)을
+  정규화(소문자, 공백/구두점 제거)해 id에 연결
+- match(): 점수 순 후보 목록
+    정확 일치 1.0 > 입력이 별칭에 포함 0.7~0.95 > 별칭이 입력에 포함 0.6~0.9 > 오타(편집 거리) 0.5 미만
+  부분 포함은 글자 2-gram 역색인으로 후보만 추린 뒤 확인, 오타는 자모 단위 편집 거리
+  부분 포함은 짧은 쪽이 MIN_PARTIAL_LEN 글자 이상일 때만 후보("피" → 커피, "물" → 반려동물… 제외)
+- best(): 후보 목록에서 자동으로 1개를 고르는 것은
+    정확 일치 / 입력이 별칭에 포함되는 유일한 후보("과일" → 과일 및 야채 얼룩) /
+    부분 포함이면 짧은 쪽이 긴 쪽의 MIN_COVERAGE 이상("폴리우레탄" → 폴리 제외) /
+    2위와 점수 차가 AMBIGUITY_MARGIN 이상("얼룩" → 땀/녹/껌 얼룩 제외)일 때만.
+  아니면 None → 호출하는 쪽은 match()의 후보 목록을 보여 준다
+- 색인은 원본 스냅샷마다 1번 만들고(kb.derived), 같은 입력의 결과는 LRU로 재사용
+"""
+import re
+import unicodedata
+from collections import defaultdict
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from . import knowledge_base as kb
+
+_NORM_RE = re.compile(r"[\s\W_]+")
+_PAREN_RE = re.compile(r"^(.*?)\((.*?)\)\s*$")
+_STAIN_SUFFIXES = ("제거하는법", "제거하기", "제거법", "얼룩")
+
+EXACT_SCORE = 1.0
+MIN_PARTIAL_LEN = 2
+MIN_COVERAGE = 0.5
+AMBIGUITY_MARGIN = 0.05
+
+# 원본 JSON에 없는 흔한 표기(음역/한자어/같은 관리법의 합성섬유) → 소재 이름(괄호 앞 부분)
+MATERIAL_SYNONYMS = {
+    "면": ["코튼", "순면"],
+    "폴리": ["폴리에스터", "폴리에스테르", "polyester", "나일론", "nylon", "아크릴", "acrylic", "합성섬유"],
+    "린넨": ["리넨", "마"],
+    "울": ["양모", "wool"],
+    "레이온": ["인견", "비스코스", "viscose"],
+    "레더": ["가죽"],
+    "퍼": ["모피"],
+    "쉬폰": ["시폰"],
+    "실크": ["silk", "견"],
+    "데님": ["청", "청바지", "jean", "jeans"],
+}
+
+# 원본 JSON에 없는 흔한 얼룩 이름 → 같은 방법으로 지우는 얼룩 항목(title)
+STAIN_SYNONYMS = {
+    "카레와 향신료 얼룩": ["김치", "김칫국물", "고춧가루", "고추장"],
+}
+
+
+class Match(NamedTuple):
+    id: int
+    name: str
+    score: float
+    kind: str  # exact | prefix | contains | contained | fuzzy
+    alias: str
+
+
+def normalize(s: str) -> str:
+    """공백/구두점 제거 + 소문자 → 이름 비교용 정규화"""
+    return _NORM_RE.sub("", (s or "").lower())
+
+
+def _jamo(s: str) -> str:
+    # 한글 음절을 자모로 분해 → "커피"/"카피"가 편집 거리 1
+    return unicodedata.normalize("NFD", s)
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """레벤슈타인 거리. limit을 넘으면 limit + 1."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        cur = [i]
+        for j, cb in enumerate(b, 1):
+            cur.append(min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != cb)))
+        if min(cur) > limit:
+            return limit + 1
+        prev = cur
+    return prev[-1]
+
+
+def _grams(s: str) -> set:
+    return {s[i:i + 2] for i in range(len(s) - 1)} if len(s) > 1 else {s}
+
+
+class AliasIndex:
+    def __init__(self, entries: Sequence[Tuple[str, Iterable[str]]], cache_size: int = 1024):
+        """entries: (표시 이름, 별칭들) 목록. 위치가 곧 id."""
+        self.names: List[str] = []
+        self._aliases: List[Tuple[str, int]] = []  # (정규화 별칭, id)
+        self._exact: Dict[str, int] = {}
+        self._grams: Dict[str, set] = defaultdict(set)  # 2-gram(1글자 별칭은 1-gram) → 별칭 번호
+        self._chars: Dict[str, set] = defaultdict(set)  # 글자 → 별칭 번호 (오타 후보용)
+        for item_id, (name, aliases) in enumerate(entries):
+            self.names.append(name)
+            seen = set()
+            for alias in [name, *aliases]:
+                key = normalize(alias)
+                if not key or key in seen:
+                    continue
+                seen.add(key)
+                n = len(self._aliases)
+                self._aliases.append((key, item_id))
+                # 같은 별칭이 여러 항목에 있으면 먼저 나온 항목
+                self._exact.setdefault(key, item_id)
+                for g in _grams(key):
+                    self._grams[g].add(n)
+                for ch in key:
+                    self._chars[ch].add(n)
+        self._jamo = [_jamo(key) for key, _ in self._aliases]
+        self.match = lru_cache(maxsize=cache_size)(self._match)
+
+    def __len__(self):
+        return len(self.names)
+
+    def _match(self, query: str, limit: int = 5, fuzzy: bool = True) -> Tuple[Match, ...]:
+        q = normalize(query)
+        if not q:
+            return ()
+        best: Dict[int, Match] = {}
+
+        def offer(n: int, score: float, kind: str):
+            key, item_id = self._aliases[n]
+            cur = best.get(item_id)
+            if cur is None or score > cur.score:
+                best[item_id] = Match(item_id, self.names[item_id], round(score, 4), kind, key)
+
+        # 1) 입력이 별칭 안에 포함: 입력 2-gram을 모두 가진 별칭만 확인
+        q_grams = _grams(q)
+        postings = [self._grams.get(g, set()) for g in q_grams]
+        if len(q) == 1:
+            postings = [self._chars.get(q, set())]
+        for n in set.intersection(*postings) if postings else ():
+            key = self._aliases[n][0]
+            if key != q and len(q) < MIN_PARTIAL_LEN:
+                continue
+            if key == q:
+                offer(n, EXACT_SCORE, "exact")
+            elif key.startswith(q):
+                offer(n, 0.7 + 0.25 * len(q) / len(key), "prefix")
+            elif q in key:
+                offer(n, 0.65 + 0.25 * len(q) / len(key), "contains")
+
+        # 2) 별칭이 입력 안에 포함("커피 얼룩이 묻었어요" ⊃ "커피"): 별칭의 2-gram이 모두 입력에 있는 것만 확인
+        hits: Dict[int, int] = defaultdict(int)
+        for g in q_grams | set(q):
+            for n in self._grams.get(g, ()):
+                hits[n] += 1
+        for n, count in hits.items():
+            key = self._aliases[n][0]
+            if count >= len(_grams(key)) and len(key) < len(q) and key in q and len(key) >= MIN_PARTIAL_LEN:
+                offer(n, 0.6 + 0.3 * len(key) / len(q), "contained")
+
+        # 3) 오타: 일치가 없을 때만, 글자를 하나라도 공유하는 별칭과 자모 편집 거리 비교
+        if fuzzy and not best:
+            qj = _jamo(q)
+            limit_d = max(1, len(qj) // 4)
+            candidates = set()
+            for ch in set(q):
+                candidates |= self._chars.get(ch, set())
+            for n in candidates:
+                aj = self._jamo[n]
+                d = edit_distance(qj, aj, limit_d)
+                if d <= limit_d:
+                    offer(n, 0.5 * (1 - d / max(len(qj), len(aj))), "fuzzy")
+
+        return tuple(sorted(best.values(), key=lambda m: (-m.score, m.id))[:limit])
+
+    def best(self, query: str, fuzzy: bool = True) -> Optional[Match]:
+        """확실한 최상위 후보 1개. 확실하지 않으면 None(match()로 후보 확인)."""
+        return confident(query, self.match(query, 2, fuzzy))
+
+
+def confident(query: str, matches: Sequence[Match]) -> Optional[Match]:
+    """점수 순 후보 중 자동으로 골라도 되는 1위 (모듈 설명의 best() 기준), 아니면 None."""
+    if not matches:
+        return None
+    top = matches[0]
+    if top.kind == "exact":
+        return top
+    # 입력이 별칭의 앞/가운데에 들어 있는 후보가 하나뿐이면 덮는 비율과 무관하게 확정
+    sole_partial = len(matches) == 1 and top.kind in ("prefix", "contains")
+    if top.kind != "fuzzy" and not sole_partial:
+        q = normalize(query)
+        if min(len(q), len(top.alias)) / max(len(q), len(top.alias)) < MIN_COVERAGE:
+            return None
+    if len(matches) > 1 and top.score - matches[1].score < AMBIGUITY_MARGIN:
+        return None
+    return top
+
+
+# ---- 지식 베이스 어휘 -------------------------------------------------------------
+def stain_names(item: Dict[str, Any]) -> List[str]:
+    """얼룩 항목의 매칭 후보 문자열: title/aliases/keywords 등."""
+    names = []
+    # 대표 타이틀류
+    for k in ["title", "Title", "name", "Name", "ko", "kr", "korean", "slug"]:
+        v = item.get(k)
+        if v:
+            names.append(str(v))
+    # 배열형 키워드/별칭류
+    for k in ["aliases", "keywords", "tags"]:
+        for v in item.get(k) or []:
+            names.append(str(v))
+    return names
+
+
+def stain_aliases(item: Dict[str, Any]) -> List[str]:
+    """별칭(+ STAIN_SYNONYMS) + "…얼룩"/"…제거법"을 뗀 형태 ("커피 얼룩" → "커피")."""
+    names = stain_names(item)
+    out = []
+    for name in names + STAIN_SYNONYMS.get(names[0].strip() if names else "", []):
+        out.append(name)
+        short = name.strip()
+        for suffix in _STAIN_SUFFIXES:
+            if short.endswith(suffix) and len(short) > len(suffix):
+                short = short[: -len(suffix)].strip()
+        if short != name.strip():
+            out.append(short)
+    return out
+
+
+def material_aliases(item: Dict[str, Any]) -> List[str]:
+    """"면(Cotton)" → ["면(Cotton)", "면", "Cotton"] (+ aliases/keywords)."""
+    name = (item.get("material") or "").strip()
+    out = [name]
+    m = _PAREN_RE.match(name)
+    if m:
+        out.extend(part.strip() for part in m.groups() if part.strip())
+    out.extend(MATERIAL_SYNONYMS.get(m.group(1).strip() if m else name, []))
+    for k in ["aliases", "keywords"]:
+        out.extend(str(v) for v in item.get(k) or [])
+    return out
+
+
+def material_items(material_json) -> List[Dict[str, Any]]:
+    """소재 어휘(순서 = id)."""
+    items = material_json.get("material_washing_tips", []) if isinstance(material_json, dict) else []
+    return [it for it in items if isinstance(it, dict) and (it.get("material") or "").strip()]
+
+
+def stain_items(stain_json) -> List[Dict[str, Any]]:
+    """얼룩 어휘(순서 = id)."""
+    items = stain_json.get("washing_tips_categories", []) if isinstance(stain_json, dict) else []
+    return [it for it in items if isinstance(it, dict) and any(normalize(n) for n in stain_names(it))]
+
+
+def material_entries(material_json) -> List[Tuple[str, List[str]]]:
+    return [(it["material"].strip(), material_aliases(it)) for it in material_items(material_json)]
+
+
+def stain_entries(stain_json) -> List[Tuple[str, List[str]]]:
+    return [(stain_names(it)[0], stain_aliases(it)) for it in stain_items(stain_json)]
+
+
+def materials() -> AliasIndex:
+    return kb.derived(kb.MATERIALS, "alias_index", lambda snap: AliasIndex(material_entries(snap.data)))
+
+
+def stains() -> AliasIndex:
+    return kb.derived(kb.STAINS, "alias_index", lambda snap: AliasIndex(stain_entries(snap.data)))
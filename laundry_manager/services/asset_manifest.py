@@ -0,0 +1,153 @@
+# laundry_manager/services/asset_manifest.py
+"""
+정적 이미지 매니페스트: 경로 → {exists, size, hash, url}.
+
+- 대상: static의 dictionary_image/·stain_image/ 아래 모든 파일
+  + 사전 항목 id별 이미지, stain_dataset.IMG_MAP이 가리키는 파일(없으면 exists=False로 기록)
+- 시작 후 첫 사용 시 ASSET_MANIFEST_PATH(JSON)를 읽고, 없으면 staticfiles finder로 한 번 만들어 저장
+  (`python manage.py build_asset_manifest` — collectstatic 뒤에 실행해 갱신)
+- 뷰는 find()/os.path.exists 대신 dict 조회만 한다
+- url은 내용 해시를 붙인 주소(?v=해시) → 웹 서버에서 긴 캐시 기간을 줘도 파일이 바뀌면 새로 받음
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+from typing import Any, Dict, Iterable, Optional
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.templatetags.static import static
+
+from . import knowledge_base as kb
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+ASSET_DIRS = ("dictionary_image/", "stain_image/")
+
+_lock = threading.Lock()
+_manifest: Optional[Dict[str, Dict[str, Any]]] = None
+
+
+def manifest_path() -> str:
+    return str(getattr(settings, "ASSET_MANIFEST_PATH", os.path.join(settings.BASE_DIR, "asset_manifest.json")))
+
+
+def _normalize(path: str) -> str:
+    path = (path or "").strip().replace("\\", "/")
+    if path.startswith(settings.STATIC_URL):
+        path = path[len(settings.STATIC_URL):]
+    return path.lstrip("/")
+
+
+def _entry(path: str, abs_path: Optional[str]) -> Dict[str, Any]:
+    if not abs_path or not os.path.isfile(abs_path):
+        return {"exists": False, "size": None, "hash": None, "url": static(path)}
+    h = hashlib.sha256()
+    with open(abs_path, "rb") as f:
+        for chunk in iter(lambda: f.read(64 * 1024), b""):
+            h.update(chunk)
+    digest = h.hexdigest()[:12]
+    return {"exists": True, "size": os.path.getsize(abs_path), "hash": digest, "url": f"{static(path)}?v={digest}"}
+
+
+def referenced_paths() -> Iterable[str]:
+    """데이터 파일이 참조하는 이미지 경로 (실제 파일이 없어도 포함)."""
+    from .stain_dataset import IMG_MAP
+
+    for entry in kb.get_index(kb.DICTIONARY, "entries"):
+        yield entry["image"]
+    for base in IMG_MAP.values():
+        yield f"stain_image/{base}.webp"
+
+
+def build() -> Dict[str, Dict[str, Any]]:
+    """staticfiles finder로 대상 파일을 모아 해시 계산."""
+    found: Dict[str, str] = {}
+    for finder in finders.get_finders():
+        for path, storage in finder.list([]):
+            path = path.replace("\\", "/")
+            if path.startswith(ASSET_DIRS) and path not in found:
+                found[path] = storage.path(path)
+
+    manifest = {path: _entry(path, abs_path) for path, abs_path in sorted(found.items())}
+    for path in referenced_paths():
+        if path not in manifest:
+            manifest[path] = _entry(path, finders.find(path))
+    return manifest
+
+
+def save(manifest: Dict[str, Dict[str, Any]], path: Optional[str] = None) -> str:
+    path = path or manifest_path()
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"version": MANIFEST_VERSION, "assets": manifest}, f, ensure_ascii=False, indent=1)
+    os.replace(tmp, path)
+    return path
+
+
+def _load_file() -> Optional[Dict[str, Dict[str, Any]]]:
+    try:
+        with open(manifest_path(), "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if data.get("version") != MANIFEST_VERSION:
+        return None
+    return data.get("assets") or None
+
+
+def get_manifest() -> Dict[str, Dict[str, Any]]:
+    global _manifest
+    if _manifest is None:
+        with _lock:
+            if _manifest is None:
+                manifest = _load_file()
+                if manifest is None:
+                    try:
+                        manifest = build()
+                    except Exception:
+                        # 매니페스트가 없어도 lookup()이 경로별로 한 번씩 찾아 채운다
+                        logger.exception("자산 매니페스트 생성 실패")
+                        manifest = {}
+                    else:
+                        try:
+                            save(manifest)
+                        except OSError as e:
+                            logger.warning("자산 매니페스트 저장 실패(메모리에서만 사용): %s", e)
+                _manifest = manifest
+    return _manifest
+
+
+def reload(rebuild: bool = False) -> Dict[str, Dict[str, Any]]:
+    """매니페스트 다시 읽기(rebuild=True면 새로 만들어 저장)."""
+    global _manifest
+    with _lock:
+        _manifest = None
+        if rebuild:
+            manifest = build()
+            save(manifest)
+            _manifest = manifest
+    return get_manifest()
+
+
+def lookup(path: str) -> Dict[str, Any]:
+    """경로의 매니페스트 항목. 매니페스트에 없던 경로는 한 번만 찾아보고 결과를 기억한다."""
+    path = _normalize(path)
+    manifest = get_manifest()
+    entry = manifest.get(path)
+    if entry is None:
+        entry = _entry(path, finders.find(path)) if path else {"exists": False, "size": None, "hash": None, "url": ""}
+        manifest[path] = entry
+    return entry
+
+
+def exists(path: str) -> bool:
+    return bool(path) and lookup(path)["exists"]
+
+
+def url(path: str) -> str:
+    """해시가 붙은 정적 파일 URL (파일이 없으면 일반 static URL)."""
+    return lookup(path)["url"] if path else ""
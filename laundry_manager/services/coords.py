@@ -0,0 +1,94 @@
+# laundry_manager/services/coords.py
+"""
+국내 평면 직각(TM) 좌표 → WGS84 위경도 (순수 파이썬, 외부 라이브러리 없음).
+
+- 횡메르카토르 역변환(Snyder, Map Projections: A Working Manual 식 8-18 ~ 8-25), GRS80 타원체
+- 지원 좌표계: 중부원점 EPSG:5181(카카오 등 지도 API의 TM), EPSG:5186(2010 중부원점)
+  둘 다 GRS80 기반이라 WGS84와 동일 취급(차이 수 cm)
+"""
+import math
+from typing import Dict, Optional, Tuple
+
+# (위도 원점, 경도 원점, 축척계수, 가산 동거리 X, 가산 북거리 Y)
+PROJECTIONS: Dict[str, Tuple[float, float, float, float, float]] = {
+    "EPSG:5181": (38.0, 127.0, 1.0, 200000.0, 500000.0),
+    "EPSG:5186": (38.0, 127.0, 1.0, 200000.0, 600000.0),
+}
+DEFAULT_PROJECTION = "EPSG:5181"
+
+# GRS80
+_A = 6378137.0
+_F = 1 / 298.257222101
+_E2 = _F * (2 - _F)
+_EP2 = _E2 / (1 - _E2)
+_E1 = (1 - math.sqrt(1 - _E2)) / (1 + math.sqrt(1 - _E2))
+
+# 국내 좌표 판정용 범위 (위도, 경도)
+KOREA_BOUNDS = ((33.0, 39.5), (124.0, 132.0))
+
+
+def _meridian_arc(phi: float) -> float:
+    e2, e4, e6 = _E2, _E2 ** 2, _E2 ** 3
+    return _A * (
+        (1 - e2 / 4 - 3 * e4 / 64 - 5 * e6 / 256) * phi
+        - (3 * e2 / 8 + 3 * e4 / 32 + 45 * e6 / 1024) * math.sin(2 * phi)
+        + (15 * e4 / 256 + 45 * e6 / 1024) * math.sin(4 * phi)
+        - (35 * e6 / 3072) * math.sin(6 * phi)
+    )
+
+
+def tm_to_wgs84(x: float, y: float, projection: str = DEFAULT_PROJECTION) -> Tuple[float, float]:
+    """동거리 x, 북거리 y(m) → (위도, 경도)."""
+    lat0, lon0, k0, false_e, false_n = PROJECTIONS[projection]
+    m = _meridian_arc(math.radians(lat0)) + (y - false_n) / k0
+    mu = m / (_A * (1 - _E2 / 4 - 3 * _E2 ** 2 / 64 - 5 * _E2 ** 3 / 256))
+    e1 = _E1
+    phi1 = (
+        mu
+        + (3 * e1 / 2 - 27 * e1 ** 3 / 32) * math.sin(2 * mu)
+        + (21 * e1 ** 2 / 16 - 55 * e1 ** 4 / 32) * math.sin(4 * mu)
+        + (151 * e1 ** 3 / 96) * math.sin(6 * mu)
+        + (1097 * e1 ** 4 / 512) * math.sin(8 * mu)
+    )
+    sin1, cos1, tan1 = math.sin(phi1), math.cos(phi1), math.tan(phi1)
+    c1 = _EP2 * cos1 ** 2
+    t1 = tan1 ** 2
+    n1 = _A / math.sqrt(1 - _E2 * sin1 ** 2)
+    r1 = _A * (1 - _E2) / (1 - _E2 * sin1 ** 2) ** 1.5
+    d = (x - false_e) / (n1 * k0)
+
+    lat = phi1 - (n1 * tan1 / r1) * (
+        d ** 2 / 2
+        - (5 + 3 * t1 + 10 * c1 - 4 * c1 ** 2 - 9 * _EP2) * d ** 4 / 24
+        + (61 + 90 * t1 + 298 * c1 + 45 * t1 ** 2 - 252 * _EP2 - 3 * c1 ** 2) * d ** 6 / 720
+    )
+    lon = math.radians(lon0) + (
+        d
+        - (1 + 2 * t1 + c1) * d ** 3 / 6
+        + (5 - 2 * c1 + 28 * t1 - 3 * c1 ** 2 + 8 * _EP2 + 24 * t1 ** 2) * d ** 5 / 120
+    ) / cos1
+    return math.degrees(lat), math.degrees(lon)
+
+
+def is_wgs84(lat: float, lng: float) -> bool:
+    return -90 <= lat <= 90 and -180 <= lng <= 180
+
+
+def in_korea(lat: float, lng: float) -> bool:
+    (lat_lo, lat_hi), (lng_lo, lng_hi) = KOREA_BOUNDS
+    return lat_lo <= lat <= lat_hi and lng_lo <= lng <= lng_hi
+
+
+def normalize(a: float, b: float, projection: str = DEFAULT_PROJECTION) -> Optional[Tuple[float, float, bool]]:
+    """
+    (latitude 필드, longitude 필드) 값 → (위도, 경도, 변환 여부). 판단할 수 없으면 None.
+    위경도면 그대로, 아니면 TM으로 보고 (x, y) 두 순서를 모두 변환해 국내 범위에 드는 쪽을 사용
+    (데이터에 동거리가 latitude 필드에 들어 있는 경우가 있음).
+    """
+    if is_wgs84(a, b):
+        return (a, b, False) if in_korea(a, b) or not in_korea(b, a) else (b, a, False)
+    for x, y in ((a, b), (b, a)):
+        lat, lng = tm_to_wgs84(x, y, projection)
+        if in_korea(lat, lng):
+            return lat, lng, True
+    return None
@@ -0,0 +1,237 @@
+# laundry_manager/services/dictionary_search.py
+"""
+세탁 사전(dictionary.json) 전문 검색 인덱스.
+
+- 텍스트를 자모 단위로 분해(NFC 음절 → 초/중/종성, 겹받침·이중모음도 분해)한 뒤
+  단어 안의 자모 3-gram을 색인 → 부분 일치, 조합 중인 입력("셎" → 세제), 오타 1~2자 허용
+- 필드 가중치(제목 > 설명 > 본문) BM25. 게시 목록에 점수 기여도를 미리 계산해 기여도 순으로 정렬해 두어
+  조회는 쿼리 gram 게시 목록의 앞부분(POSTINGS_BUDGET 이내)을 더하기만 한다
+- 자동완성: 제목(및 제목 내 단어 시작 위치)의 자모 키 정렬 배열 + bisect 접두 검색
+- 인덱스는 사전 파일 스냅샷마다 1회 생성(knowledge_base.derived)
+"""
+import bisect
+import heapq
+import math
+import re
+import unicodedata
+from collections import Counter, defaultdict
+from operator import itemgetter
+from typing import Any, Dict, List, Tuple
+
+from . import knowledge_base as kb
+
+# 필드 가중치 (나머지 문자열 필드는 1.0)
+FIELD_WEIGHTS = {"title": 3.0, "description": 1.5}
+_SKIP_FIELDS = {"id", "slug", "image_url"}
+K1, B = 1.2, 0.75
+# 쿼리 gram 중 이 비율 이상이 맞아야 결과로 인정(오타 허용 정도)
+MIN_MATCH = 0.5
+# 정규화한 제목에 쿼리가 그대로 들어 있으면 가산점(예전 부분 문자열 검색 결과가 항상 위에 오도록)
+TITLE_SUBSTRING_BONUS = 100.0
+TITLE_PREFIX_BONUS = 50.0
+# 쿼리 1회에 읽는 게시 항목 총량 상한 (지연 시간 상한)
+POSTINGS_BUDGET = 768
+POSTINGS_MIN_PER_GRAM = 96
+# 가산점/최소 일치 조건을 적용할 후보 수 = limit × CANDIDATE_FACTOR (원점수 상위)
+CANDIDATE_FACTOR = 4
+_EMPTY: Tuple[tuple, tuple] = ((), ())
+
+# ---- 자모 분해 ------------------------------------------------------------------
+_CHO = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_JUNG = ["ㅏ", "ㅐ", "ㅑ", "ㅒ", "ㅓ", "ㅔ", "ㅕ", "ㅖ", "ㅗ", "ㅗㅏ", "ㅗㅐ", "ㅗㅣ", "ㅛ", "ㅜ",
+         "ㅜㅓ", "ㅜㅔ", "ㅜㅣ", "ㅠ", "ㅡ", "ㅡㅣ", "ㅣ"]
+_JONG = ["", "ㄱ", "ㄲ", "ㄱㅅ", "ㄴ", "ㄴㅈ", "ㄴㅎ", "ㄷ", "ㄹ", "ㄹㄱ", "ㄹㅁ", "ㄹㅂ", "ㄹㅅ", "ㄹㅌ",
+         "ㄹㅍ", "ㄹㅎ", "ㅁ", "ㅂ", "ㅂㅅ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ"]
+# 단독으로 입력된 겹자모(호환 자모)
+_COMPAT = {
+    "ㄳ": "ㄱㅅ", "ㄵ": "ㄴㅈ", "ㄶ": "ㄴㅎ", "ㄺ": "ㄹㄱ", "ㄻ": "ㄹㅁ", "ㄼ": "ㄹㅂ", "ㄽ": "ㄹㅅ",
+    "ㄾ": "ㄹㅌ", "ㄿ": "ㄹㅍ", "ㅀ": "ㄹㅎ", "ㅄ": "ㅂㅅ", "ㅘ": "ㅗㅏ", "ㅙ": "ㅗㅐ", "ㅚ": "ㅗㅣ",
+    "ㅝ": "ㅜㅓ", "ㅞ": "ㅜㅔ", "ㅟ": "ㅜㅣ", "ㅢ": "ㅡㅣ",
+}
+_WORD_RE = re.compile(r"[0-9a-zㄱ-ㆎ가-힣]+")
+
+
+def to_jamo(word: str) -> str:
+    out = []
+    for ch in word:
+        code = ord(ch) - 0xAC00
+        if 0 <= code < 11172:
+            out.append(_CHO[code // 588])
+            out.append(_JUNG[(code % 588) // 28])
+            out.append(_JONG[code % 28])
+        else:
+            out.append(_COMPAT.get(ch, ch))
+    return "".join(out)
+
+
+def words_of(text: str) -> List[str]:
+    """NFC + 소문자 → 단어(한글/영문/숫자) → 자모 문자열 목록."""
+    text = unicodedata.normalize("NFC", text or "").lower()
+    return [to_jamo(w) for w in _WORD_RE.findall(text)]
+
+
+def _grams(jamo_word: str, n: int = 3) -> List[str]:
+    if len(jamo_word) <= n:
+        return [jamo_word]
+    return [jamo_word[i:i + n] for i in range(len(jamo_word) - n + 1)]
+
+
+def _texts(value) -> List[str]:
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, dict):
+        return [t for v in value.values() for t in _texts(v)]
+    if isinstance(value, (list, tuple)):
+        return [t for v in value for t in _texts(v)]
+    return []
+
+
+def _squash(text: str) -> str:
+    """부분 문자열 비교용: 자모 분해 + 공백/기호 제거."""
+    return "".join(words_of(text))
+
+
+# ---- 인덱스 ---------------------------------------------------------------------
+class SearchIndex:
+    """docs: [{"id", "slug", "category", "title", "item"}, ...]"""
+
+    def __init__(self, docs: List[Dict[str, Any]]):
+        self.docs = docs
+        self._title_keys = [_squash(d["title"]) for d in docs]
+
+        tfs: List[Dict[str, float]] = []
+        lengths: List[float] = []
+        for d in docs:
+            tf: Dict[str, float] = defaultdict(float)
+            length = 0.0
+            for field, value in d["item"].items():
+                if field in _SKIP_FIELDS:
+                    continue
+                w = FIELD_WEIGHTS.get(field, 1.0)
+                for text in _texts(value):
+                    for word in words_of(text):
+                        for g in _grams(word):
+                            tf[g] += w
+                            length += w
+                        if field == "title" and len(word) > 3:
+                            # 짧은 쿼리(1음절 등)가 제목 단어 앞부분에 걸리도록 2-gram 접두도 색인
+                            tf[word[:2]] += w
+            tfs.append(tf)
+            lengths.append(length)
+
+        n = len(docs)
+        avg = (sum(lengths) / n) if n else 1.0
+        df: Dict[str, int] = defaultdict(int)
+        for tf in tfs:
+            for g in tf:
+                df[g] += 1
+
+        # 게시 목록: gram → [(doc, BM25 기여도)]
+        postings: Dict[str, List[Tuple[int, float]]] = defaultdict(list)
+        for doc_id, tf in enumerate(tfs):
+            norm = K1 * (1 - B + B * lengths[doc_id] / (avg or 1.0))
+            for g, f in tf.items():
+                idf = math.log(1 + (n - df[g] + 0.5) / (df[g] + 0.5))
+                postings[g].append((doc_id, idf * f * (K1 + 1) / (f + norm)))
+        # 기여도 내림차순 정렬 → 흔한 gram은 앞부분(기여도 큰 문서)만 읽고 끊을 수 있음
+        # (doc id 튜플, 기여도 튜플) 두 배열로 보관해 조회 시 슬라이스/집계를 C 수준에서 처리
+        self.postings: Dict[str, Tuple[Tuple[int, ...], Tuple[float, ...]]] = {}
+        for g, plist in postings.items():
+            plist.sort(key=lambda t: -t[1])
+            self.postings[g] = (tuple(t[0] for t in plist), tuple(t[1] for t in plist))
+
+        # 자동완성: (자모 키, doc) 정렬 배열. 제목 전체 + 제목 안 각 단어 시작 위치
+        prefix = []
+        for doc_id, d in enumerate(docs):
+            ws = words_of(d["title"])
+            for i in range(len(ws)):
+                prefix.append(("".join(ws[i:]), i, doc_id))
+        prefix.sort()
+        self._prefix_keys = [p[0] for p in prefix]
+        self._prefix_meta = [(p[1], p[2]) for p in prefix]
+
+    def __len__(self):
+        return len(self.docs)
+
+    def search(self, query: str, limit: int = 20) -> List[Tuple[float, Dict[str, Any]]]:
+        """(점수, doc) 점수 내림차순."""
+        qwords = words_of(query)
+        qgrams = {g for w in qwords for g in _grams(w)}
+        if not qgrams:
+            return []
+        # gram당 읽을 게시 항목 상한: 예산을 쿼리 gram 수로 나눔. 문서 빈도가 상한보다 작은 gram은 정확,
+        # 거의 모든 문서에 나오는 gram(낮은 idf)만 기여도 하위 꼬리를 생략 → 사전 크기와 무관한 조회 비용
+        per_gram = max(POSTINGS_MIN_PER_GRAM, POSTINGS_BUDGET // len(qgrams))
+        scores: Dict[int, float] = {}
+        get = scores.get
+        hits: Counter = Counter()
+        for g in qgrams:
+            ids, impacts = self.postings.get(g, _EMPTY)
+            ids = ids[:per_gram]
+            hits.update(ids)
+            for doc_id, s in zip(ids, impacts[:per_gram]):
+                scores[doc_id] = get(doc_id, 0.0) + s
+
+        # 점수 상위 후보만 최소 일치 조건/제목 가산점 적용 후 재정렬
+        need = max(1, math.ceil(MIN_MATCH * len(qgrams)))
+        qkey = "".join(qwords)
+        ranked = []
+        for doc_id, s in heapq.nlargest(limit * CANDIDATE_FACTOR, scores.items(), key=itemgetter(1)):
+            if hits[doc_id] < need:
+                continue
+            title_key = self._title_keys[doc_id]
+            if qkey in title_key:
+                s += TITLE_SUBSTRING_BONUS + (TITLE_PREFIX_BONUS if title_key.startswith(qkey) else 0.0)
+            ranked.append((s, -doc_id))
+        ranked.sort(reverse=True)
+        return [(round(s, 4), self.docs[-neg_id]) for s, neg_id in ranked[:limit]]
+
+    def complete(self, prefix: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """자모 접두 일치 제목. 제목 맨 앞 일치 → 짧은 제목 순."""
+        key = "".join(words_of(prefix))
+        if not key:
+            return []
+        lo = bisect.bisect_left(self._prefix_keys, key)
+        found: Dict[int, int] = {}
+        for i in range(lo, len(self._prefix_keys)):
+            if not self._prefix_keys[i].startswith(key):
+                break
+            word_pos, doc_id = self._prefix_meta[i]
+            found[doc_id] = min(word_pos, found.get(doc_id, word_pos))
+            if len(found) >= limit * 4:
+                break
+        order = sorted(found, key=lambda d: (found[d], len(self.docs[d]["title"]), d))
+        return [self.docs[d] for d in order[:limit]]
+
+    def suggest(self, query: str, limit: int = 8) -> List[Dict[str, Any]]:
+        """입력 중 추천: 접두 일치를 먼저, 남는 자리는 검색 결과로 채움."""
+        out = self.complete(query, limit)
+        if len(out) < limit:
+            seen = {id(d) for d in out}
+            for _, d in self.search(query, limit):
+                if id(d) not in seen:
+                    out.append(d)
+                    seen.add(id(d))
+                if len(out) >= limit:
+                    break
+        return out
+
+
+def build_docs(snap) -> List[Dict[str, Any]]:
+    # 사전 스냅샷의 항목 인덱스(knowledge_base._index_dictionary)에서 id/slug를 그대로 사용
+    return [
+        {"id": e["id"], "slug": e["slug"], "category": e["category"], "title": e["title"], "item": e["item"]}
+        for e in snap.index.get("entries", [])
+    ]
+
+
+def get_index() -> SearchIndex:
+    return kb.derived(kb.DICTIONARY, "search_index", lambda snap: SearchIndex(build_docs(snap)))
+
+
+def search(query: str, limit: int = 20):
+    return get_index().search(query, limit)
+
+
+def suggest(query: str, limit: int = 8):
+    return get_index().suggest(query, limit)
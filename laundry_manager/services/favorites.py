@@ -0,0 +1,81 @@
+# laundry_manager/services/favorites.py
+"""
+사전 즐겨찾기(FavoriteItem) 조회/일괄 변경.
+
+- titles(): 사용자별 즐겨찾기 제목 frozenset. Django 캐시에 보관하고 쓰기(add/remove) 시 무효화
+  (FAVORITES_CACHE_TTL초 — 공유 캐시가 아닌 LocMem이면 다른 프로세스는 최대 TTL만큼 늦게 반영)
+- entries(): 즐겨찾기 집합 ∩ 사전 제목 인덱스 → 사전 항목(파일 순서)
+- add()/remove(): 여러 제목을 쿼리 1번으로 (bulk_create(ignore_conflicts=True) / 단일 delete)
+"""
+import logging
+from typing import Any, Dict, FrozenSet, Iterable, List
+
+from django.conf import settings
+from django.core.cache import cache
+
+from ..models import FavoriteItem
+from . import knowledge_base as kb
+
+logger = logging.getLogger(__name__)
+
+
+def _cache_key(user) -> str:
+    return f"favorites:v1:{user.pk}"
+
+
+def _ttl() -> int:
+    return int(getattr(settings, "FAVORITES_CACHE_TTL", 300))
+
+
+def titles(user) -> FrozenSet[str]:
+    if user is None or not getattr(user, "is_authenticated", False):
+        return frozenset()
+    key = _cache_key(user)
+    cached = cache.get(key)
+    if cached is None:
+        cached = frozenset(FavoriteItem.objects.filter(user=user).values_list("title", flat=True))
+        cache.set(key, cached, _ttl())
+    return cached
+
+
+def invalidate(user) -> None:
+    cache.delete(_cache_key(user))
+
+
+def entries(user) -> List[Dict[str, Any]]:
+    """즐겨찾기한 사전 항목 인덱스 항목(사전에 없는 제목은 제외), 사전 파일 순서."""
+    favs = titles(user)
+    if not favs:
+        return []
+    by_title = kb.get_index(kb.DICTIONARY, "by_title")
+    found = [by_title[t] for t in favs if t in by_title]
+    found.sort(key=lambda e: e["id"])
+    return found
+
+
+def _clean(values: Iterable) -> List[str]:
+    """문자열 제목만, 공백 제거·중복 제거(입력 순서 유지)."""
+    out = (v.strip() for v in values or () if isinstance(v, str))
+    return list(dict.fromkeys(v for v in out if v))
+
+
+def add(user, values: Iterable) -> List[str]:
+    """사전에 있는 제목만 추가. 추가 대상(이미 있던 것 포함) 제목 목록 반환."""
+    by_title = kb.get_index(kb.DICTIONARY, "by_title")
+    wanted = [t for t in _clean(values) if t in by_title]
+    if wanted:
+        FavoriteItem.objects.bulk_create(
+            [FavoriteItem(user=user, title=t) for t in wanted], ignore_conflicts=True
+        )
+        invalidate(user)
+    return wanted
+
+
+def remove(user, values: Iterable) -> int:
+    """삭제된 행 수."""
+    wanted = _clean(values)
+    if not wanted:
+        return 0
+    deleted, _ = FavoriteItem.objects.filter(user=user, title__in=wanted).delete()
+    invalidate(user)
+    return deleted
@@ -0,0 +1,217 @@
+# laundry_manager/services/guide_matrix.py
+"""
+소재 × 얼룩 가이드 행렬 (결과 화면 guide_from_result용).
+
+- 소재(blackup.json)·얼룩(persil_v2.json)은 작은 닫힌 어휘 → 항목마다 정수 id를 붙이고
+  (소재 id 또는 없음) × (얼룩 id 또는 없음) 모든 조합의 가이드 묶음(소재/얼룩 가이드 + 요약)을 미리 만든다
+- 이름 → id: 파일에 함께 저장한 별칭 목록으로 만든 alias_index.AliasIndex(점수 순 후보, 오타 허용)
+- `python manage.py build_guide_matrix`로 GUIDE_MATRIX_PATH(pickle)에 저장해 두고 시작 후 첫 사용 시 읽는다
+  (파일이 없거나 원본 sha256이 다르면 요청 처리 중에는 파일을 쓰지 않고 메모리에서만 만들어 사용)
+- 결과 화면(views/laundry_res.guide_from_result)만 사용. 추천 엔진(services/recommendation)은 혼방·여러 얼룩을
+  항목별 가이드로 합치므로 이 행렬을 거치지 않는다
+"""
+import logging
+import os
+import pickle
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from django.conf import settings
+
+from . import knowledge_base as kb
+from .alias_index import AliasIndex, Match, material_entries, material_items, stain_entries, stain_items
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"LGMX\x01\x00\x00\x00"
+FORMAT_VERSION = 4  # 별칭 규칙(alias_index)이 바뀌면 올림 → 예전 파일은 메모리 재생성
+SOURCES = (kb.MATERIALS, kb.STAINS)
+
+
+def matrix_path() -> str:
+    return str(getattr(settings, "GUIDE_MATRIX_PATH", os.path.join(settings.BASE_DIR, "guide_matrix.pkl")))
+
+
+def first_line(text) -> str:
+    """문자열/리스트/딕셔너리를 받아 첫 문장만 뽑아 간단 요약."""
+    if text is None:
+        return ""
+    # 리스트면 첫 항목
+    if isinstance(text, list):
+        text = text[0] if text else ""
+    # 딕셔너리면 첫 value
+    if isinstance(text, dict):
+        text = next((str(v) for v in text.values() if v), "")
+    t = str(text).strip()
+    for sep in ["\n", "•", "·", "．", ". "]:
+        if sep in t:
+            return t.split(sep)[0].strip()
+    return t
+
+
+def _lines(value):
+    # 템플릿이 |linebreaks로 출력 → 목록은 줄 단위 텍스트로
+    if isinstance(value, list):
+        return "\n".join(str(v) for v in value if v) or None
+    return value
+
+
+def _material_guide(item: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "name": item.get("material"),
+        "description": item.get("description"),
+        "warning": item.get("warning"),
+    }
+
+
+def _stain_guide(item: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "title": item.get("title") or item.get("Title"),
+        "Washing_Steps": _lines(item.get("Washing_Steps")),
+        "detail": item.get("detail"),
+        "tip": _lines(item.get("tip")),
+        "Not_to__do": _lines(item.get("Not_to__do") or item.get("not_to_do")),
+        "Other_Information": _lines(item.get("Other_Information") or item.get("other_information")),
+    }
+
+
+def build(material_json, stain_json, sources: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """원본 JSON → 직렬화 가능한 행렬 데이터(가이드 객체는 묶음 사이에서 공유)."""
+    materials = [_material_guide(it) for it in material_items(material_json)]
+    stains = [_stain_guide(it) for it in stain_items(stain_json)]
+
+    empty: Dict[str, Any] = {}
+    pairs = []
+    for m in materials + [empty]:
+        wash = first_line(m.get("description")) or None
+        row = []
+        for s in stains + [empty]:
+            row.append({
+                "material": m,
+                "stain": s,
+                "summary": {
+                    "wash": wash,
+                    "dry": None,
+                    "stain": first_line(s.get("Washing_Steps") or s.get("detail")) or None,
+                },
+            })
+        pairs.append(row)
+
+    return {
+        "version": FORMAT_VERSION,
+        "sources": dict(sources or {}),
+        "materials": materials,
+        "stains": stains,
+        "material_aliases": material_entries(material_json),
+        "stain_aliases": stain_entries(stain_json),
+        "pairs": pairs,
+    }
+
+
+def _freeze_shared(obj, memo: Dict[int, Any]):
+    """kb.freeze와 같지만 같은 객체는 한 번만 변환(묶음들이 가이드를 계속 공유)."""
+    if not isinstance(obj, (dict, list)):
+        return obj
+    key = id(obj)
+    if key not in memo:
+        if isinstance(obj, dict):
+            memo[key] = kb.FrozenDict((k, _freeze_shared(v, memo)) for k, v in obj.items())
+        else:
+            memo[key] = kb.FrozenList(_freeze_shared(v, memo) for v in obj)
+    return memo[key]
+
+
+class GuideMatrix:
+    def __init__(self, data: Dict[str, Any]):
+        memo: Dict[int, Any] = {}
+        self.sources: Dict[str, str] = dict(data["sources"])
+        self.materials = _freeze_shared(data["materials"], memo)
+        self.stains = _freeze_shared(data["stains"], memo)
+        self.pairs = _freeze_shared(data["pairs"], memo)
+        self.material_index = AliasIndex(data["material_aliases"])
+        self.stain_index = AliasIndex(data["stain_aliases"])
+        self._data = data  # memo의 id가 가리키는 원본 유지
+
+    def material_matches(self, name: str, limit: int = 5) -> Tuple[Match, ...]:
+        return self.material_index.match(name or "", limit)
+
+    def stain_matches(self, name: str, limit: int = 5) -> Tuple[Match, ...]:
+        return self.stain_index.match(name or "", limit)
+
+    def material_id(self, name: str) -> Optional[int]:
+        found = self.material_index.best(name or "")
+        return found.id if found else None
+
+    def stain_id(self, name: str) -> Optional[int]:
+        found = self.stain_index.best(name or "")
+        return found.id if found else None
+
+    def pair(self, material_id: Optional[int], stain_id: Optional[int]):
+        """{material, stain, summary} 묶음. id가 None이면 해당 가이드 없음({})."""
+        m = len(self.materials) if material_id is None else material_id
+        s = len(self.stains) if stain_id is None else stain_id
+        return self.pairs[m][s]
+
+    def lookup(self, material: str, stain: str):
+        return self.pair(self.material_id(material), self.stain_id(stain))
+
+
+# ---- 파일 -----------------------------------------------------------------------
+def save(data: Dict[str, Any], path: Optional[str] = None) -> str:
+    path = path or matrix_path()
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(MAGIC)
+        pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
+    return path
+
+
+def read(path: Optional[str] = None) -> Dict[str, Any]:
+    # 빌드 명령이 만든 로컬 파일만 읽는다(외부 입력 아님)
+    with open(path or matrix_path(), "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError("가이드 행렬 파일 형식이 아님")
+        data = pickle.load(f)
+    if not isinstance(data, dict) or data.get("version") != FORMAT_VERSION:
+        raise ValueError("가이드 행렬 파일 버전 불일치")
+    return data
+
+
+def current_sources() -> Dict[str, str]:
+    return {name: kb.content_hash(name) for name in SOURCES}
+
+
+def build_current() -> Dict[str, Any]:
+    return build(kb.get_json(kb.MATERIALS), kb.get_json(kb.STAINS), current_sources())
+
+
+def _open(sources: Dict[str, str]) -> GuideMatrix:
+    path = matrix_path()
+    try:
+        data = read(path)
+        if data["sources"] == sources:
+            return GuideMatrix(data)
+        logger.warning("가이드 행렬 파일이 원본과 다름(메모리에서 생성, build_guide_matrix 필요): %s", path)
+    except (OSError, ValueError, pickle.UnpicklingError, EOFError) as e:
+        logger.warning("가이드 행렬 파일 없음/손상(메모리에서 생성, build_guide_matrix 필요): %s (%s)", path, e)
+
+    # 요청 스레드에서는 배포 디렉터리에 쓰지 않는다(파일은 build_guide_matrix 명령으로만 생성)
+    return GuideMatrix(build_current())
+
+
+_lock = threading.Lock()
+_matrix: Optional[GuideMatrix] = None
+_versions: Optional[Tuple[str, ...]] = None
+
+
+def get() -> GuideMatrix:
+    """현재 원본과 맞는 행렬. 소재/얼룩 파일 스냅샷이 바뀔 때만 파일을 다시 확인한다."""
+    global _matrix, _versions
+    versions = tuple(kb.load(name).version for name in SOURCES)
+    if _matrix is None or versions != _versions:
+        with _lock:
+            if _matrix is None or versions != _versions:
+                _matrix = _open(current_sources())
+                _versions = versions
+    return _matrix
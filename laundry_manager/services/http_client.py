@@ -0,0 +1,224 @@
+# laundry_manager/services/http_client.py
+"""
+외부 HTTP 호출 공통 레이어 (Clova OCR / Roboflow / Naver DataLab).
+
+- 서비스·호스트별 requests.Session 재사용 → 커넥션 풀 + keep-alive (TLS 핸드셰이크 1회)
+- 타임아웃/재시도: settings 공통 값(HTTP_READ_TIMEOUT 등) 위에 서비스별 settings.HTTP_PROFILES를 덮어씀
+- 호스트별 서킷 브레이커: 연속 실패가 임계값을 넘으면 쿨다운 동안 즉시 실패
+- 호출별 지연 시간/커넥션 풀/서킷 메트릭(metrics(), /health/에 노출)
+"""
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter, Retry
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+# settings.HTTP_PROFILES가 없을 때의 서비스별 프로필 (settings.py 기본값과 같음)
+PROFILES: Dict[str, Dict[str, Any]] = {
+    "ocr": {"read_timeout": 30.0, "retries": 1},
+    "roboflow": {"retries": 3},
+    "naver_datalab": {"read_timeout": 5.0, "retries": 1},
+}
+_PROFILE_TYPES = {"connect_timeout": float, "read_timeout": float, "retries": int}
+_RETRY_STATUS = (429, 500, 502, 503, 504)
+
+
+class CircuitOpenError(requests.RequestException):
+    """서킷이 열려 있어 호출하지 않고 바로 실패."""
+
+
+# ---- 서킷 브레이커 -------------------------------------------------------------
+class _Breaker:
+    def __init__(self, threshold: int, cooldown: float):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            # 쿨다운이 지나면 half-open: 한 번 시도해 보고 결과로 판단
+            if time.monotonic() - self.opened_at >= self.cooldown:
+                self.opened_at = time.monotonic()
+                return True
+            return False
+
+    def record(self, ok: bool):
+        with self._lock:
+            if ok:
+                self.failures = 0
+                self.opened_at = None
+            else:
+                self.failures += 1
+                if self.failures >= self.threshold:
+                    self.opened_at = time.monotonic()
+
+    @property
+    def state(self) -> str:
+        return "open" if self.opened_at is not None else "closed"
+
+
+# ---- 메트릭 ------------------------------------------------------------------
+class _Stats:
+    def __init__(self, window: int = 200):
+        self.calls = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.recent = deque(maxlen=window)
+
+    def add(self, ms: float, ok: bool):
+        self.calls += 1
+        self.errors += 0 if ok else 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+        self.recent.append(ms)
+
+    def as_dict(self) -> Dict[str, Any]:
+        recent = sorted(self.recent)
+
+        def pct(p):
+            return round(recent[min(len(recent) - 1, int(len(recent) * p))], 1) if recent else None
+
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "avg_ms": round(self.total_ms / self.calls, 1) if self.calls else None,
+            "p50_ms": pct(0.50),
+            "p95_ms": pct(0.95),
+            "max_ms": round(self.max_ms, 1),
+        }
+
+
+_lock = threading.Lock()
+_sessions: Dict[Tuple[str, str], requests.Session] = {}
+_breakers: Dict[str, _Breaker] = {}
+_stats: Dict[str, _Stats] = {}
+
+
+def _profile(service: str) -> Dict[str, Any]:
+    """공통 settings 값 → 서비스별 settings.HTTP_PROFILES 순으로 덮어쓴 타임아웃/재시도."""
+    prof = {
+        "connect_timeout": float(_setting("HTTP_CONNECT_TIMEOUT", 3.05)),
+        "read_timeout": float(_setting("HTTP_READ_TIMEOUT", 20.0)),
+        "retries": int(_setting("HTTP_RETRIES", 2)),
+    }
+    overrides = (_setting("HTTP_PROFILES", PROFILES) or {}).get(service) or {}
+    for key, cast in _PROFILE_TYPES.items():
+        if key in overrides:
+            prof[key] = cast(overrides[key])
+    return prof
+
+
+def _session_for(service: str, host: str) -> requests.Session:
+    key = (service, host)
+    sess = _sessions.get(key)
+    if sess is not None:
+        return sess
+    with _lock:
+        sess = _sessions.get(key)
+        if sess is None:
+            retries = Retry(
+                total=_profile(service)["retries"],
+                backoff_factor=0.5,
+                status_forcelist=_RETRY_STATUS,
+                allowed_methods=frozenset(["GET", "POST"]),
+                raise_on_status=False,
+            )
+            pool = int(_setting("HTTP_POOL_MAXSIZE", 10))
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool, max_retries=retries)
+            sess = requests.Session()
+            sess.mount("https://", adapter)
+            sess.mount("http://", adapter)
+            _sessions[key] = sess
+        return sess
+
+
+def _breaker_for(host: str) -> _Breaker:
+    with _lock:
+        br = _breakers.get(host)
+        if br is None:
+            br = _Breaker(
+                threshold=int(_setting("HTTP_BREAKER_FAILURES", 5)),
+                cooldown=float(_setting("HTTP_BREAKER_COOLDOWN", 30.0)),
+            )
+            _breakers[host] = br
+        return br
+
+
+def request(service: str, method: str, url: str, timeout=None, **kwargs) -> requests.Response:
+    """
+    공통 요청 함수. 실패는 requests.RequestException 계열로 올라간다
+    (서킷 오픈 시 CircuitOpenError).
+    """
+    host = urlsplit(url).netloc
+    breaker = _breaker_for(host)
+    if not breaker.allow():
+        raise CircuitOpenError(f"{service}: {host} 서킷 오픈 상태 (최근 연속 실패 {breaker.failures}회)")
+
+    if timeout is None:
+        prof = _profile(service)
+        timeout = (prof["connect_timeout"], prof["read_timeout"])
+
+    start = time.perf_counter()
+    ok = False
+    try:
+        resp = _session_for(service, host).request(method, url, timeout=timeout, **kwargs)
+        ok = resp.status_code < 500
+        return resp
+    finally:
+        ms = (time.perf_counter() - start) * 1000
+        breaker.record(ok)
+        with _lock:
+            _stats.setdefault(service, _Stats()).add(ms, ok)
+        logger.debug("%s %s %s %.1fms ok=%s", service, method, url.split("?")[0], ms, ok)
+
+
+def get(service: str, url: str, **kwargs) -> requests.Response:
+    return request(service, "GET", url, **kwargs)
+
+
+def post(service: str, url: str, **kwargs) -> requests.Response:
+    return request(service, "POST", url, **kwargs)
+
+
+def metrics() -> Dict[str, Any]:
+    """서비스별 지연 시간/에러 통계 + (서비스, 호스트)별 커넥션 풀 + 호스트별 서킷 상태."""
+    with _lock:
+        return {
+            "services": {name: st.as_dict() for name, st in _stats.items()},
+            "pools": {
+                f"{service}@{host}": _pool_stats(sess) for (service, host), sess in _sessions.items()
+            },
+            "circuits": {
+                host: {"state": br.state, "failures": br.failures} for host, br in _breakers.items()
+            },
+        }
+
+
+def _pool_stats(sess: requests.Session) -> Dict[str, Any]:
+    """urllib3 풀 매니저 기준: 열린 호스트 풀 수, 풀 크기, 유휴(재사용 대기) 커넥션 수."""
+    adapter = sess.get_adapter("https://")
+    manager = adapter.poolmanager
+    pools = [manager.pools[key] for key in list(manager.pools.keys())]
+    return {
+        "maxsize": adapter._pool_maxsize,
+        "pools": len(pools),
+        "idle": sum(p.pool.qsize() for p in pools if p.pool is not None),
+        "retries": adapter.max_retries.total,
+    }
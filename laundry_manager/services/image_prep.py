@@ -0,0 +1,123 @@
+# laundry_manager/services/image_prep.py
+"""
+업로드 이미지 전처리 (Pillow).
+
+원본은 그대로 두고, OCR/Roboflow로 보낼 작은 파생 이미지를 만든다.
+  0) JPEG은 draft 모드로 축소 디코딩 (메모리 상한)
+  1) EXIF 회전 보정
+  2) 배경과 다른 영역(라벨)으로 크롭 — 판단이 애매하면 건너뜀
+  3) 긴 변을 IMAGE_PREP_MAX_SIDE 이하로 축소
+  4) JPEG 재인코딩 (Clova OCR은 webp 미지원)
+"""
+import io
+import logging
+import os
+from typing import Optional
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+
+logger = logging.getLogger(__name__)
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def _to_rgb(img):
+    from PIL import Image
+
+    if img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info):
+        rgba = img.convert("RGBA")
+        bg = Image.new("RGB", rgba.size, (255, 255, 255))
+        bg.paste(rgba, mask=rgba.split()[-1])
+        return bg
+    return img.convert("RGB")
+
+
+def _label_bbox(img):
+    """
+    네 모서리 평균색을 배경으로 보고, 배경과 충분히 다른 픽셀의 경계 상자.
+    너무 작거나(노이즈) 거의 전체면(크롭 의미 없음) None.
+    """
+    from PIL import Image, ImageChops
+
+    small = img.copy()
+    small.thumbnail((256, 256))
+    w, h = small.size
+    corners = [small.getpixel(p) for p in ((0, 0), (w - 1, 0), (0, h - 1), (w - 1, h - 1))]
+    bg_color = tuple(sum(c[i] for c in corners) // 4 for i in range(3))
+    diff = ImageChops.difference(small, Image.new("RGB", small.size, bg_color)).convert("L")
+    box = diff.point(lambda v: 255 if v > 40 else 0).getbbox()
+    if not box:
+        return None
+
+    area = (box[2] - box[0]) * (box[3] - box[1]) / float(w * h)
+    if area < 0.05 or area > 0.9:
+        return None
+
+    # 원본 좌표로 환산 + 여백
+    sx, sy = img.size[0] / float(w), img.size[1] / float(h)
+    margin = 0.03 * max(img.size)
+    return (
+        max(0, int(box[0] * sx - margin)),
+        max(0, int(box[1] * sy - margin)),
+        min(img.size[0], int(box[2] * sx + margin)),
+        min(img.size[1], int(box[3] * sy + margin)),
+    )
+
+
+def build_derivative(fp) -> bytes:
+    """파일 경로/파일 객체 → 전처리된 JPEG 바이트."""
+    from PIL import Image, ImageOps
+
+    max_side = int(_setting("IMAGE_PREP_MAX_SIDE", 1600))
+    with Image.open(fp) as src:
+        # JPEG은 DCT 단계에서 1/2~1/8로 줄여 디코딩 → 원본 해상도 크기의 픽셀 버퍼를 만들지 않음
+        # (크롭 여유를 위해 목표의 2배 이상은 유지)
+        src.draft("RGB", (max_side * 2, max_side * 2))
+        img = ImageOps.exif_transpose(src)
+        img = _to_rgb(img)
+
+    if _setting("IMAGE_PREP_CROP", True):
+        box = _label_bbox(img)
+        if box:
+            img = img.crop(box)
+
+    if max(img.size) > max_side:
+        img.thumbnail((max_side, max_side), Image.LANCZOS)
+
+    out = io.BytesIO()
+    img.save(out, "JPEG", quality=int(_setting("IMAGE_PREP_QUALITY", 85)), optimize=True)
+    return out.getvalue()
+
+
+def ensure_derivative(instance) -> str:
+    """
+    UploadedImage의 파생 이미지를 만들어 두고 그 경로를 반환.
+    비활성화/실패 시 원본 경로(기존 동작).
+    """
+    if instance.derivative:
+        return instance.derivative.path
+    if not _setting("IMAGE_PREP_ENABLED", True):
+        return instance.image.path
+
+    try:
+        data = build_derivative(instance.image.path)
+    except Exception as e:
+        logger.warning("이미지 전처리 실패(원본 사용) %s: %s", instance.image.name, e)
+        return instance.image.path
+
+    # 원본보다 커지면 의미 없으므로 원본 사용
+    original_size: Optional[int] = None
+    try:
+        original_size = os.path.getsize(instance.image.path)
+    except OSError:
+        pass
+    if original_size is not None and len(data) >= original_size:
+        return instance.image.path
+
+    base = os.path.splitext(os.path.basename(instance.image.name))[0]
+    instance.derivative.save(f"{base}.jpg", ContentFile(data), save=False)
+    instance.save(update_fields=["derivative"])
+    return instance.derivative.path
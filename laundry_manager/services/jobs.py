@@ -0,0 +1,178 @@
+# laundry_manager/services/jobs.py
+"""
+업로드 인식 작업 큐 (외부 브로커 없이 DB(SQLite) 상태 + 프로세스 내 스레드 풀).
+
+- submit(): RecognitionJob 행을 만들고 커밋 후 워커 풀에 넘김 → 요청은 바로 반환
+- 워커: queued → running 조건부 UPDATE로 작업을 선점(중복 실행 방지) 후 처리
+- 프로세스가 죽어 running으로 남은 오래된 작업은 풀 생성 시 다시 큐에 넣고,
+  이후에도 상태 폴링(job_status_view) 때마다 그 작업이 멈춰 있으면 다시 큐에 넣음
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Any, Callable, Dict, Optional
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from ..models import RecognitionJob
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+# ---- 작업 처리기 -------------------------------------------------------------
+def _run_ocr(job: RecognitionJob) -> Dict[str, Any]:
+    """OCR + Roboflow 분류 병렬 → 룰 분석/융합 → 결과 저장 (services/recognition)."""
+    from .image_prep import ensure_derivative
+    from .recognition import recognize
+
+    result = recognize(
+        ensure_derivative(job.image), result_path=job.image.image.path,
+        session_key=job.session_key, user=job.user, image=job.image,
+    )
+    if result.get("error"):
+        raise RuntimeError(result["error"])
+    return result
+
+
+def _run_classify(job: RecognitionJob) -> Dict[str, Any]:
+    from ..views.roboflow_client import classify_file
+    from .image_prep import ensure_derivative
+
+    return classify_file(ensure_derivative(job.image))
+
+
+HANDLERS: Dict[str, Callable[[RecognitionJob], Dict[str, Any]]] = {
+    "ocr": _run_ocr,
+    "classify": _run_classify,
+}
+
+
+# ---- 워커 --------------------------------------------------------------------
+def _execute(job_id):
+    close_old_connections()
+    try:
+        claimed = RecognitionJob.objects.filter(
+            pk=job_id, status=RecognitionJob.STATUS_QUEUED
+        ).update(status=RecognitionJob.STATUS_RUNNING, updated_at=timezone.now())
+        if not claimed:
+            return  # 다른 워커가 이미 처리 중/완료
+
+        job = RecognitionJob.objects.select_related("image", "user").get(pk=job_id)
+        try:
+            job.result = HANDLERS[job.kind](job)
+            job.status = RecognitionJob.STATUS_DONE
+            job.error = ""
+        except Exception as e:
+            logger.exception("인식 작업 실패 %s", job_id)
+            job.status = RecognitionJob.STATUS_FAILED
+            job.error = str(e)
+        job.save(update_fields=["result", "status", "error", "updated_at"])
+    finally:
+        close_old_connections()
+
+
+def _stale_cutoff():
+    stale_after = timedelta(seconds=int(getattr(settings, "RECOGNITION_JOB_STALE_SECONDS", 600)))
+    return timezone.now() - stale_after
+
+
+def _requeue_stale():
+    """이전 프로세스에서 중단된 작업을 다시 큐에 넣는다."""
+    RecognitionJob.objects.filter(
+        status=RecognitionJob.STATUS_RUNNING, updated_at__lt=_stale_cutoff()
+    ).update(status=RecognitionJob.STATUS_QUEUED, updated_at=timezone.now())
+    return list(
+        RecognitionJob.objects.filter(status=RecognitionJob.STATUS_QUEUED).values_list("pk", flat=True)
+    )
+
+
+def requeue_if_stale(job: RecognitionJob) -> RecognitionJob:
+    """
+    상태 폴링 시 호출. running/queued로 RECOGNITION_JOB_STALE_SECONDS 넘게 멈춘 작업이면
+    (워커 프로세스가 죽었거나 제출이 유실됨) 다시 큐에 넣고 워커 풀에 넘긴다.
+    멈춤 판정은 DB 기준 조건부 UPDATE(status ∈ running/queued AND updated_at < 기준 시각)로 하므로
+    폴링하던 사이 워커가 진행·완료했거나 다른 폴링이 먼저 다시 넣었으면 갱신 0건 → 제출하지 않는다.
+    """
+    if job.is_finished:
+        return job
+    requeued = RecognitionJob.objects.filter(
+        pk=job.pk,
+        status__in=[RecognitionJob.STATUS_RUNNING, RecognitionJob.STATUS_QUEUED],
+        updated_at__lt=_stale_cutoff(),
+    ).update(status=RecognitionJob.STATUS_QUEUED, updated_at=timezone.now())
+    if requeued:
+        logger.warning("멈춘 인식 작업 다시 큐에 넣음 %s (%s)", job.pk, job.status)
+        _get_executor().submit(_execute, job.pk)
+        job.refresh_from_db()
+    return job
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=int(getattr(settings, "RECOGNITION_WORKERS", 2)),
+                thread_name_prefix="recognition",
+            )
+            try:
+                for pk in _requeue_stale():
+                    _executor.submit(_execute, pk)
+            except Exception:
+                logger.exception("중단된 인식 작업 복구 실패")
+        return _executor
+
+
+def submit(kind: str, image, session_key: str = "", user=None) -> RecognitionJob:
+    """작업 등록 후 즉시 반환. 실제 실행은 트랜잭션 커밋 뒤 워커 풀에서. user는 로그인 사용자만 저장."""
+    if kind not in HANDLERS:
+        raise ValueError(f"알 수 없는 작업 종류: {kind}")
+    if user is not None and not getattr(user, "is_authenticated", False):
+        user = None
+    job = RecognitionJob.objects.create(kind=kind, image=image, session_key=session_key or "", user=user)
+    executor = _get_executor()
+    transaction.on_commit(lambda: executor.submit(_execute, job.pk))
+    return job
+
+
+def async_requested(request) -> bool:
+    """요청 파라미터 async=1|0 우선, 없으면 settings.RECOGNITION_ASYNC."""
+    flag = request.POST.get("async") or request.GET.get("async")
+    if flag is not None:
+        return flag.lower() in ("1", "true", "yes", "y")
+    return getattr(settings, "RECOGNITION_ASYNC", False)
+
+
+def session_key_for(request) -> str:
+    # 작업을 세션에 묶기 위해 세션 키가 없으면 먼저 만든다
+    if not request.session.session_key:
+        request.session.save()
+    return request.session.session_key
+
+
+def get_for_session(job_id, session_key: str) -> Optional[RecognitionJob]:
+    """요청 세션이 만든 작업만 조회."""
+    if not session_key:
+        return None
+    try:
+        return RecognitionJob.objects.get(pk=job_id, session_key=session_key)
+    except (RecognitionJob.DoesNotExist, ValidationError, ValueError):
+        return None
+
+
+def as_status(job: RecognitionJob) -> Dict[str, Any]:
+    return {
+        "id": str(job.pk),
+        "kind": job.kind,
+        "status": job.status,
+        "finished": job.is_finished,
+        "error": job.error or None,
+        "result": job.result if job.status == RecognitionJob.STATUS_DONE else None,
+    }
@@ -0,0 +1,282 @@
+# laundry_manager/services/knowledge_base.py
+"""
+json_data/*.json 지식 베이스 레지스트리.
+
+- 파일별로 프로세스당 한 번만 파싱하고, 파일 mtime이 바뀌었을 때만 다시 읽는다.
+- 뷰에는 읽기 전용(FrozenDict/FrozenList) 데이터와 미리 만든 인덱스를 넘긴다.
+  (dict/list 하위 클래스라 기존 isinstance 검사, json 직렬화, 템플릿 렌더링은 그대로 동작)
+- 파생 구조(매처, 검색 인덱스 등)는 derived()로 스냅샷 단위 캐시.
+"""
+import os
+import json
+import hashlib
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional
+
+from django.conf import settings
+from django.utils.text import slugify
+
+logger = logging.getLogger(__name__)
+
+JSON_DIR = os.path.join(settings.BASE_DIR, "laundry_manager", "json_data")
+
+MATERIALS = "blackup.json"
+STAINS = "persil_v2.json"
+SYMBOLS = "washing_symbol.json"
+DICTIONARY = "dictionary.json"
+LAUNDROMATS = "laundromats.json"
+
+# 로드 실패 시 돌려줄 안전한 기본 구조
+_DEFAULTS = {
+    MATERIALS: {"material_washing_tips": []},
+    STAINS: {"washing_tips_categories": []},
+    SYMBOLS: [],
+    DICTIONARY: {},
+    LAUNDROMATS: {},
+}
+
+
+# ---- 읽기 전용 컨테이너 ------------------------------------------------------
+def _readonly(self, *args, **kwargs):
+    raise TypeError("지식 베이스 데이터는 읽기 전용입니다. dict(...)/list(...)로 복사해서 쓰세요.")
+
+
+class FrozenDict(dict):
+    __slots__ = ()
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __reduce__(self):
+        return (dict, (dict(self),))
+
+
+class FrozenList(list):
+    __slots__ = ()
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _readonly
+    append = extend = insert = pop = remove = clear = sort = reverse = _readonly
+
+    def __reduce__(self):
+        return (list, (list(self),))
+
+
+def freeze(obj):
+    """json 파싱 결과를 재귀적으로 읽기 전용 컨테이너로 변환."""
+    if isinstance(obj, dict):
+        return FrozenDict((k, freeze(v)) for k, v in obj.items())
+    if isinstance(obj, (list, tuple)):
+        return FrozenList(freeze(v) for v in obj)
+    return obj
+
+
+def thaw(obj):
+    """읽기 전용 데이터를 수정 가능한 일반 dict/list로 깊은 복사."""
+    if isinstance(obj, dict):
+        return {k: thaw(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [thaw(v) for v in obj]
+    return obj
+
+
+# ---- 인덱스 빌더 -------------------------------------------------------------
+def _index_materials(data) -> Dict[str, Any]:
+    # '면(Cotton)' → '면(cotton)', '면' 두 키로 등록
+    by_name = {}
+    for it in data.get("material_washing_tips", []):
+        name = (it.get("material") or "").strip()
+        if not name:
+            continue
+        by_name.setdefault(name.lower(), it)
+        base = name.split("(")[0].strip().lower()
+        if base:
+            by_name.setdefault(base, it)
+    return {"by_name": by_name}
+
+
+def _index_stains(data) -> Dict[str, Any]:
+    by_title = {}
+    for it in data.get("washing_tips_categories", []):
+        title = (it.get("title") or "").strip()
+        if title:
+            by_title.setdefault(title, it)
+    return {"by_title": by_title}
+
+
+def _index_symbols(data) -> Dict[str, Any]:
+    by_id = {}
+    for it in data or []:
+        sid = it.get("id")
+        if isinstance(sid, str) and sid:
+            by_id.setdefault(sid, it)
+    return {"by_id": by_id}
+
+
+def dictionary_image(item_id) -> str:
+    """사전 항목 이미지 경로 (static 기준). 파일명은 항목 id."""
+    return f"dictionary_image/{item_id}.jpg"
+
+
+def _index_dictionary(data) -> Dict[str, Any]:
+    """
+    항목마다 id/slug는 dictionary.json에 저장된 값을 쓴다(순서를 바꿔도 이미지·주소 유지).
+    id가 없는 항목만 예전 규칙(전체 순번)으로, slug가 없으면 제목으로 만든다.
+    entries: [{"id", "slug", "category", "title", "image", "item"}] (파일 순서)
+    """
+    entries, by_id, by_slug, by_title = [], {}, {}, {}
+    position = 0
+    for category_key, items in data.items():
+        for it in items or []:
+            position += 1
+            title = it.get("title")
+            if not title:
+                continue
+            item_id = it.get("id")
+            if not isinstance(item_id, int):
+                item_id = position
+            if item_id in by_id:
+                logger.warning("사전 항목 id 중복 %s: %s", item_id, title)
+                continue
+            entry = {
+                "id": item_id,
+                "slug": it.get("slug") or slugify(title, allow_unicode=True) or str(item_id),
+                "category": category_key,
+                "title": title,
+                "image": dictionary_image(item_id),
+                "item": it,
+            }
+            entries.append(entry)
+            by_id[item_id] = entry
+            by_slug.setdefault(entry["slug"], entry)
+            by_title.setdefault(title, entry)
+    return {"entries": entries, "by_id": by_id, "by_slug": by_slug, "by_title": by_title}
+
+
+_INDEXERS: Dict[str, Callable[[Any], Dict[str, Any]]] = {
+    MATERIALS: _index_materials,
+    STAINS: _index_stains,
+    SYMBOLS: _index_symbols,
+    DICTIONARY: _index_dictionary,
+}
+
+
+# ---- 스냅샷/레지스트리 -------------------------------------------------------
+@dataclass(frozen=True)
+class Snapshot:
+    """한 JSON 파일의 특정 시점(mtime) 파싱 결과."""
+    path: str
+    mtime: Optional[float]
+    data: Any
+    index: FrozenDict
+    derived: Dict[str, Any] = field(default_factory=dict, compare=False, repr=False)
+    locks: Dict[str, threading.Lock] = field(default_factory=dict, compare=False, repr=False)
+
+    @property
+    def version(self) -> str:
+        return f"{os.path.basename(self.path)}@{self.mtime or 0:.6f}"
+
+
+_lock = threading.RLock()
+_snapshots: Dict[str, Snapshot] = {}
+
+
+def _resolve(name: str) -> str:
+    return name if os.path.isabs(name) else os.path.join(JSON_DIR, name)
+
+
+def _mtime(path: str) -> Optional[float]:
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+def _build(path: str, mtime: Optional[float]) -> Snapshot:
+    name = os.path.basename(path)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            raw = json.load(f)
+    except Exception as e:
+        logger.warning("지식 베이스 로드 실패 %s: %s", path, e)
+        raw = _DEFAULTS.get(name, {})
+        mtime = None  # 실패 스냅샷은 다음 호출에서 다시 시도
+
+    data = freeze(raw)
+    indexer = _INDEXERS.get(name)
+    index = freeze(indexer(data)) if indexer and isinstance(data, (dict, list)) else FrozenDict()
+    return Snapshot(path=path, mtime=mtime, data=data, index=index)
+
+
+def load(name: str) -> Snapshot:
+    """
+    파일 스냅샷 반환. name은 json_data 기준 파일명 또는 절대 경로.
+    mtime이 그대로면 캐시된 스냅샷을 재사용한다.
+    """
+    path = _resolve(name)
+    mtime = _mtime(path)
+    snap = _snapshots.get(path)
+    if snap is not None and snap.mtime is not None and snap.mtime == mtime:
+        return snap
+
+    with _lock:
+        snap = _snapshots.get(path)
+        if snap is None or snap.mtime is None or snap.mtime != mtime:
+            snap = _build(path, mtime)
+            _snapshots[path] = snap
+        return snap
+
+
+def get_json(name: str):
+    """읽기 전용 JSON 데이터(기존 json.load 결과와 같은 구조)."""
+    return load(name).data
+
+
+def get_index(name: str, key: str) -> FrozenDict:
+    """미리 만든 인덱스 조회. 예) get_index(STAINS, "by_title")"""
+    return load(name).index.get(key, FrozenDict())
+
+
+def derived(name: str, key: str, builder: Callable[[Snapshot], Any]):
+    """
+    스냅샷에서 파생되는 구조를 스냅샷 수명 동안 캐시.
+    파일이 바뀌어 새 스냅샷이 생기면 자동으로 다시 만든다.
+    """
+    snap = load(name)
+    try:
+        return snap.derived[key]
+    except KeyError:
+        pass
+    # 전역 잠금은 (스냅샷, 키)별 잠금을 꺼낼 때만 잡는다 → 느린 빌더(행렬/빨래방 파일 생성,
+    # 내용 해시)가 다른 파일의 load()나 다른 키의 빌드를 막지 않음. 같은 키는 한 번만 빌드
+    with _lock:
+        lock = snap.locks.setdefault(key, threading.Lock())
+    with lock:
+        if key not in snap.derived:
+            snap.derived[key] = builder(snap)
+        return snap.derived[key]
+
+
+def _content_sha256(snap: Snapshot) -> str:
+    if snap.mtime is None:
+        return "missing"
+    with open(snap.path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def content_hash(name: str) -> str:
+    """파일 내용 sha256 (스냅샷마다 1회 계산). 로드 실패 스냅샷은 "missing"."""
+    return derived(name, "content_sha256", _content_sha256)
+
+
+def versions() -> Dict[str, Optional[str]]:
+    """현재 메모리에 있는 스냅샷 버전(파일명@mtime). 로드 실패 스냅샷은 None."""
+    return {
+        os.path.basename(path): (snap.version if snap.mtime is not None else None)
+        for path, snap in sorted(_snapshots.items())
+    }
+
+
+def clear():
+    """모든 스냅샷 폐기(테스트/관리 명령용)."""
+    with _lock:
+        _snapshots.clear()
@@ -0,0 +1,230 @@
+# laundry_manager/services/laundromat_dataset.py
+"""
+빨래방 데이터 정규화(ingest) + 열 단위 바이너리 파일.
+
+ingest(raw): laundromats.json({지역: [항목...]}) → 검증/정규화된 행 목록 + 오류 목록
+  - 좌표: TM(EPSG:5181) 값은 WGS84로 변환(coords.normalize), 판단 불가하면 오류로 제외
+  - rating: 숫자(0~5)만, false/빈값 → None / hours, phone_number: 문자열만, false → None
+  - 행은 격자 칸(CELL_DEG) → id 순으로 정렬되어 칸마다 연속 구간을 이룸
+
+파일 형식 (LAUNDROMAT_DATASET_PATH):
+  MAGIC | uint32 헤더 길이 | 헤더 JSON | 8바이트 정렬된 열 블록
+  - 실수 열(lat/lng: float64, rating: float64, NaN=없음)은 array 그대로
+  - 문자열 열은 uint32 오프셋(n+1개) + UTF-8 바이트
+  - 헤더: 행 수, 열 위치, 격자 칸 → [시작, 끝), 원본 JSON sha256
+Dataset.open()은 파일을 mmap하고 memoryview.cast로 열을 바로 읽는다(파싱 없음).
+"""
+import hashlib
+import json
+import logging
+import math
+import mmap
+import os
+import struct
+from array import array
+from typing import Any, Dict, List, Optional, Tuple
+
+from . import coords
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"LMDS\x01\x00\x00\x00"
+FORMAT_VERSION = 1
+CELL_DEG = 0.01
+
+FLOAT_COLUMNS = ("lat", "lng", "rating")
+STRING_COLUMNS = ("id", "region", "name", "address", "phone_number", "hours")
+
+
+def cell_of(lat: float, lng: float) -> Tuple[int, int]:
+    return int(math.floor(lat / CELL_DEG)), int(math.floor(lng / CELL_DEG))
+
+
+# ---- 검증/정규화 -------------------------------------------------------------------
+def _number(value) -> Optional[float]:
+    # bool은 int 하위 클래스 → 먼저 제외 (값이 없을 때 false로 들어 있음)
+    if isinstance(value, bool) or value is None:
+        return None
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return number if math.isfinite(number) else None
+
+
+def _text(value) -> Optional[str]:
+    if isinstance(value, str):
+        value = value.strip()
+        return value or None
+    return None
+
+
+def normalize_item(region: str, n: int, item: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], List[str]]:
+    """원본 항목 1개 → (정규화된 행 또는 None, 경고/오류 메시지)."""
+    where = f"{region}[{n}]"
+    problems: List[str] = []
+    if not isinstance(item, dict):
+        return None, [f"{where}: 객체가 아님"]
+    name = _text(item.get("name"))
+    if not name:
+        return None, [f"{where}: name 없음"]
+
+    a, b = _number(item.get("latitude")), _number(item.get("longitude"))
+    point = coords.normalize(a, b) if a is not None and b is not None else None
+    if point is None:
+        return None, [f"{where} {name}: 좌표를 해석할 수 없음 ({item.get('latitude')!r}, {item.get('longitude')!r})"]
+    lat, lng, converted = point
+    if converted:
+        problems.append(f"{where} {name}: TM 좌표 변환 → ({lat:.6f}, {lng:.6f})")
+
+    rating = _number(item.get("rating"))
+    if rating is not None and not 0 <= rating <= 5:
+        problems.append(f"{where} {name}: rating 범위 밖 {rating!r} → 없음")
+        rating = None
+
+    return {
+        "id": f"{region}-{n}",
+        "region": region,
+        "name": name,
+        "address": _text(item.get("address")),
+        "phone_number": _text(item.get("phone_number")),
+        "hours": _text(item.get("hours")),
+        "lat": round(lat, 7),
+        "lng": round(lng, 7),
+        "rating": rating,
+    }, problems
+
+
+def ingest(raw) -> Tuple[List[Dict[str, Any]], List[str], int]:
+    """→ (칸 순서로 정렬된 행, 메시지, 제외된 항목 수)"""
+    rows, messages, dropped = [], [], 0
+    if not isinstance(raw, dict):
+        return [], ["최상위가 {지역: [...]} 객체가 아님"], 0
+    for region, items in raw.items():
+        if not isinstance(items, list):
+            messages.append(f"{region}: 목록이 아님")
+            continue
+        for n, item in enumerate(items):
+            row, problems = normalize_item(region, n, item)
+            messages.extend(problems)
+            if row is None:
+                dropped += 1
+            else:
+                rows.append(row)
+    rows.sort(key=lambda r: (cell_of(r["lat"], r["lng"]), r["id"]))
+    return rows, messages, dropped
+
+
+def source_digest(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+# ---- 쓰기 -----------------------------------------------------------------------
+def _pad8(buf: bytearray) -> None:
+    buf.extend(b"\0" * (-len(buf) % 8))
+
+
+def write(rows: List[Dict[str, Any]], path: str, source_sha256: str = "") -> str:
+    """정렬된 행 → 열 단위 파일(임시 파일에 쓰고 교체)."""
+    body = bytearray()
+    columns: Dict[str, Dict[str, int]] = {}
+    for name in FLOAT_COLUMNS:
+        _pad8(body)
+        values = array("d", (math.nan if r[name] is None else r[name] for r in rows))
+        columns[name] = {"offset": len(body)}
+        body.extend(values.tobytes())
+    for name in STRING_COLUMNS:
+        blob = bytearray()
+        offsets = array("I", [0])
+        for r in rows:
+            blob.extend((r[name] or "").encode("utf-8"))
+            offsets.append(len(blob))
+        _pad8(body)
+        columns[name] = {"offsets": len(body), "data": len(body) + len(offsets) * offsets.itemsize}
+        body.extend(offsets.tobytes())
+        body.extend(blob)
+
+    cells: Dict[Tuple[int, int], List[int]] = {}
+    for i, r in enumerate(rows):
+        span = cells.setdefault(cell_of(r["lat"], r["lng"]), [i, i])
+        span[1] = i + 1
+
+    header = json.dumps({
+        "version": FORMAT_VERSION,
+        "count": len(rows),
+        "cell_deg": CELL_DEG,
+        "columns": columns,
+        "cells": [[cy, cx, s, e] for (cy, cx), (s, e) in cells.items()],
+        "source_sha256": source_sha256,
+    }, separators=(",", ":")).encode("utf-8")
+    prefix = MAGIC + struct.pack("<I", len(header)) + header
+    prefix += b"\0" * (-len(prefix) % 8)
+
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(prefix)
+        f.write(body)
+    os.replace(tmp, path)
+    return path
+
+
+# ---- 읽기 -----------------------------------------------------------------------
+class Dataset:
+    """mmap된 열 단위 빨래방 데이터. lat/lng/rating은 float 배열(memoryview), 문자열은 행 단위로 디코딩."""
+
+    def __init__(self, header: Dict[str, Any], buf, owner=None):
+        self.header = header
+        self.count = int(header["count"])
+        self.source_sha256 = header.get("source_sha256", "")
+        self.cells: Dict[Tuple[int, int], Tuple[int, int]] = {
+            (cy, cx): (s, e) for cy, cx, s, e in header["cells"]
+        }
+        self._owner = owner  # mmap 수명 유지
+        view = memoryview(buf)
+        n = self.count
+        cols = header["columns"]
+        self.floats = {
+            name: view[cols[name]["offset"]:cols[name]["offset"] + 8 * n].cast("d") for name in FLOAT_COLUMNS
+        }
+        self.lat, self.lng, self.rating = self.floats["lat"], self.floats["lng"], self.floats["rating"]
+        self._strings = {}
+        for name in STRING_COLUMNS:
+            off, data = cols[name]["offsets"], cols[name]["data"]
+            self._strings[name] = (view[off:off + 4 * (n + 1)].cast("I"), view[data:])
+
+    @classmethod
+    def open(cls, path: str) -> "Dataset":
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if mm[:len(MAGIC)] != MAGIC:
+            mm.close()
+            raise ValueError(f"빨래방 데이터 파일 형식이 아님: {path}")
+        (size,) = struct.unpack_from("<I", mm, len(MAGIC))
+        start = len(MAGIC) + 4
+        header = json.loads(mm[start:start + size].decode("utf-8"))
+        if header.get("version") != FORMAT_VERSION:
+            mm.close()
+            raise ValueError(f"빨래방 데이터 파일 버전 불일치: {header.get('version')}")
+        body = start + size + (-(start + size) % 8)
+        return cls(header, memoryview(mm)[body:], owner=mm)
+
+    @classmethod
+    def from_rows(cls, rows: List[Dict[str, Any]], path: str, source_sha256: str = "") -> "Dataset":
+        write(rows, path, source_sha256)
+        return cls.open(path)
+
+    def __len__(self):
+        return self.count
+
+    def string(self, name: str, i: int) -> Optional[str]:
+        offsets, data = self._strings[name]
+        value = bytes(data[offsets[i]:offsets[i + 1]]).decode("utf-8")
+        return value or None
+
+    def row(self, i: int) -> Dict[str, Any]:
+        out: Dict[str, Any] = {name: self.string(name, i) for name in STRING_COLUMNS}
+        rating = self.rating[i]
+        out["lat"], out["lng"] = self.lat[i], self.lng[i]
+        out["rating"] = None if math.isnan(rating) else rating
+        return out
@@ -0,0 +1,121 @@
+# laundry_manager/services/laundromats.py
+"""
+빨래방(laundromats.json) 위치 검색.
+
+- 원본 JSON은 laundromat_dataset.ingest()로 검증/정규화(TM 좌표 → WGS84)해 열 단위 파일
+  (LAUNDROMAT_DATASET_PATH)로 저장해 두고, 시작 후 첫 사용 시 mmap으로 연다
+  (`python manage.py ingest_laundromats`로 미리 생성. 원본 sha256이 다르면 자동으로 다시 생성)
+- 행은 위도/경도 CELL_DEG(약 1km) 격자 칸 순서로 정렬되어 있고 칸 → [시작, 끝) 범위만 가짐
+- nearby(): 반경을 덮는 칸 구간의 lat/lng float 배열만 훑어 하버사인 거리로 가까운 k개
+  → 지역(신촌/건대 …)이 늘어도 요청 비용은 주변 점 수에만 비례
+"""
+import heapq
+import logging
+import math
+import os
+import tempfile
+from typing import Any, Dict, List, Tuple
+
+from django.conf import settings
+
+from . import knowledge_base as kb
+from .laundromat_dataset import Dataset, cell_of, ingest, source_digest, write
+
+logger = logging.getLogger(__name__)
+
+EARTH_RADIUS_M = 6371008.8
+DEFAULT_RADIUS_M = 2000
+MAX_RADIUS_M = 20000
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+
+
+def haversine_m(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp, dl = p2 - p1, math.radians(lng2 - lng1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(min(1.0, math.sqrt(a)))
+
+
+def dataset_path() -> str:
+    return str(getattr(
+        settings, "LAUNDROMAT_DATASET_PATH", os.path.join(settings.BASE_DIR, "laundromats.lmds")
+    ))
+
+
+class SpatialIndex:
+    """Dataset(칸 순서 정렬 + 칸 구간표) 위의 반경/최근접 검색."""
+
+    def __init__(self, dataset: Dataset):
+        self.dataset = dataset
+
+    def __len__(self):
+        return len(self.dataset)
+
+    def nearby(self, lat: float, lng: float, radius_m: float, limit: int) -> List[Tuple[float, Dict[str, Any]]]:
+        """(거리 m, 행) 가까운 순, 반경 이내 최대 limit개."""
+        ds = self.dataset
+        dlat = math.degrees(radius_m / EARTH_RADIUS_M)
+        # 경도 1도의 길이는 위도에 따라 줄어듦 → 극지방 근처에서는 칸 범위를 넉넉히
+        coslat = max(math.cos(math.radians(lat)), 1e-6)
+        dlng = min(180.0, dlat / coslat)
+        lat_lo, lng_lo = cell_of(lat - dlat, lng - dlng)
+        lat_hi, lng_hi = cell_of(lat + dlat, lng + dlng)
+
+        found = []
+        cells, lats, lngs = ds.cells, ds.lat, ds.lng
+        for cy in range(lat_lo, lat_hi + 1):
+            for cx in range(lng_lo, lng_hi + 1):
+                span = cells.get((cy, cx))
+                if span is None:
+                    continue
+                start, end = span
+                for i, la, ln in zip(range(start, end), lats[start:end], lngs[start:end]):
+                    # 사각 범위 밖은 삼각함수 계산 전에 제외
+                    if abs(la - lat) > dlat or abs(ln - lng) > dlng:
+                        continue
+                    d = haversine_m(lat, lng, la, ln)
+                    if d <= radius_m:
+                        found.append((d, i))
+        return [(d, ds.row(i)) for d, i in heapq.nsmallest(limit, found)]
+
+
+def build_dataset(raw, path: str, source_sha256: str = "") -> Tuple[Dataset, List[str], int]:
+    """원본 → 정규화 파일 작성 후 mmap으로 연 Dataset, 메시지, 제외 수."""
+    rows, messages, dropped = ingest(raw)
+    write(rows, path, source_sha256)
+    return Dataset.open(path), messages, dropped
+
+
+def _open(snap) -> SpatialIndex:
+    path = dataset_path()
+    digest = source_digest(snap.path) if snap.mtime is not None else ""
+    try:
+        ds = Dataset.open(path)
+        if ds.source_sha256 == digest:
+            return SpatialIndex(ds)
+        logger.info("빨래방 데이터 파일이 원본과 다름 → 다시 생성: %s", path)
+    except (OSError, ValueError) as e:
+        logger.info("빨래방 데이터 파일 없음/손상 → 생성: %s (%s)", path, e)
+
+    try:
+        ds, messages, dropped = build_dataset(snap.data, path, digest)
+    except OSError as e:
+        # 배포 디렉터리에 쓸 수 없으면 임시 디렉터리에 만들어 사용
+        logger.warning("빨래방 데이터 파일 저장 실패(%s) → 임시 파일 사용", e)
+        fd, tmp_path = tempfile.mkstemp(prefix="laundromats-", suffix=".lmds")
+        os.close(fd)
+        ds, messages, dropped = build_dataset(snap.data, tmp_path, digest)
+    if dropped:
+        logger.warning("빨래방 %d곳 제외(검증 실패): %s", dropped, "; ".join(messages[:5]))
+    return SpatialIndex(ds)
+
+
+def get_index() -> SpatialIndex:
+    return kb.derived(kb.LAUNDROMATS, "spatial_index", _open)
+
+
+def nearby(lat: float, lng: float, radius_m: float = DEFAULT_RADIUS_M, limit: int = DEFAULT_LIMIT):
+    radius_m = min(max(float(radius_m), 0.0), MAX_RADIUS_M)
+    limit = min(max(int(limit), 1), MAX_LIMIT)
+    return get_index().nearby(lat, lng, radius_m, limit)
@@ -0,0 +1,248 @@
+# laundry_manager/services/ocr_cache.py
+"""
+이미지 해시 기반 OCR 응답 디스크 캐시.
+
+- 키: 업로드 바이트의 SHA-256 (같은 사진 재업로드 → Clova 호출 생략)
+  (해시는 64KB 청크 단위로 따로 한 번 훑고, OCR 전송은 경로 기반 스트리밍 — 파일 전체를 메모리에 올리지 않음)
+- 선택: dHash(perceptual hash)로 거의 같은 사진도 재사용 (OCR_CACHE_PHASH)
+- 만료: TTL(생성 시각 기준) + 최대 개수 초과 시 LRU(마지막 적중 시각) 순으로 제거
+  (항목 수는 메모리에서 세다가 한도를 넘을 때만 디렉터리를 훑어 한도의 90%까지 줄임)
+- 프로세스 단위 적중/미스 카운터(stats(), /health/에 노출)
+"""
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_counters = {"hits": 0, "near_hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+# sha256 → dHash (근접 중복 탐색용, 첫 사용 시 디스크에서 채움)
+_phash_index: Optional[Dict[str, int]] = None
+# 캐시 디렉터리의 항목 수 (첫 저장 시 한 번 세고 이후 저장/삭제 때 증감, 정리할 때 실제 값으로 보정)
+_entry_count: Optional[int] = None
+EVICT_LOW_WATERMARK = 0.9
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def cache_dir() -> str:
+    return str(_setting("OCR_CACHE_DIR", os.path.join(settings.BASE_DIR, "ocr_cache")))
+
+
+def _entry_path(digest: str) -> str:
+    return os.path.join(cache_dir(), f"{digest}.json")
+
+
+# ---- 해시 -------------------------------------------------------------------
+def sha256_of(chunks: Iterable[bytes]) -> str:
+    h = hashlib.sha256()
+    for chunk in chunks:
+        h.update(chunk)
+    return h.hexdigest()
+
+
+def dhash_of(path_or_file) -> Optional[int]:
+    """64비트 dHash. Pillow가 못 여는 파일이면 None."""
+    try:
+        from PIL import Image
+        with Image.open(path_or_file) as img:
+            small = img.convert("L").resize((9, 8))
+            px = list(small.getdata())
+    except Exception as e:
+        logger.debug("dHash 계산 실패: %s", e)
+        return None
+    bits = 0
+    for row in range(8):
+        for col in range(8):
+            bits = (bits << 1) | (px[row * 9 + col] > px[row * 9 + col + 1])
+    return bits
+
+
+def fingerprint(path: str) -> Tuple[str, Optional[int]]:
+    """(sha256, dHash 또는 None). dHash는 OCR_CACHE_PHASH일 때만 계산."""
+    with open(path, "rb") as f:
+        digest = sha256_of(iter(lambda: f.read(64 * 1024), b""))
+    phash = dhash_of(path) if _setting("OCR_CACHE_PHASH", False) else None
+    return digest, phash
+
+
+# ---- 조회/저장 ----------------------------------------------------------------
+def _bump(name: str):
+    with _lock:
+        _counters[name] += 1
+
+
+def _read(digest: str) -> Optional[Dict[str, Any]]:
+    path = _entry_path(digest)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    ttl = float(_setting("OCR_CACHE_TTL", 30 * 24 * 3600))
+    if ttl and time.time() - entry.get("created", 0) > ttl:
+        _remove(digest)
+        return None
+    try:
+        os.utime(path)  # LRU: 마지막 적중 시각 = mtime
+    except OSError:
+        pass
+    return entry
+
+
+def _remove(digest: str):
+    global _entry_count
+    try:
+        os.remove(_entry_path(digest))
+    except OSError:
+        return
+    with _lock:
+        if _phash_index is not None:
+            _phash_index.pop(digest, None)
+        if _entry_count is not None:
+            _entry_count = max(0, _entry_count - 1)
+
+
+def _count_entries() -> int:
+    try:
+        return sum(1 for n in os.listdir(cache_dir()) if n.endswith(".json"))
+    except OSError:
+        return 0
+
+
+def _load_phash_index() -> Dict[str, int]:
+    global _phash_index
+    if _phash_index is None:
+        index = {}
+        folder = cache_dir()
+        if os.path.isdir(folder):
+            for name in os.listdir(folder):
+                if not name.endswith(".json"):
+                    continue
+                try:
+                    with open(os.path.join(folder, name), "r", encoding="utf-8") as f:
+                        ph = json.load(f).get("phash")
+                except (OSError, ValueError):
+                    continue
+                if ph is not None:
+                    index[name[:-5]] = int(ph)
+        _phash_index = index
+    return _phash_index
+
+
+def lookup(digest: str, phash: Optional[int] = None) -> Optional[Dict[str, Any]]:
+    """캐시된 OCR 응답. 정확히 같은 바이트 → 근접 dHash 순으로 찾는다."""
+    entry = _read(digest)
+    if entry is not None:
+        _bump("hits")
+        return entry["ocr"]
+
+    if phash is not None:
+        max_dist = int(_setting("OCR_CACHE_PHASH_DISTANCE", 4))
+        with _lock:
+            cands = list(_load_phash_index().items())
+        best = min(cands, key=lambda kv: bin(kv[1] ^ phash).count("1"), default=None)
+        if best and bin(best[1] ^ phash).count("1") <= max_dist:
+            entry = _read(best[0])
+            if entry is not None:
+                _bump("near_hits")
+                return entry["ocr"]
+
+    _bump("misses")
+    return None
+
+
+def store(digest: str, ocr_result: Dict[str, Any], phash: Optional[int] = None):
+    """OCR 응답 저장(원자적 쓰기). 에러 응답은 캐시하지 않는다."""
+    global _entry_count
+    if not ocr_result or ocr_result.get("error"):
+        return
+    folder = cache_dir()
+    os.makedirs(folder, exist_ok=True)
+    entry = {"sha256": digest, "phash": phash, "created": time.time(), "ocr": ocr_result}
+    existed = os.path.exists(_entry_path(digest))
+    tmp = None
+    try:
+        # 같은 프로세스의 여러 스레드가 같은 digest를 저장해도 임시 파일은 각자 따로(.tmp는 항목 수에서 제외)
+        fd, tmp = tempfile.mkstemp(dir=folder, prefix=f"{digest}.", suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp, _entry_path(digest))
+    except OSError as e:
+        logger.warning("OCR 캐시 저장 실패 %s: %s", digest, e)
+        if tmp and os.path.exists(tmp):
+            os.remove(tmp)
+        return
+    _bump("stores")
+    limit = int(_setting("OCR_CACHE_MAX_ENTRIES", 1000))
+    with _lock:
+        if phash is not None and _phash_index is not None:
+            _phash_index[digest] = phash
+        if _entry_count is None:
+            _entry_count = _count_entries()
+        elif not existed:
+            _entry_count += 1
+        over = _entry_count > limit
+    if over:
+        _evict(limit)
+
+
+def _evict(limit: int):
+    """LRU(mtime 오래된 순)로 한도의 EVICT_LOW_WATERMARK까지 제거 (한도를 넘었을 때만 호출)."""
+    global _entry_count
+    folder = cache_dir()
+    try:
+        names = [n for n in os.listdir(folder) if n.endswith(".json")]
+    except OSError:
+        return
+    keep = int(limit * EVICT_LOW_WATERMARK)
+    if len(names) <= limit:
+        # 다른 프로세스가 이미 정리함 → 실제 개수로 보정만
+        with _lock:
+            _entry_count = len(names)
+        return
+    entries = []
+    for n in names:
+        try:
+            entries.append((os.path.getmtime(os.path.join(folder, n)), n[:-5]))
+        except OSError:
+            continue
+    entries.sort()
+    for _, digest in entries[: len(entries) - keep]:
+        _remove(digest)
+        _bump("evictions")
+    count = _count_entries()
+    with _lock:
+        _entry_count = count
+
+
+def cached_ocr(image_path: str, perform) -> Dict[str, Any]:
+    """
+    캐시를 거쳐 OCR 수행. perform(image_path)은 실제 OCR 호출(utils.perform_ocr, 경로에서 스트리밍 전송).
+    반환값에는 원래 응답 그대로를 돌려준다.
+    """
+    digest, phash = fingerprint(image_path)
+    cached = lookup(digest, phash)
+    if cached is not None:
+        return cached
+    result = perform(image_path)
+    store(digest, result, phash)
+    return result
+
+
+def stats() -> Dict[str, Any]:
+    with _lock:
+        out = dict(_counters)
+    total = out["hits"] + out["near_hits"] + out["misses"]
+    out["hit_rate"] = round((out["hits"] + out["near_hits"]) / total, 3) if total else None
+    return out
@@ -0,0 +1,190 @@
+# laundry_manager/services/recognition.py
+"""
+단일 인식 파이프라인: OCR과 Roboflow 분류를 동시에 보내고 결과를 융합한다.
+
+    recognize(image_path)
+      ├─ (병렬) OCR(캐시 경유) ─┐
+      └─ (병렬) Roboflow 분류 ──┴→ 기호 정의/룰 분석 → fused_scores → save_result_json(RecognitionResult)
+
+전체 지연 ≈ 둘 중 느린 쪽. fused_scores는 인식 결과와 함께 저장된다.
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.conf import settings
+
+from . import ocr_cache
+from .text_rules import ENGINE
+
+logger = logging.getLogger(__name__)
+
+# 텍스트 룰과 분류기 점수 가중치 (합 1.0)
+FUSION_WEIGHTS = {"text": 0.6, "classifier": 0.4}
+# 분류기 라벨의 금지 접두어 → deny
+_DENY_PREFIXES = ("do_not_", "dont_", "not_", "no_")
+
+_lock = threading.Lock()
+_pool: Optional[ThreadPoolExecutor] = None
+
+
+def _get_pool() -> ThreadPoolExecutor:
+    global _pool
+    with _lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(
+                max_workers=int(getattr(settings, "RECOGNITION_FANOUT_WORKERS", 8)),
+                thread_name_prefix="recognition-fanout",
+            )
+        return _pool
+
+
+# ---- 융합 --------------------------------------------------------------------
+def _classifier_key(label: str) -> Tuple[str, str]:
+    """'Do-Not Tumble Dry' → ('tumble_dry', 'deny')"""
+    key = "_".join(str(label).strip().lower().replace("-", " ").split())
+    for prefix in _DENY_PREFIXES:
+        if key.startswith(prefix):
+            return key[len(prefix):], "deny"
+    return key, "allow"
+
+
+def _classifier_scores(classification: Optional[Dict[str, Any]]) -> Dict[str, float]:
+    """분류 응답에서 라벨별 신뢰도 추출(전체 confidences가 있으면 모두 사용)."""
+    if not classification:
+        return {}
+    raw = classification.get("raw") or {}
+    scores: Dict[str, float] = {}
+    confs = raw.get("confidences") if isinstance(raw, dict) else None
+    preds = raw.get("predictions") if isinstance(raw, dict) else None
+    if isinstance(confs, dict):
+        items = confs.items()
+    elif isinstance(preds, list):
+        items = ((p.get("class") or p.get("label"), p.get("confidence") or p.get("score")) for p in preds)
+    elif isinstance(preds, dict):
+        items = ((k, (v or {}).get("confidence")) for k, v in preds.items())
+    else:
+        items = []
+    for label, conf in items:
+        try:
+            if label:
+                scores[label] = max(scores.get(label, 0.0), float(conf))
+        except (TypeError, ValueError):
+            continue
+    if classification.get("label") and classification.get("label") not in scores:
+        scores[classification["label"]] = float(classification.get("confidence") or 0.0)
+    return scores
+
+
+def fuse(instructions: List[Dict[str, Any]], classification: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    룰 히트(텍스트)와 분류기 라벨을 코드 단위로 합친다.
+    반환: {"weights": {...}, "labels": [{code, state, score, text_score, classifier_score,
+                                          classifier_state, conflict, sources}, ...]}
+    labels는 score 내림차순.
+
+    두 출처가 같은 기호의 상태(allow/deny)를 다르게 보면 conflict=True로 표시하고,
+    state는 텍스트 룰(부정 표현을 직접 읽음)을 따르되 분류기 점수는 더하지 않고 뺀다
+    (반대 근거가 강할수록 점수가 낮아짐).
+    """
+    merged: Dict[str, Dict[str, Any]] = {}
+
+    def entry(code):
+        return merged.setdefault(code, {
+            "code": code, "state": None, "score": 0.0,
+            "text_score": 0.0, "classifier_score": 0.0, "classifier_state": None,
+            "conflict": False, "sources": [],
+        })
+
+    for ins in instructions or []:
+        e = entry(ins["code"])
+        e["text_score"] = 1.0
+        e["state"] = ins.get("state")
+        e["sources"].append("text")
+
+    # 같은 코드에 allow/deny 라벨이 함께 오면 신뢰도가 높은 쪽이 분류기의 판단
+    for label, conf in _classifier_scores(classification).items():
+        code, state = _classifier_key(label)
+        e = entry(code)
+        if conf > e["classifier_score"] or e["classifier_state"] is None:
+            e["classifier_score"] = round(conf, 4)
+            e["classifier_state"] = state
+        if "classifier" not in e["sources"]:
+            e["sources"].append("classifier")
+
+    for e in merged.values():
+        text = FUSION_WEIGHTS["text"] * e["text_score"]
+        classifier = FUSION_WEIGHTS["classifier"] * e["classifier_score"]
+        if e["state"] is None:
+            e["state"] = e["classifier_state"]
+        e["conflict"] = (
+            e["text_score"] > 0 and e["classifier_state"] is not None
+            and e["state"] != e["classifier_state"]
+        )
+        e["score"] = round(max(0.0, text - classifier) if e["conflict"] else text + classifier, 4)
+
+    labels = sorted(merged.values(), key=lambda e: (-e["score"], e["code"]))
+    return {"weights": dict(FUSION_WEIGHTS), "labels": labels}
+
+
+# ---- 파이프라인 --------------------------------------------------------------
+def recognize(image_path: str, result_path: Optional[str] = None,
+              session_key: str = "", user=None, image=None) -> Dict[str, Any]:
+    """
+    OCR + 분류 병렬 실행 후 룰 분석·융합·결과 저장(RecognitionResult).
+    image_path는 실제 전송할 이미지(전처리 파생본), result_path는 결과 파일명 기준(기본: image_path).
+    session_key/user/image는 결과 행의 조회 범위(세션·사용자)와 원본 업로드 연결.
+    OCR 실패 시 {"error": 메시지, ...}를 담아 반환(분류 결과는 유지).
+    """
+    from ..utils import perform_ocr, get_washing_symbol_definition, load_washing_definitions, save_result_json
+    from ..views.roboflow_client import classify_file
+
+    pool = _get_pool()
+    ocr_future = pool.submit(ocr_cache.cached_ocr, image_path, perform_ocr)
+    clf_future = pool.submit(classify_file, image_path) if getattr(settings, "RF_ENABLED", False) else None
+
+    try:
+        ocr_result = ocr_future.result()
+    except Exception as e:
+        logger.exception("OCR 실행 실패")
+        ocr_result = {"error": True, "message": f"OCR 오류: {e}"}
+    classification = None
+    if clf_future is not None:
+        try:
+            classification = clf_future.result()
+        except Exception as e:
+            logger.exception("Roboflow 분류 실행 실패")
+            classification = {"ok": False, "label": None, "confidence": None, "raw": {}, "error": str(e)}
+
+    result = {
+        "error": None,
+        "recognized_texts": [],
+        "symbol_definition": "",
+        "instructions": [],
+        "rule_keywords": [],
+        "classification": classification,
+        "fused_scores": None,
+    }
+    if ocr_result.get("error"):
+        result["error"] = ocr_result.get("message", "OCR 오류가 발생했습니다.")
+        return result
+
+    definition, texts = get_washing_symbol_definition(ocr_result, load_washing_definitions())
+    evaluated = ENGINE.evaluate(texts)
+    fused = fuse(evaluated["instructions"], classification)
+
+    save_result_json(
+        result_path or image_path, texts, definition, ocr_result,
+        rf_class_raw=(classification or {}).get("raw"),
+        fused_scores=fused,
+        session_key=session_key, user=user, image=image,
+    )
+    result.update({
+        "recognized_texts": texts or [],
+        "symbol_definition": definition or "",
+        "instructions": evaluated["instructions"],
+        "rule_keywords": evaluated["keywords"],
+        "fused_scores": fused,
+    })
+    return result
@@ -0,0 +1,295 @@
+# laundry_manager/services/recommendation.py
+"""
+세탁 추천(소재/얼룩/세탁 기호 가이드) 메모이제이션 엔진.
+
+- 입력 정규화: NFC + 앞뒤/연속 공백 정리, 소재/얼룩/기호 각각 정렬·중복 제거(소재 문자열은 쉼표로 나눔)
+  → 같은 조합이면 입력 순서/표기 차이와 상관없이 같은 키
+- 혼방/여러 얼룩: 소재·얼룩을 하나씩 별칭 색인(alias_index, 조회 LRU)으로 항목 id에 대응시키고
+  항목별 가이드(스냅샷마다 1번 생성)를 한 번에 합친다 — 세탁 온도는 가장 낮은 상한, 주의사항은 합집합
+- 캐시 키 = (지식 베이스 내용 해시, 정규화 입력). 소재/얼룩/기호 JSON 중 하나라도 내용이 바뀌면
+  해시가 달라져 예전 항목은 다시 쓰이지 않음(해시가 바뀌는 순간 비움)
+- LRU(RECOMMENDATION_CACHE_SIZE개), 적중률 등 stats() 제공(/health/에 노출)
+- 결과는 여러 요청이 공유하므로 읽기 전용(knowledge_base.freeze)으로 돌려준다
+"""
+import hashlib
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from django.conf import settings
+
+from . import knowledge_base as kb
+
+_SPACE_RE = re.compile(r"\s+")
+_SOURCES = (kb.MATERIALS, kb.STAINS, kb.SYMBOLS)
+
+Key = Tuple[Tuple[str, ...], Tuple[str, ...], Tuple[str, ...]]
+
+NO_STAIN = "특별한 얼룩이 없음"
+
+# 세탁(물) 온도 상한 추출: "최대 40°C", "30~40도"(→ 40), 낱말 힌트. 다림질 온도는 대상 아님
+_TEMP_RE = re.compile(r"(\d{2,3})\s*(?:~\s*(\d{2,3}))?\s*(?:°\s*C|℃|도)")
+_TEMP_WORDS = (
+    ("물세탁 금지", 0), ("물세탁을 하면 안", 0),
+    ("찬물", 30), ("차가운 물", 30),
+    ("미온수", 40), ("미지근", 40),
+)
+
+
+def normalize_text(value) -> str:
+    if not isinstance(value, str):
+        return ""
+    return _SPACE_RE.sub(" ", unicodedata.normalize("NFC", value)).strip()
+
+
+def _unique_sorted(values: Iterable) -> Tuple[str, ...]:
+    return tuple(sorted({v for v in (normalize_text(x) for x in values or ()) if v}))
+
+
+def canonical(material=None, stains=None, symbols=None) -> Key:
+    """(소재, 얼룩, 기호) 튜플. 소재는 쉼표 구분 문자열 또는 목록, 얼룩은 문자열 1개 또는 목록."""
+    materials = material.split(",") if isinstance(material, str) else (material or ())
+    # 얼룩 제목에는 쉼표가 들어 있음("대변, 소변, 구토 얼룩") → 문자열은 나누지 않는다
+    stains = [stains] if isinstance(stains, str) else (stains or ())
+    return _unique_sorted(materials), _unique_sorted(stains), _unique_sorted(symbols)
+
+
+def max_temperature(text) -> Optional[int]:
+    """세탁 온도 설명 → 상한(°C). 0이면 물세탁 금지, 알 수 없으면 None."""
+    if not isinstance(text, str) or not text:
+        return None
+    found = [value for word, value in _TEMP_WORDS if word in text]
+    for low, high in _TEMP_RE.findall(text):
+        found.append(int(high or low))
+    return min(found) if found else None
+
+
+# ---- 항목별 가이드 (스냅샷마다 1번) --------------------------------------------------
+# 이름 → id는 alias_index.materials()/stains()(같은 스냅샷의 같은 항목 순서)로 찾고, 여기서는 id별 가이드만 만든다
+def _material_guides(snap):
+    from .alias_index import material_items
+
+    return [
+        kb.freeze({
+            "name": it["material"].strip(),
+            "description": it.get("description", "정보 없음"),
+            "warning": it.get("warning", "주의사항 없음"),
+            "max_temperature": max_temperature(it.get("description")),
+        })
+        for it in material_items(snap.data)
+    ]
+
+
+def _stain_guides(snap):
+    from .alias_index import stain_items
+
+    guides = []
+    for it in stain_items(snap.data):
+        detail = it.get("detail") if isinstance(it.get("detail"), dict) else {}
+        guides.append(kb.freeze({
+            "title": it.get("title"),
+            "Washing_Steps": it.get("Washing_Steps"),
+            "Not_to_do": it.get("not_to_do"),
+            "Tips": it.get("tip", "팁 없음"),
+            "max_temperature": max_temperature(detail.get("물_온도")),
+        }))
+    return guides
+
+
+def _resolve(name: str, index, builder, values: Iterable[str]):
+    """이름들 → (항목 가이드 목록(항목 중복 제거, 입력 순서), 대응 못 한 이름)."""
+    guides = kb.derived(name, "recommend_guides", builder)
+    picked, seen, unresolved = [], set(), []
+    for value in values:
+        found = index.best(value)
+        if found is None or found.id >= len(guides):
+            unresolved.append(value)
+        elif found.id not in seen:
+            seen.add(found.id)
+            picked.append(guides[found.id])
+    return picked, unresolved
+
+
+def _unique(values: Iterable[str]) -> list:
+    out, seen = [], set()
+    for v in values:
+        if v and v not in seen:
+            seen.add(v)
+            out.append(v)
+    return out
+
+
+def _as_list(value) -> list:
+    if isinstance(value, (list, tuple)):
+        return list(value)
+    return [value] if value else []
+
+
+def _strictest(temps: Iterable[Optional[int]]) -> Optional[int]:
+    known = [t for t in temps if t is not None]
+    return min(known) if known else None
+
+
+def merge_materials(guides) -> Optional[Dict[str, Any]]:
+    """소재 가이드 합치기. 1개면 그 가이드 그대로(+members), 없으면 None."""
+    if not guides:
+        return None
+    if len(guides) == 1:
+        return {**guides[0], "members": list(guides)}
+    return {
+        "name": ", ".join(g["name"] for g in guides),
+        "description": "\n".join(f"{g['name']}: {g['description']}" for g in guides),
+        "warning": "\n".join(_unique(g["warning"] for g in guides)),
+        "max_temperature": _strictest(g["max_temperature"] for g in guides),
+        "members": list(guides),
+    }
+
+
+def merge_stains(guides):
+    """얼룩 가이드 합치기. 없으면 기존과 같은 문자열(NO_STAIN)."""
+    if not guides:
+        return NO_STAIN
+    if len(guides) == 1:
+        return {**guides[0], "members": list(guides)}
+    return {
+        "title": ", ".join(g["title"] for g in guides),
+        # 얼룩마다 순서가 다르므로 단계는 얼룩 이름을 붙여 이어 붙임
+        "Washing_Steps": [f"[{g['title']}] {step}" for g in guides for step in _as_list(g["Washing_Steps"])],
+        "Not_to_do": _unique(v for g in guides for v in _as_list(g["Not_to_do"])),
+        "Tips": _unique(v for g in guides for v in _as_list(g["Tips"])),
+        "max_temperature": _strictest(g["max_temperature"] for g in guides),
+        "members": list(guides),
+    }
+
+
+def kb_hash() -> str:
+    """소재/얼룩/기호 파일 내용 해시를 묶은 값 (파일 스냅샷마다 1회 계산)."""
+    parts = [kb.content_hash(name) for name in _SOURCES]
+    return hashlib.sha256("|".join(parts).encode("ascii")).hexdigest()[:16]
+
+
+class RecommendationEngine:
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._cache: "OrderedDict[Tuple[str, Key], Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._kb_hash: Optional[str] = None
+        self.hits = self.misses = self.evictions = 0
+
+    def _compute(self, key: Key):
+        from ..functions.recommend import get_symbol_guide
+        from . import alias_index
+
+        materials, stains, symbols = key
+        material_guides, unresolved_materials = _resolve(
+            kb.MATERIALS, alias_index.materials(), _material_guides, materials
+        )
+        stain_guides, unresolved_stains = _resolve(kb.STAINS, alias_index.stains(), _stain_guides, stains)
+        symbol_guide = get_symbol_guide(list(symbols), kb.get_json(kb.SYMBOLS))
+
+        # 물 온도 관련 기호 설명만 온도 상한에 반영(다림질/건조 온도 제외)
+        symbol_temps = [
+            max_temperature(d) for d in symbol_guide if "물의 온도" in d or "물세탁" in d
+        ]
+        temperature = _strictest(
+            [g["max_temperature"] for g in material_guides + stain_guides] + symbol_temps
+        )
+        return kb.freeze({
+            "material_guide": merge_materials(material_guides),
+            "stain_guide": merge_stains(stain_guides),
+            "symbol_guide": symbol_guide,
+            "merged": {
+                "max_temperature": temperature,
+                "no_water_wash": temperature == 0,
+                "warnings": _unique(
+                    [g["warning"] for g in material_guides]
+                    + [v for g in stain_guides for v in _as_list(g["Not_to_do"])]
+                ),
+                "materials": [g["name"] for g in material_guides],
+                "stains": [g["title"] for g in stain_guides],
+                "unresolved": {"materials": unresolved_materials, "stains": unresolved_stains},
+            },
+        })
+
+    def recommend(self, material=None, stains=None, symbols=None):
+        """
+        laundry_recommend와 같은 키(material_guide/stain_guide/symbol_guide) + merged (읽기 전용).
+        material/stains는 문자열 또는 목록.
+        """
+        return self._get(canonical(material, stains, symbols), kb_hash())
+
+    def recommend_many(self, inputs: Iterable[Tuple[Any, Any, Any]]):
+        """
+        [(material, stains, symbols), ...] → (정규화 키 목록, {키: 가이드}).
+        같은 조합은 정규화 키로 묶어 1번만 조회/계산한다.
+        """
+        version = kb_hash()
+        keys = [canonical(*args) for args in inputs]
+        guides: Dict[Key, Any] = {}
+        for key in keys:
+            if key not in guides:
+                guides[key] = self._get(key, version)
+        return keys, guides
+
+    def _get(self, key: Key, version: str):
+        with self._lock:
+            if version != self._kb_hash:
+                self._cache.clear()
+                self._kb_hash = version
+            cached = self._cache.get((version, key))
+            if cached is not None:
+                self._cache.move_to_end((version, key))
+                self.hits += 1
+                return cached
+            self.misses += 1
+
+        guides = self._compute(key)
+        with self._lock:
+            if version == self._kb_hash:
+                self._cache[(version, key)] = guides
+                self._cache.move_to_end((version, key))
+                while len(self._cache) > self.maxsize:
+                    self._cache.popitem(last=False)
+                    self.evictions += 1
+        return guides
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._cache),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+                "kb_hash": self._kb_hash,
+            }
+
+
+_engine: Optional[RecommendationEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_engine() -> RecommendationEngine:
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = RecommendationEngine(int(getattr(settings, "RECOMMENDATION_CACHE_SIZE", 1024)))
+    return _engine
+
+
+def recommend(material=None, stains=None, symbols=None):
+    return get_engine().recommend(material, stains, symbols)
+
+
+def recommend_many(inputs):
+    return get_engine().recommend_many(inputs)
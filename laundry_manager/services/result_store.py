@@ -0,0 +1,103 @@
+# laundry_manager/services/result_store.py
+"""
+인식 결과 저장소 (RecognitionResult 테이블).
+
+- save(): utils.save_result_json이 호출. 원본 응답은 zlib 압축 JSON으로 저장
+- latest_texts(): 요청 세션(로그인 시 사용자 포함)의 최신 recognized_texts
+- for_filename(): 같은 범위에서 파일명으로 최신 결과 조회
+모든 조회는 (session_key|user, created_at) 인덱스를 타며, 다른 사용자의 결과는 보지 않는다.
+"""
+import json
+import logging
+import os
+import zlib
+from typing import Any, Dict, List, Optional
+
+from django.db.models import Q
+
+from ..models import RecognitionResult
+
+logger = logging.getLogger(__name__)
+
+_PAYLOAD_KEYS = ("ocr_raw_response", "roboflow_detect_raw", "roboflow_classify_raw", "fused_scores")
+
+
+def compress(data: Dict[str, Any]) -> bytes:
+    return zlib.compress(json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8"), 6)
+
+
+def decompress(blob) -> Dict[str, Any]:
+    if not blob:
+        return {}
+    return json.loads(zlib.decompress(bytes(blob)).decode("utf-8"))
+
+
+def _user_or_none(user):
+    return user if user is not None and getattr(user, "is_authenticated", False) else None
+
+
+def save(output_data: Dict[str, Any], session_key: str = "", user=None, image=None) -> Optional[RecognitionResult]:
+    """save_result_json의 output_data(filename/recognized_texts/symbol_definition/원본 응답)를 저장."""
+    try:
+        return RecognitionResult.objects.create(
+            user=_user_or_none(user),
+            session_key=session_key or "",
+            image=image,
+            filename=os.path.basename(output_data.get("filename") or "")[:255],
+            recognized_texts=output_data.get("recognized_texts") or [],
+            symbol_definition=output_data.get("symbol_definition") or "",
+            payload=compress({k: output_data.get(k) for k in _PAYLOAD_KEYS}),
+        )
+    except Exception:
+        logger.exception("인식 결과 저장 실패")
+        return None
+
+
+def _scoped(session_key: Optional[str], user=None):
+    """세션(+로그인 사용자) 범위 쿼리셋. 범위가 없으면 None."""
+    user = _user_or_none(user)
+    if user is not None and session_key:
+        cond = Q(user=user) | Q(session_key=session_key)
+    elif user is not None:
+        cond = Q(user=user)
+    elif session_key:
+        cond = Q(session_key=session_key)
+    else:
+        return None
+    return RecognitionResult.objects.filter(cond)
+
+
+def latest(session_key: Optional[str], user=None) -> Optional[RecognitionResult]:
+    qs = _scoped(session_key, user)
+    return qs.order_by("-created_at").first() if qs is not None else None
+
+
+def latest_texts(session_key: Optional[str], user=None) -> List[str]:
+    qs = _scoped(session_key, user)
+    if qs is None:
+        return []
+    row = qs.order_by("-created_at").values_list("recognized_texts", flat=True).first()
+    return list(row or [])
+
+
+def for_filename(filename: str, session_key: Optional[str], user=None) -> Optional[RecognitionResult]:
+    """파일명(확장자 무관, 예전 {이름}_result.json 규칙과 동일)으로 최신 결과."""
+    qs = _scoped(session_key, user)
+    if qs is None or not filename:
+        return None
+    base = os.path.basename(filename)
+    stem = os.path.splitext(base)[0]
+    if not stem:
+        return None
+    return qs.filter(Q(filename=base) | Q(filename__startswith=f"{stem}.")).order_by("-created_at").first()
+
+
+def as_output(row: RecognitionResult) -> Dict[str, Any]:
+    """예전 *_result.json과 같은 모양의 dict."""
+    data = {
+        "filename": row.filename,
+        "recognized_texts": row.recognized_texts,
+        "symbol_definition": row.symbol_definition,
+    }
+    data.update(decompress(row.payload))
+    return data
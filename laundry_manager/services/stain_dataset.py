@@ -0,0 +1,252 @@
+# laundry_manager/services/stain_dataset.py
+"""
+얼룩 가이드 데이터(persil_v2.json) — 버전별 불변 스냅샷 + 무중단 교체.
+
+- StainDataset: 파일 스냅샷 1개에서 만든 가공 데이터(slug/분류/이미지) + slug 인덱스 + 상세 컨텍스트,
+  그리고 그 버전 전용 렌더링 캐시(목록 HTML, slug별 상세 HTML). 만든 뒤에는 바꾸지 않는다
+- current(): 요청마다 파일 mtime을 확인(knowledge_base.load)해 바뀌었으면 새 스냅샷을 만들어
+  참조 하나만 원자적으로 교체. 이미 진행 중인 요청은 처음 받은 스냅샷을 끝까지 사용(copy-on-write)
+- 새 파일을 읽지 못하면 마지막 정상 버전을 계속 쓰고 오류만 기록. 처음부터 실패하면 빈 데이터를
+  돌려주되 캐시하지 않아 다음 요청에서 다시 시도
+- status(): 현재 버전/항목 수/로드 시각/마지막 오류 (헬스 체크용)
+"""
+import hashlib
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from django.template.loader import render_to_string
+
+from . import knowledge_base as kb
+
+logger = logging.getLogger(__name__)
+
+IMG_MAP = {
+    "혈흔": "blood",
+    "화장품 얼룩": "cosmetic",
+    "땀 얼룩": "shirt-sweat",  # '땀과 겨드랑이 얼룩'과 구분
+    "커피": "coffee",
+    "펜과 잉크 얼룩": "pen",
+    "녹 얼룩": "rust",
+    "강황 얼룩": "curcuma",
+    "크레용 및 왁스 얼룩": "crayon",
+    "염색약, 페인트 등의 색상 얼룩": "paint",
+    "세탁과 건조 후 생긴 얼룩": "after-laundry",
+    "반려동물 소변 및 배설물 얼룩": "poop",
+    "주스 얼룩": "juice",
+    "탈취제 얼룩": "deodorant",
+    "카레와 향신료 얼룩": "curry",
+    "토마토 얼룩": "tomato",
+    "청바지 얼룩": "jean",
+    "매니큐어 얼룩": "manicure",
+    "대변, 소변, 구토 얼룩": "poop",  # 반려동물 얼룩과 동일한 이미지
+    "꽃가루 얼룩": "flower",
+    "껌 얼룩": "gum",
+    "음식 얼룩": "food-stain",
+    "섬유 유연제 얼룩": "fabric-softner",
+    "과일 및 야채 얼룩": "fruit",
+    "초콜릿 얼룩": "chocolate",
+    "땀과 겨드랑이 얼룩": "sweat-armpit",  # '땀 얼룩'과 구분
+    "윤활유 및 기름 얼룩": "oil",
+    "자외선 차단제, 크림 및 로션 얼룩": "suncream",
+    "먼지와 진흙얼룩": "dust",
+    "겨자, 케첩, 소스 얼룩": "sauce",
+    "곰팡이 얼룩": "mold",
+    "잔디의 녹색 색소 얼룩": "grass",
+    "적포도주 얼룩": "wine",
+    "모발 염료 및 염색약 얼룩": "hair-dye",
+    "아이스크림 얼룩": "icecream",
+    "치약 얼룩": "toothpaste",
+    "아보카도 얼룩": "avocado",
+    "옷감에서 얼룩 제거하는 법": "clothes",
+    "시트에서 얼룩 제거하기": "bed-sheet",
+    "오래되고 마른 얼룩을 제거하는 법": "old-dry",
+    "흰 옷에서 얼룩을 제거하는 방법": "white-shirt",
+    "면 옷의 얼룩 제거법": "cotton",
+    "속옷에서 얼룩 제거하는 법": "underwear",
+    "얼룩 제거를 위한 일반적인 팁": "NormalTipForStain",
+    "흰 바지의 얼룩 제거법": "white-pants",
+    "비단에서 얼룩 제거하기": "silk",
+    "폴리에스테르 옷감의 얼룩 제거": "polyester",
+    "모자에서 땀 얼룩 제거하는 법": "sweat-cap",
+}
+
+# 자주 찾는 얼룩(상단 가로 목록)
+FREQUENT_TITLES = frozenset([
+    "혈흔",
+    "화장품 얼룩",
+    "땀 얼룩",
+    "커피와 차 얼룩",
+    "펜과 잉크 얼룩",
+    "염색약, 페인트 등의 색상 얼룩",
+    "세탁과 건조 후 생긴 얼룩",
+    "껌 얼룩",
+    "자외선 차단제, 크림 및 로션 얼룩",
+    "겨자, 케첩, 소스 얼룩",
+])
+
+FOOD_KEYWORDS = (
+    "커피", "차", "주스", "카레", "토마토", "음식", "과일", "채소", "초콜릿", "적포도주",
+    "아이스크림", "아보카도", "소스", "강황",
+)
+LIFE_KEYWORDS = (
+    "녹", "크레용", "왁스", "반려동물", "탈취제", "청바지", "매니큐어", "대변", "소변", "꽃가루",
+    "껌", "섬유 유연제", "땀", "겨드랑이", "윤활유", "기름", "자외선", "먼지", "진흙", "곰팡이",
+    "잔디", "혈흔", "화장품", "펜", "잉크", "세탁", "건조", "모발 염료", "염색약", "페인트", "치약",
+)
+CATEGORIES = ("음식", "생활")
+
+
+def categorize(title):
+    """제목 키워드로 음식/생활 분류. 음식 키워드만 있으면 음식, 나머지(둘 다/둘 다 없음)는 생활."""
+    t = (title or "").lower()
+    is_food = any(k in t for k in FOOD_KEYWORDS)
+    is_life = any(k in t for k in LIFE_KEYWORDS)
+    return "음식" if is_food and not is_life else "생활"
+
+
+def slugify_title(title: str, idx: int) -> str:
+    slug = (title or "").replace(" ", "_").replace("/", "_").strip("_").lower()
+    return slug or f"untitled_stain_{idx}"
+
+
+def _attach_image(item):
+    from . import asset_manifest
+
+    title = (item.get("title") or "").strip()
+    base = IMG_MAP.get(title) or item.get("slug")  # slug와 파일명이 같다면 fallback
+    image = f"stain_image/{base}.webp" if base else ""
+    # 실제 파일이 없으면 기본 이미지 (존재 여부는 자산 매니페스트 조회)
+    if not asset_manifest.exists(image):
+        image = "stain_image/blood.webp"
+    item["image"] = image
+    item["image_url"] = asset_manifest.url(image)
+    return item
+
+
+def _detail_context(item):
+    raw_detail = item.get("detail", {})
+    return {
+        "title": item.get("title", "정보 없음"),
+        "washing_steps": item.get("Washing_Steps", []),
+        "detail_info": {k.replace("_", " "): v for k, v in raw_detail.items()},
+        "tip_info": item.get("tip", []),
+        "not_to_do_info": item.get("not_to_do", []),
+        "other_info": item.get("Other_Information", []),
+        "slug": item["slug"],
+    }
+
+
+class StainDataset:
+    """persil_v2.json 스냅샷 1개의 가공 결과 (불변)."""
+
+    def __init__(self, snap: kb.Snapshot):
+        self.version = snap.version
+        self.mtime = snap.mtime
+        self.loaded_at = time.time()
+
+        # 레지스트리 데이터는 읽기 전용 → slug/image를 붙일 사본을 만든다
+        source = snap.data.get("washing_tips_categories", []) if isinstance(snap.data, dict) else []
+        items: List[Dict[str, Any]] = []
+        by_slug: Dict[str, Dict[str, Any]] = {}
+        details: Dict[str, Dict[str, Any]] = {}
+        for idx, raw in enumerate(source):
+            item = dict(raw)
+            item["slug"] = slugify_title(item.get("title", ""), idx)
+            # 분류는 로드 시 한 번만. JSON에 category(음식/생활)가 있으면 그 값을 우선
+            if item.get("category") not in CATEGORIES:
+                item["category"] = categorize(item.get("title"))
+            item["frequent"] = item.get("title") in FREQUENT_TITLES
+            _attach_image(item)
+            items.append(item)
+            if item["slug"] not in by_slug:
+                by_slug[item["slug"]] = item
+                details[item["slug"]] = _detail_context(item)
+        self.items = items
+        self.by_slug = by_slug
+        self.details = details
+
+        frequent, categorized = [], {c: [] for c in CATEGORIES}
+        for s in items:
+            if s["frequent"]:
+                frequent.append(s)
+            else:
+                categorized[s["category"]].append(s)
+        self.listing = {"frequent_stains": frequent, "categorized_stains": categorized}
+
+        # 이 버전 전용 렌더링 캐시 (버전이 바뀌면 객체째 버려짐)
+        self._guide_html: Optional[str] = None
+        self._detail_html: Dict[str, str] = {}
+
+    def __len__(self):
+        return len(self.items)
+
+    @property
+    def last_modified(self) -> Optional[datetime]:
+        return datetime.fromtimestamp(self.mtime, tz=timezone.utc) if self.mtime else None
+
+    def detail_etag(self, slug: str) -> Optional[str]:
+        if slug not in self.details:
+            return None
+        # 헤더는 ASCII여야 하므로 slug(한글)는 해시로
+        key = hashlib.sha1(slug.encode("utf-8")).hexdigest()[:12]
+        return f'"{key}-{int((self.mtime or 0) * 1000)}"'
+
+    def guide_html(self) -> str:
+        # 사용자와 무관한 페이지 → 처음 한 번 렌더링한 HTML을 그대로 재사용
+        if self._guide_html is None:
+            self._guide_html = render_to_string("laundry_manager/stain-upload.html", self.listing)
+        return self._guide_html
+
+    def detail_html(self, slug: str) -> Optional[str]:
+        context = self.details.get(slug)
+        if context is None:
+            return None
+        html = self._detail_html.get(slug)
+        if html is None:
+            html = self._detail_html[slug] = render_to_string("laundry_manager/stain-info.html", context)
+        return html
+
+
+_lock = threading.Lock()
+_active: Optional[StainDataset] = None
+_last_error: Optional[str] = None
+
+
+def current() -> StainDataset:
+    """현재 버전. 파일이 바뀌었으면 새 스냅샷을 만들어 교체한 뒤 반환."""
+    global _active, _last_error
+    snap = kb.load(kb.STAINS)
+    active = _active
+    if active is not None and snap.mtime is not None and active.mtime == snap.mtime:
+        return active
+    if snap.mtime is None:
+        # 파일 읽기/파싱 실패 → 마지막 정상 버전 유지 (없으면 빈 데이터, 캐시하지 않음)
+        _last_error = f"{snap.path} 로드 실패"
+        return active if active is not None else StainDataset(snap)
+
+    with _lock:
+        if _active is None or _active.mtime != snap.mtime:
+            try:
+                dataset = StainDataset(snap)
+            except Exception as e:
+                logger.exception("얼룩 데이터 가공 실패: %s", snap.version)
+                _last_error = f"{snap.version}: {e}"
+                return _active if _active is not None else StainDataset(kb.Snapshot(snap.path, None, {}, kb.FrozenDict()))
+            if _active is not None:
+                logger.info("얼룩 데이터 교체: %s → %s", _active.version, dataset.version)
+            _active = dataset
+            _last_error = None
+        return _active
+
+
+def status() -> Dict[str, Any]:
+    active = _active
+    return {
+        "version": active.version if active else None,
+        "count": len(active) if active else 0,
+        "loaded_at": datetime.fromtimestamp(active.loaded_at, tz=timezone.utc).isoformat() if active else None,
+        "last_error": _last_error,
+    }
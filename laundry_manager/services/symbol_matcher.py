@@ -0,0 +1,138 @@
+# laundry_manager/services/symbol_matcher.py
+"""
+washing_symbol.json 키워드 매처 (정의 파일당 1회 빌드).
+
+- 역색인: 키워드의 모든 부분 문자열 → 정의 인덱스
+  ("입력이 키워드에 포함" 판정을 O(1) 조회로)
+- Aho-Corasick 오토마톤: 텍스트 한 번 스캔으로 "키워드가 텍스트에 포함"된 모든 정의 수집
+
+순서 규칙: 결과는 항상 정의 파일 순서(인덱스 오름차순)이며 정의당 한 번만 나온다.
+기존 함수들은 "파일 순서상 첫 매칭"을 쓰므로 결과의 첫 항목과 같다.
+"""
+import threading
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+
+class SymbolMatcher:
+    def __init__(self, definitions, lower: bool = False):
+        self.definitions = list(definitions or [])
+        self.lower = lower
+
+        # 부분 문자열 역색인 (빈 문자열 포함: "" in keyword는 항상 참)
+        self._substr: Dict[str, int] = {}
+        # Aho-Corasick: goto/fail/출력(정의 인덱스 튜플, 오름차순)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[tuple] = [()]
+
+        own: List[set] = [set()]
+        for idx, item in enumerate(self.definitions):
+            for keyword in item.get("keywords", []):
+                key = self._fold(keyword)
+                n = len(key)
+                for i in range(n + 1):
+                    for j in range(i, n + 1):
+                        self._substr.setdefault(key[i:j], idx)
+                node = 0
+                for ch in key:
+                    nxt = self._goto[node].get(ch)
+                    if nxt is None:
+                        nxt = len(self._goto)
+                        self._goto[node][ch] = nxt
+                        self._goto.append({})
+                        self._fail.append(0)
+                        self._out.append(())
+                        own.append(set())
+                    node = nxt
+                own[node].add(idx)
+
+        # BFS로 fail 링크 연결 + 출력 병합
+        self._out[0] = tuple(sorted(own[0]))
+        queue = deque()
+        for nxt in self._goto[0].values():
+            self._out[nxt] = tuple(sorted(own[nxt] | set(self._out[0])))
+            queue.append(nxt)
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                f = self._fail[node]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                fail = self._goto[f].get(ch, 0)
+                if fail == nxt:
+                    fail = 0
+                self._fail[nxt] = fail
+                self._out[nxt] = tuple(sorted(own[nxt] | set(self._out[fail])))
+                queue.append(nxt)
+
+    def _fold(self, s: str) -> str:
+        return s.lower() if self.lower else s
+
+    # ---- 조회 ---------------------------------------------------------------
+    def indexes_in_text(self, text: str) -> List[int]:
+        """키워드가 text 안에 나타나는 정의 인덱스들(파일 순서)."""
+        hits = set(self._out[0])
+        node = 0
+        goto, fail, out = self._goto, self._fail, self._out
+        for ch in self._fold(text or ""):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if out[node]:
+                hits.update(out[node])
+        return sorted(hits)
+
+    def scan(self, text: str) -> List[Dict[str, Any]]:
+        """텍스트 1회 스캔 → [{"id", "description"}, ...] (파일 순서)."""
+        return [
+            {"id": self.definitions[i].get("id"), "description": self.definitions[i].get("description")}
+            for i in self.indexes_in_text(text)
+        ]
+
+    def first_in_text(self, text: str) -> Optional[Dict[str, Any]]:
+        """키워드가 text에 포함된 첫 정의(utils.get_washing_symbol_definition 규칙)."""
+        hits = self.indexes_in_text(text)
+        return self.definitions[hits[0]] if hits else None
+
+    def match_input(self, user_input: str) -> Optional[Dict[str, Any]]:
+        """
+        keyword in user_input 또는 user_input in keyword 인 첫 정의
+        (recommend.is_similar 규칙).
+        """
+        key = self._fold(user_input)
+        cands = self.indexes_in_text(key)
+        sub = self._substr.get(key)
+        if sub is not None:
+            cands.append(sub)
+        return self.definitions[min(cands)] if cands else None
+
+
+# ---- 매처 캐시 -------------------------------------------------------------
+# 정의 객체(레지스트리 스냅샷 데이터) 동일성 기준 캐시. 스냅샷이 바뀌면 새로 빌드.
+# 요청 스레드들이 같이 쓰므로 목록 조회/교체는 잠금 안에서(빌드는 잠금 밖, 먼저 넣은 쪽을 사용)
+_MAX_CACHED = 4
+_cache: List[tuple] = []
+_cache_lock = threading.Lock()
+
+
+def _cached(definitions, lower: bool) -> Optional[SymbolMatcher]:
+    for defs, flag, matcher in _cache:
+        if defs is definitions and flag == lower:
+            return matcher
+    return None
+
+
+def matcher_for(definitions, lower: bool = False) -> SymbolMatcher:
+    with _cache_lock:
+        matcher = _cached(definitions, lower)
+    if matcher is not None:
+        return matcher
+    built = SymbolMatcher(definitions, lower=lower)
+    with _cache_lock:
+        matcher = _cached(definitions, lower)
+        if matcher is None:
+            matcher = built
+            _cache.append((definitions, lower, matcher))
+            del _cache[:-_MAX_CACHED]
+    return matcher
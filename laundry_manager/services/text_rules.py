@@ -1,6 +1,6 @@
 # laundry_manager/services/text_rules.py
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import os, re, json
 from django.conf import settings
 
@@ -62,66 +62,137 @@ RULES = [
     },
 ]
 
-def _normalize_texts(texts: List[str]) -> str:
-    import re
-    joined = " ".join([t or "" for t in texts])
-    joined = re.sub(r"\s+", " ", joined).strip()
-    return joined
-
 def _normalize(texts: List[str]) -> str:
     s = " ".join([t or "" for t in texts])
     return re.sub(r"\s+", " ", s).strip()
 
+
+class RuleEngine:
+    """
+    RULES를 한 번 컴파일해 두고, 정규화된 텍스트를 한 번만 스캔해서
+    지시문(instructions)과 표시 라벨(keywords)을 함께 만든다.
+
+    - 모든 keyword/negation 패턴을 이름 있는 그룹의 lookahead로 묶은 단일 정규식
+      (같은 위치에서 겹치는 패턴도 모두 잡힘)
+    - 앞쪽 대체(alternation) lookahead로 후보 위치에서만 멈춤
+    """
+
+    _REQUIRED = ("code", "keywords")
+
+    def __init__(self, rules: List[Dict[str, Any]]):
+        self.rules: List[Dict[str, Any]] = []
+        for rule in rules:
+            missing = [k for k in self._REQUIRED if not rule.get(k)]
+            if missing:
+                raise ValueError(f"룰 정의 누락 필드 {missing}: {rule!r}")
+            self.rules.append({
+                "code": rule["code"],
+                "display": rule.get("display", rule["code"]),
+                "keywords": list(rule["keywords"]),
+                "negations": list(rule.get("negations") or []),
+                "positive_msg": rule.get("positive_msg", ""),
+                "negative_msg": rule.get("negative_msg", ""),
+                "category": rule.get("category", ""),
+            })
+
+        # 패턴 문자열 → 그룹 이름 (중복 패턴은 한 번만)
+        self._groups: Dict[str, str] = {}
+        for rule in self.rules:
+            for pat in rule["keywords"] + rule["negations"]:
+                if pat not in self._groups:
+                    re.compile(pat)  # 잘못된 패턴은 여기서 바로 에러
+                    self._groups[pat] = f"_p{len(self._groups)}"
+
+        self._names = {g: pat for pat, g in self._groups.items()}
+        if self._groups:
+            anchor = "|".join(f"(?:{pat})" for pat in self._groups)
+            captures = "".join(f"(?:(?=(?P<{g}>{pat})))?" for pat, g in self._groups.items())
+            self._scanner = re.compile(f"(?=(?:{anchor})){captures}", re.IGNORECASE)
+        else:
+            self._scanner = None
+
+    @classmethod
+    def from_file(cls, path: str, base_rules: List[Dict[str, Any]] = None) -> "RuleEngine":
+        """
+        JSON/YAML 룰 파일 로드. 파일은 룰 리스트 또는 {"rules": [...]}.
+        base_rules가 있으면 같은 code는 덮어쓰고 새 code는 뒤에 추가한다.
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            if path.endswith((".yaml", ".yml")):
+                try:
+                    import yaml
+                except ImportError as e:
+                    raise ValueError("YAML 룰 파일을 쓰려면 PyYAML이 필요합니다.") from e
+                data = yaml.safe_load(f)
+            else:
+                data = json.load(f)
+        if isinstance(data, dict):
+            data = data.get("rules", [])
+
+        merged = {r["code"]: r for r in (base_rules or [])}
+        for rule in data or []:
+            merged[rule.get("code")] = rule
+        return cls(list(merged.values()))
+
+    def scan(self, text: str) -> set:
+        """텍스트 1회 스캔 → 매치된 패턴 문자열 집합."""
+        if not self._scanner or not text:
+            return set()
+        found = set()
+        for m in self._scanner.finditer(text):
+            for g, v in m.groupdict().items():
+                if v is not None:
+                    found.add(self._names[g])
+        return found
+
+    def evaluate(self, recognized_texts: List[str]) -> Dict[str, List]:
+        """{"instructions": analyze_texts 결과, "keywords": extract_rule_keywords 결과}"""
+        found = self.scan(_normalize(recognized_texts))
+        instructions: List[Dict[str, Any]] = []
+        keywords: List[str] = []
+        for rule in self.rules:
+            if not any(kw in found for kw in rule["keywords"]):
+                continue
+            has_neg = any(ng in found for ng in rule["negations"])
+            instructions.append({
+                "code": rule["code"],
+                "state": "deny" if has_neg else "allow",
+                "message": rule["negative_msg"] if has_neg else rule["positive_msg"],
+                "matched": rule["keywords"] + (rule["negations"] if has_neg else []),
+                "category": rule["category"],
+            })
+            # 중복 제거(라벨 기준) + 원래 순서 유지
+            if rule["display"] not in keywords:
+                keywords.append(rule["display"])
+        return {"instructions": instructions, "keywords": keywords}
+
+
+def _build_engine() -> RuleEngine:
+    # TEXT_RULES_PATH(.json/.yaml)가 있으면 기본 RULES에 병합
+    path = getattr(settings, "TEXT_RULES_PATH", "")
+    if path:
+        if not os.path.isabs(path):
+            path = os.path.join(settings.BASE_DIR, path)
+        return RuleEngine.from_file(path, base_rules=RULES)
+    return RuleEngine(RULES)
+
+
+ENGINE = _build_engine()
+
+
 def analyze_texts(recognized_texts: List[str]) -> List[Dict[str, Any]]:
-    text = _normalize(recognized_texts)
-    results: List[Dict[str, Any]] = []
-    for rule in RULES:
-        has_kw = any(re.search(kw, text, re.IGNORECASE) for kw in rule["keywords"])
-        if not has_kw:
-            continue
-        has_neg = any(re.search(ng, text, re.IGNORECASE) for ng in rule["negations"])
-        results.append({
-            "code": rule["code"],
-            "state": "deny" if has_neg else "allow",
-            "message": rule["negative_msg"] if has_neg else rule["positive_msg"],
-            "matched": rule["keywords"] + (rule["negations"] if has_neg else []),
-            "category": rule["category"],
-        })
-    return results
+    return ENGINE.evaluate(recognized_texts)["instructions"]
 
 def extract_rule_keywords(recognized_texts: List[str]) -> List[str]:
     """
     OCR 텍스트에서 RULES.keyword 정규식이 실제로 매치된 항목만
     RULES.display 라벨로 모아 반환(중복 제거, 원문과 무관).
     """
-    text = _normalize_texts(recognized_texts)
-    hits: List[str] = []
-    for rule in RULES:
-        if any(re.search(pat, text, re.IGNORECASE) for pat in rule["keywords"]):
-            hits.append(rule.get("display", rule["code"]))
-    # 중복 제거(라벨 기준) + 원래 순서 유지
-    seen = set()
-    deduped = []
-    for h in hits:
-        if h in seen: 
-            continue
-        seen.add(h)
-        deduped.append(h)
-    return deduped
-
-
-# output 폴더에서 최신 *_result.json의 recognized_texts 복구 (세션 없을 때 대비)
-def load_latest_recognized_texts_from_output() -> List[str]:
-    output_dir = os.path.join(settings.BASE_DIR, "output")
-    if not os.path.isdir(output_dir):
-        return []
-    cands = [os.path.join(output_dir, f) for f in os.listdir(output_dir) if f.endswith("_result.json")]
-    if not cands:
-        return []
-    latest = max(cands, key=os.path.getmtime)
-    try:
-        with open(latest, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        return data.get("recognized_texts", []) or []
-    except Exception:
-        return []
\ No newline at end of file
+    return ENGINE.evaluate(recognized_texts)["keywords"]
+
+
+# 요청 세션(로그인 시 사용자 포함)의 최신 인식 결과에서 recognized_texts 복구 (세션 값이 없을 때 대비)
+# 예전에는 output/ 전체를 훑어 전역 최신 파일을 골랐음 → 동시 사용자 결과가 섞였다
+def load_latest_recognized_texts_from_output(session_key: Optional[str] = None, user=None) -> List[str]:
+    from .result_store import latest_texts
+    return latest_texts(session_key, user)
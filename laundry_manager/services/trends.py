@@ -0,0 +1,208 @@
+# laundry_manager/services/trends.py
+"""
+네이버 DataLab 검색어 트렌드 기반 사전 "인기 세탁 정보" 순위.
+
+- 키워드 그룹: "all"(사전 전체 제목) + 사전 카테고리 키별 그룹
+- refresh(): 제목마다 DataLab 그룹 1개(최대 5그룹/호출). 모든 호출에 기준(anchor) 제목을 끼워 넣고
+  기준 점수로 배치 간 비율을 보정 → 전체 제목을 한 번만 조회해 모든 그룹 순위를 TrendRanking에 저장
+- ranking(): 테이블만 읽는다. 만료됐으면 백그라운드 스레드로 갱신만 걸고 기존 순위를 그대로 반환
+  → DataLab이 느리거나 죽어도 사전 페이지는 기다리지 않음
+- 주기 갱신: `python manage.py refresh_trends` (cron) 또는 만료 시 자동 갱신(NAVER_TREND_BACKGROUND)
+"""
+import logging
+import re
+import threading
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.utils import timezone
+
+from ..models import TrendRanking
+from . import http_client
+from . import knowledge_base as kb
+
+logger = logging.getLogger(__name__)
+
+DATALAB_URL = "https://naveropenapi.apigw.ntruss.com/datalab/v1/search"
+ALL_GROUP = "all"
+# DataLab 제한: 호출당 keywordGroups 5개, 그룹당 keywords 20개
+_GROUPS_PER_CALL = 5
+
+_lock = threading.Lock()
+_refreshing = False
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def _credentials_ok() -> bool:
+    return bool(_setting("NAVER_CLIENT_ID", "") and _setting("NAVER_CLIENT_SECRET", ""))
+
+
+# ---- 사전 → 키워드 그룹 / 표시용 카탈로그 (사전 파일 스냅샷마다 1회 계산) -------------
+def _build_catalog(snap) -> Dict[str, Dict[str, str]]:
+    # 이미지/주소는 항목 id·slug 기준 (knowledge_base._index_dictionary)
+    return {
+        title: {"title": title, "slug": e["slug"], "image_filename": e["image"]}
+        for title, e in snap.index.get("by_title", {}).items()
+    }
+
+
+def _build_groups(snap) -> Dict[str, List[str]]:
+    data = snap.data
+    groups: Dict[str, List[str]] = {ALL_GROUP: []}
+    for category_key in data:
+        titles = [item["title"] for item in data.get(category_key, []) if item.get("title")]
+        groups[category_key] = list(dict.fromkeys(titles))
+        groups[ALL_GROUP].extend(titles)
+    groups[ALL_GROUP] = list(dict.fromkeys(groups[ALL_GROUP]))
+    return groups
+
+
+def catalog() -> Dict[str, Dict[str, str]]:
+    return kb.derived(kb.DICTIONARY, "trend_catalog", _build_catalog)
+
+
+def keyword_groups() -> Dict[str, List[str]]:
+    return kb.derived(kb.DICTIONARY, "trend_groups", _build_groups)
+
+
+def query_terms(title: str) -> List[str]:
+    """'세제(Detergent)' → ['세제', 'Detergent'] (괄호 속 영문도 같은 그룹의 검색어로)."""
+    terms = [t.strip() for t in re.split(r"[()]", title) if t.strip()]
+    return list(dict.fromkeys(terms))[:20] or [title]
+
+
+# ---- DataLab 호출 -------------------------------------------------------------
+def _period():
+    months = int(_setting("NAVER_TREND_MONTHS", 3))
+    today = date.today()
+    total = today.year * 12 + (today.month - 1) - months
+    sy, sm = divmod(total, 12)
+    return date(sy, sm + 1, 1).strftime("%Y-%m-%d"), today.strftime("%Y-%m-%d")
+
+
+def _call(titles: List[str], start: str, end: str) -> Dict[str, float]:
+    """제목별 평균 검색 비율(해당 호출 안에서 최댓값 100 기준)."""
+    body = {
+        "startDate": start,
+        "endDate": end,
+        "timeUnit": "month",
+        "keywordGroups": [{"groupName": t, "keywords": query_terms(t)} for t in titles],
+    }
+    headers = {
+        "X-NCP-APIGW-API-KEY-ID": _setting("NAVER_CLIENT_ID", ""),
+        "X-NCP-APIGW-API-KEY": _setting("NAVER_CLIENT_SECRET", ""),
+    }
+    resp = http_client.post("naver_datalab", DATALAB_URL, json=body, headers=headers)
+    resp.raise_for_status()
+    results = resp.json().get("results", [])
+    periods = max((len(r.get("data", [])) for r in results), default=0) or 1
+    return {r.get("title"): sum(float(p.get("ratio", 0)) for p in r.get("data", [])) / periods for r in results}
+
+
+def fetch_scores(titles: List[str]) -> Dict[str, float]:
+    """
+    전체 제목 점수. 첫 배치에서 가장 높은 제목을 기준으로 삼고,
+    이후 배치마다 기준을 함께 조회해 (첫 배치 기준 점수 / 이번 배치 기준 점수)로 환산.
+    """
+    if not titles:
+        return {}
+    start, end = _period()
+    first = titles[:_GROUPS_PER_CALL]
+    scores = _call(first, start, end)
+    anchor = max(first, key=lambda t: scores.get(t, 0.0))
+    ref = scores.get(anchor, 0.0)
+
+    rest = titles[_GROUPS_PER_CALL:]
+    step = _GROUPS_PER_CALL - 1
+    for i in range(0, len(rest), step):
+        batch = rest[i:i + step]
+        got = _call(batch + [anchor], start, end)
+        base = got.get(anchor, 0.0)
+        factor = ref / base if ref and base else 1.0
+        for t in batch:
+            scores[t] = got.get(t, 0.0) * factor
+    return scores
+
+
+# ---- 갱신 ----------------------------------------------------------------------
+def refresh(force: bool = False) -> Dict[str, Any]:
+    """만료된 그룹(또는 force 시 전체) 순위 갱신. 실패하면 기존 순위는 두고 error만 기록."""
+    groups = keyword_groups()
+    now = timezone.now()
+    fresh = set(
+        TrendRanking.objects.filter(group__in=list(groups), expires_at__gt=now).values_list("group", flat=True)
+    )
+    targets = [g for g in groups if force or g not in fresh]
+    if not targets:
+        return {"refreshed": [], "skipped": len(groups), "error": None}
+    if not _credentials_ok():
+        return {"refreshed": [], "skipped": len(groups), "error": "NAVER_CLIENT_ID/SECRET 미설정"}
+
+    try:
+        titles = list(dict.fromkeys(t for g in targets for t in groups[g]))
+        scores = fetch_scores(titles)
+    except Exception as e:
+        logger.warning("네이버 트렌드 갱신 실패: %s", e)
+        # 실패 시 재시도 간격만큼 만료를 미뤄 매 요청마다 다시 부르지 않게 함
+        retry_at = now + timedelta(seconds=int(_setting("NAVER_TREND_RETRY_SECONDS", 600)))
+        for g in targets:
+            TrendRanking.objects.update_or_create(group=g, defaults={"expires_at": retry_at, "error": str(e)[:1000]})
+        return {"refreshed": [], "skipped": len(groups) - len(targets), "error": str(e)}
+
+    expires = now + timedelta(seconds=int(_setting("NAVER_TREND_TTL", 24 * 3600)))
+    for g in targets:
+        ranked = sorted(groups[g], key=lambda t: -scores.get(t, 0.0))
+        TrendRanking.objects.update_or_create(group=g, defaults={
+            "ranking": [{"title": t, "score": round(scores.get(t, 0.0), 4)} for t in ranked],
+            "refreshed_at": now,
+            "expires_at": expires,
+            "error": "",
+        })
+    return {"refreshed": targets, "skipped": len(groups) - len(targets), "error": None}
+
+
+def _refresh_worker():
+    global _refreshing
+    close_old_connections()
+    try:
+        refresh()
+    except Exception:
+        logger.exception("네이버 트렌드 백그라운드 갱신 실패")
+    finally:
+        close_old_connections()
+        with _lock:
+            _refreshing = False
+
+
+def refresh_in_background() -> bool:
+    """갱신 스레드 1개만(single-flight) 띄운다. 새로 띄웠으면 True."""
+    global _refreshing
+    if not (_setting("NAVER_TREND_BACKGROUND", True) and _credentials_ok()):
+        return False
+    with _lock:
+        if _refreshing:
+            return False
+        _refreshing = True
+    threading.Thread(target=_refresh_worker, name="naver-trend-refresh", daemon=True).start()
+    return True
+
+
+# ---- 조회 ----------------------------------------------------------------------
+def ranking(group: str = ALL_GROUP, limit: Optional[int] = None) -> List[Dict[str, str]]:
+    """
+    미리 계산된 순위 → [{"title", "image_filename"}, ...] (템플릿용).
+    아직 순위가 없으면 그룹의 앞쪽 제목으로 채운다(예전 동작과 동일).
+    """
+    limit = limit or int(_setting("NAVER_TREND_TOP", 5))
+    row = TrendRanking.objects.filter(group=group).only("ranking", "expires_at").first()
+    if row is None or row.is_expired:
+        refresh_in_background()
+
+    cat = catalog()
+    titles = [r["title"] for r in row.ranking] if row is not None and row.ranking else keyword_groups().get(group, [])
+    return [cat[t] for t in titles if t in cat][:limit]
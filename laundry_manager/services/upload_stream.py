@@ -0,0 +1,118 @@
+# laundry_manager/services/upload_stream.py
+"""
+업로드 이미지를 메모리에 통째로 올리지 않고 외부 API로 보내는 multipart 본문.
+
+- 파일 경로 / Django File(UploadedFile 포함)의 청크를 그대로 흘려보냄 (CHUNK_SIZE 단위)
+- 본문 길이를 미리 계산 → Content-Length 전송(chunked 인코딩 불필요)
+- 전송하면서 같은 패스에서 SHA-256 계산 (stream.sha256)
+- 반복할 때마다 처음부터 다시 읽으므로 재시도(Retry) 시에도 본문이 온전함
+
+    stream = MultipartStream.for_file("file", request.FILES["image"])
+    http_client.post("roboflow", url, data=stream, headers={"Content-Type": stream.content_type})
+"""
+import hashlib
+import mimetypes
+import os
+import uuid
+from typing import Callable, Iterator, List, Optional, Sequence, Tuple, Union
+
+CHUNK_SIZE = 64 * 1024
+
+ChunkSource = Callable[[], Iterator[bytes]]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\r", " ").replace("\n", " ")
+
+
+def name_of(src) -> str:
+    """경로/파일 객체의 파일명(basename)."""
+    name = src if isinstance(src, (str, os.PathLike)) else getattr(src, "name", "") or "file"
+    return os.path.basename(str(name))
+
+
+def size_of(src) -> int:
+    if isinstance(src, (str, os.PathLike)):
+        return os.path.getsize(src)
+    size = getattr(src, "size", None)
+    if size is None:
+        raise ValueError("크기를 알 수 없는 파일 객체")
+    return int(size)
+
+
+def chunk_source(src, chunk_size: int = CHUNK_SIZE) -> ChunkSource:
+    """호출할 때마다 처음부터 청크를 내는 팩토리."""
+    if isinstance(src, (str, os.PathLike)):
+        def from_path():
+            with open(src, "rb") as f:
+                yield from iter(lambda: f.read(chunk_size), b"")
+        return from_path
+
+    # Django File.chunks()는 seek(0) 후 읽는다
+    return lambda: src.chunks(chunk_size)
+
+
+class MultipartStream:
+    """multipart/form-data 본문 (일반 필드 + 파일 1개)."""
+
+    def __init__(
+        self,
+        file_field: str,
+        filename: str,
+        source: ChunkSource,
+        size: int,
+        fields: Sequence[Tuple[str, Union[str, bytes]]] = (),
+        file_content_type: Optional[str] = None,
+    ):
+        self.boundary = uuid.uuid4().hex
+        self._source = source
+        self._size = size
+        self.sha256: Optional[str] = None
+
+        head: List[bytes] = []
+        for name, value in fields:
+            if isinstance(value, str):
+                value = value.encode("utf-8")
+            head.append(
+                f'--{self.boundary}\r\nContent-Disposition: form-data; name="{_escape(name)}"\r\n\r\n'.encode("utf-8")
+                + value + b"\r\n"
+            )
+        file_head = (
+            f'--{self.boundary}\r\nContent-Disposition: form-data; '
+            f'name="{_escape(file_field)}"; filename="{_escape(filename)}"\r\n'
+        )
+        if file_content_type:
+            file_head += f"Content-Type: {file_content_type}\r\n"
+        head.append((file_head + "\r\n").encode("utf-8"))
+        self._head = b"".join(head)
+        self._tail = f"\r\n--{self.boundary}--\r\n".encode("utf-8")
+
+    @classmethod
+    def for_file(cls, file_field: str, src, fields=(), filename: Optional[str] = None) -> "MultipartStream":
+        """경로 또는 Django File로부터 생성. 파일 Content-Type은 확장자로 추정."""
+        filename = filename or name_of(src)
+        return cls(
+            file_field, filename, chunk_source(src), size_of(src), fields=fields,
+            file_content_type=mimetypes.guess_type(filename)[0],
+        )
+
+    @property
+    def content_type(self) -> str:
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    def __len__(self) -> int:
+        return len(self._head) + self._size + len(self._tail)
+
+    def __iter__(self) -> Iterator[bytes]:
+        h = hashlib.sha256()
+        sent = 0
+        yield self._head
+        for chunk in self._source():
+            h.update(chunk)
+            sent += len(chunk)
+            yield chunk
+        if sent != self._size:
+            # Content-Length와 어긋나면 서버가 본문을 잘못 읽으므로 중단
+            raise IOError(f"파일 크기 불일치: 예상 {self._size}바이트, 실제 {sent}바이트")
+        self.sha256 = h.hexdigest()
+        yield self._tail
@@ -9,4 +9,11 @@ def get_item(dictionary, key):
 
 @register.filter(name='is_list')
 def is_list(value):
-    return isinstance(value, list)
\ No newline at end of file
+    return isinstance(value, list)
+
+
+@register.filter(name='asset_url')
+def asset_url(path):
+    """정적 파일 경로 → 내용 해시가 붙은 URL (services/asset_manifest)"""
+    from laundry_manager.services import asset_manifest
+    return asset_manifest.url(path)
@@ -1,3 +1,895 @@
-from django.test import TestCase
+import json
+import os
+import re
+import shutil
+import tempfile
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from .management.commands.bench_symbol_matcher import _legacy_definition, _legacy_symbol_guide
+from .management.commands.bench_text_rules import _legacy_analyze, _legacy_keywords
+from .models import FavoriteItem, RecognitionJob, RecognitionResult, UploadedImage
+from .services import alias_index, dictionary_search, favorites, jobs, recognition, recommendation, result_store
+from .services import guide_matrix, stain_dataset
+from .services import knowledge_base as kb
+from .services.symbol_matcher import SymbolMatcher, matcher_for
+from .services.text_rules import RULES, RuleEngine
+
+# 첫 사용 시 파일로 만들어 두는 산출물(자산 매니페스트 등)은 저장소가 아니라 임시 디렉터리에
+_ARTIFACTS = tempfile.mkdtemp(prefix="laundry_manager_tests_")
+ARTIFACT_SETTINGS = {
+    "ASSET_MANIFEST_PATH": os.path.join(_ARTIFACTS, "asset_manifest.json"),
+    "LAUNDROMAT_DATASET_PATH": os.path.join(_ARTIFACTS, "laundromats.lmds"),
+    "GUIDE_MATRIX_PATH": os.path.join(_ARTIFACTS, "guide_matrix.pkl"),
+    "OCR_CACHE_DIR": os.path.join(_ARTIFACTS, "ocr_cache"),
+}
+
+
+def tearDownModule():
+    shutil.rmtree(_ARTIFACTS, ignore_errors=True)
+
+
+# ---- 세탁 기호 키워드 매처 (user-002) --------------------------------------------
+class SymbolMatcherTests(SimpleTestCase):
+    """SymbolMatcher가 예전 키워드 루프와 같은 결과(파일 순서상 첫 매칭)를 내는지."""
+
+    def setUp(self):
+        self.defs = kb.get_json(kb.SYMBOLS)
+
+    def _inputs(self):
+        # 모든 키워드 + 키워드의 앞/뒤 일부 + 키워드가 들어간 문장 + 아무것도 안 걸리는 입력
+        out = ["", "없는기호", "ZZZ"]
+        for item in self.defs:
+            for k in item.get("keywords", []):
+                out += [k, k[:2], k[1:], f"라벨에 {k} 표시"]
+        return out
+
+    def test_symbol_guide_matches_legacy_loop(self):
+        from .functions.recommend import get_symbol_guide
+
+        inputs = self._inputs()
+        for value in inputs:
+            with self.subTest(value=value):
+                self.assertEqual(
+                    get_symbol_guide([value], self.defs), _legacy_symbol_guide([value], self.defs)
+                )
+        self.assertEqual(get_symbol_guide(inputs, self.defs), _legacy_symbol_guide(inputs, self.defs))
+
+    def test_first_in_text_matches_legacy_definition(self):
+        matcher = matcher_for(self.defs, lower=True)
+        texts = [" ".join(k for k in item.get("keywords", [])[:1]) for item in self.defs]
+        texts += ["Do Not Bleach 30°C 손세탁", "아무 관련 없는 문장", "WASH AT 40 hand wash"]
+        for text in texts:
+            with self.subTest(text=text):
+                found = matcher.first_in_text(text)
+                self.assertEqual(
+                    found["description"] if found else None, _legacy_definition(text.lower(), self.defs)
+                )
+
+    def test_results_follow_file_order(self):
+        defs = [
+            {"id": "b", "keywords": ["물세탁"], "description": "B"},
+            {"id": "a", "keywords": ["세탁"], "description": "A"},
+        ]
+        matcher = SymbolMatcher(defs)
+        # 두 정의 모두 걸리면 파일 순서상 앞의 것
+        self.assertEqual(matcher.first_in_text("찬물세탁")["id"], "b")
+        self.assertEqual([d["id"] for d in matcher.scan("찬물세탁")], ["b", "a"])
+        self.assertEqual(matcher.match_input("세")["id"], "b")
+        self.assertIsNone(matcher.match_input("건조"))
+
+    def test_matcher_for_reuses_instance_per_definitions(self):
+        self.assertIs(matcher_for(self.defs), matcher_for(self.defs))
+        self.assertIsNot(matcher_for(self.defs), matcher_for(list(self.defs)))
+
+    def test_matcher_for_concurrent_callers_share_one_instance(self):
+        from concurrent.futures import ThreadPoolExecutor
+
+        defs = list(self.defs)
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            found = list(pool.map(lambda _: matcher_for(defs), range(32)))
+        self.assertTrue(all(m is found[0] for m in found))
+
+
+# ---- 텍스트 룰 엔진 (user-003) ----------------------------------------------------
+class RuleEngineTests(SimpleTestCase):
+    """RuleEngine.evaluate()가 예전 룰·패턴별 re.search 루프와 같은 결과를 내는지."""
+
+    TEXTS = [
+        [],
+        [""],
+        ["손세탁", "금지"],
+        ["손 세탁 하세요"],
+        ["드라이클리닝", "다림질 불가"],
+        ["물세탁 금지", "건조기 사용 가능", "표백제 사용 불가"],
+        ["세탁기 사용 가능", "텀블 건조 하지 마세요"],
+        ["DRY CLEAN", "손  빨래", "회전식   건조 금지"],
+        ["드라이 클리닝 하지 말것, 다리미 사용", "염소계  표백 금지"],
+        ["관련 없는 문장", None],
+    ]
+
+    def setUp(self):
+        self.engine = RuleEngine(RULES)
+
+    def _texts(self):
+        texts = list(self.TEXTS)
+        # 모든 키워드 × (부정 없음 / 규칙의 첫 부정어) 조합
+        for rule in RULES:
+            for kw in rule["keywords"]:
+                sample = kw.replace(r"\s*", " ")
+                texts.append([sample])
+                for ng in rule["negations"][:1]:
+                    texts.append([sample, ng.replace(r"\s*", " ")])
+        return texts
+
+    def test_matches_legacy_loop(self):
+        for texts in self._texts():
+            with self.subTest(texts=texts):
+                result = self.engine.evaluate(texts)
+                self.assertEqual(result["instructions"], _legacy_analyze(texts))
+                self.assertEqual(result["keywords"], _legacy_keywords(texts))
+
+    def test_all_rules_in_one_text(self):
+        texts = [" ".join(kw.replace(r"\s*", "") for rule in RULES for kw in rule["keywords"]), "금지"]
+        result = self.engine.evaluate(texts)
+        self.assertEqual(result["instructions"], _legacy_analyze(texts))
+        self.assertEqual([i["code"] for i in result["instructions"]], [r["code"] for r in RULES])
+
+    def test_rejects_incomplete_rule(self):
+        with self.assertRaises(ValueError):
+            RuleEngine([{"code": "x", "keywords": []}])
+
+    def test_from_file_merges_by_code(self):
+        extra = [
+            {"code": "iron", "display": "스팀 다림질", "keywords": ["스팀"]},
+            {"code": "wring", "display": "비틀어 짜기", "keywords": ["비틀어\\s*짜"], "negations": ["금지"]},
+        ]
+        with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False, encoding="utf-8") as f:
+            json.dump({"rules": extra}, f, ensure_ascii=False)
+        self.addCleanup(os.remove, f.name)
+
+        engine = RuleEngine.from_file(f.name, base_rules=RULES)
+        codes = [r["code"] for r in engine.rules]
+        self.assertEqual(codes, [r["code"] for r in RULES] + ["wring"])
+        result = engine.evaluate(["스팀 가능", "비틀어 짜기 금지"])
+        self.assertEqual(result["keywords"], ["스팀 다림질", "비틀어 짜기"])
+        # 같은 code는 룰 전체를 덮어씀 → 새 iron 룰에는 부정어가 없어 allow
+        self.assertEqual([i["state"] for i in result["instructions"]], ["allow", "deny"])
+
+
+# ---- 사전 상세 페이지 (user-014) --------------------------------------------------
+@override_settings(**ARTIFACT_SETTINGS)
+class DictionaryDetailTests(TestCase):
+    def setUp(self):
+        self.entry = kb.get_index(kb.DICTIONARY, "entries")[0]
+        self.url = reverse("dictionary_detail", args=[self.entry["slug"]])
+
+    def test_detail_has_etag_and_revalidates(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, self.entry["title"])
+        self.assertTrue(response["ETag"])
+        self.assertIn("must-revalidate", response["Cache-Control"])
+
+        again = self.client.get(self.url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(again.status_code, 304)
+        self.assertEqual(again.content, b"")
+
+        stale = self.client.get(self.url, HTTP_IF_NONE_MATCH='"d0-stale"')
+        self.assertEqual(stale.status_code, 200)
+
+    def test_title_and_id_resolve_to_same_page(self):
+        etag = self.client.get(self.url)["ETag"]
+        for key in (self.entry["title"], str(self.entry["id"])):
+            with self.subTest(key=key):
+                response = self.client.get(reverse("dictionary_detail", args=[key]))
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response["ETag"], etag)
+
+    def test_unknown_entry_is_404(self):
+        response = self.client.get(reverse("dictionary_detail", args=["없는-항목-zzz"]))
+        self.assertEqual(response.status_code, 404)
+
+
+# ---- 즐겨찾기 일괄 변경 (user-015) -------------------------------------------------
+@override_settings(**ARTIFACT_SETTINGS)
+class FavoritesBulkTests(TestCase):
+    def setUp(self):
+        # 테스트마다 DB는 롤백되지만 캐시(사용자 pk 키)는 남으므로 비움
+        cache.clear()
+        self.user = get_user_model().objects.create_user("fav", password="pw-12345")
+        self.client.force_login(self.user)
+        self.url = reverse("dictionary_favorites")
+        self.titles = [e["title"] for e in kb.get_index(kb.DICTIONARY, "entries")[:3]]
+
+    def _post(self, body):
+        return self.client.post(self.url, json.dumps(body, ensure_ascii=False), content_type="application/json")
+
+    def test_add_and_remove_in_one_request(self):
+        a, b, c = self.titles
+        response = self._post({"add": [a, b, f" {a} ", "사전에 없는 제목"]})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["added"], [a, b])
+        self.assertEqual(response.json()["titles"], sorted([a, b]))
+
+        response = self._post({"add": [c], "remove": [a, "사전에 없는 제목"]})
+        self.assertEqual(response.json()["removed"], 1)
+        self.assertEqual(response.json()["titles"], sorted([b, c]))
+        self.assertEqual(
+            set(FavoriteItem.objects.filter(user=self.user).values_list("title", flat=True)), {b, c}
+        )
+        self.assertEqual(self.client.get(self.url).json()["titles"], sorted([b, c]))
+
+    def test_add_is_idempotent(self):
+        a = self.titles[0]
+        self._post({"add": [a]})
+        self._post({"add": [a]})
+        self.assertEqual(FavoriteItem.objects.filter(user=self.user, title=a).count(), 1)
+
+    def test_titles_cache_is_invalidated_on_write(self):
+        a = self.titles[0]
+        self.assertEqual(favorites.titles(self.user), frozenset())  # 빈 집합이 캐시됨
+        favorites.add(self.user, [a])
+        self.assertEqual(favorites.titles(self.user), frozenset([a]))
+        favorites.remove(self.user, [a])
+        self.assertEqual(favorites.titles(self.user), frozenset())
+
+    def test_entries_follow_dictionary_order(self):
+        favorites.add(self.user, list(reversed(self.titles)))
+        self.assertEqual([e["title"] for e in favorites.entries(self.user)], self.titles)
+
+    def test_rejects_bad_payload(self):
+        for body in ('{"add": "제목"}', "[1, 2]", "not json"):
+            with self.subTest(body=body):
+                response = self.client.post(self.url, body, content_type="application/json")
+                self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.client.put(self.url).status_code, 405)
+
+    def test_requires_login(self):
+        self.client.logout()
+        self.assertEqual(self.client.get(self.url).status_code, 302)
+
+
+# ---- 주변 빨래방 조회 (user-016) ---------------------------------------------------
+@override_settings(**ARTIFACT_SETTINGS)
+class LaundromatsNearbyTests(TestCase):
+    LAT, LNG = 37.5401931, 127.069415  # 워시엔조이 건대자양점
+
+    def setUp(self):
+        self.url = reverse("laundromats_nearby")
+
+    def test_results_sorted_by_distance(self):
+        response = self.client.get(self.url, {"lat": self.LAT, "lng": self.LNG, "radius": 3000})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertGreater(data["count"], 1)
+        self.assertEqual(data["count"], len(data["results"]))
+        self.assertEqual(data["results"][0]["name"], "워시엔조이 건대자양점")
+        distances = [r["distance_m"] for r in data["results"]]
+        self.assertEqual(distances, sorted(distances))
+        self.assertTrue(all(d <= 3000 for d in distances))
+
+    def test_limit_and_radius_are_clamped(self):
+        data = self.client.get(self.url, {"lat": self.LAT, "lng": self.LNG, "limit": 1}).json()
+        self.assertEqual(data["count"], 1)
+        data = self.client.get(self.url, {"lat": self.LAT, "lng": self.LNG, "limit": 0, "radius": -5}).json()
+        self.assertLessEqual(data["count"], 1)
+        data = self.client.get(self.url, {"lat": 0, "lng": 0, "radius": 1e308, "limit": 1e300}).json()
+        self.assertEqual(data["count"], 0)  # 반경 상한(MAX_RADIUS_M) 밖
+
+    def test_invalid_query_is_400(self):
+        for params in (
+            {},
+            {"lat": self.LAT},
+            {"lat": "abc", "lng": self.LNG},
+            {"lat": 91, "lng": self.LNG},
+            {"lat": self.LAT, "lng": -181},
+            {"lat": "nan", "lng": self.LNG},
+            {"lat": self.LAT, "lng": self.LNG, "limit": "inf"},
+            {"lat": self.LAT, "lng": self.LNG, "radius": "nan"},
+            {"lat": self.LAT, "lng": self.LNG, "radius": "-inf"},
+        ):
+            with self.subTest(params=params):
+                response = self.client.get(self.url, params)
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.json()["status"], "error")
+
+
+# ---- 소재/얼룩 별칭 색인 (user-023) -------------------------------------------------
+class AliasIndexTests(SimpleTestCase):
+    def setUp(self):
+        self.materials = alias_index.materials()
+        self.stains = alias_index.stains()
+
+    def _best(self, index, query):
+        found = index.best(query)
+        return found.name if found else None
+
+    def test_exact_and_derived_aliases(self):
+        cases = [
+            (self.materials, "면", "면(Cotton)"),
+            (self.materials, "COTTON", "면(Cotton)"),
+            (self.materials, "면 (Cotton)", "면(Cotton)"),
+            (self.materials, "코튼", "면(Cotton)"),
+            (self.materials, "나일론", "폴리(Poly)"),
+            (self.materials, "아크릴", "폴리(Poly)"),
+            (self.stains, "커피", "커피"),
+            (self.stains, "땀", "땀 얼룩"),
+            (self.stains, "대변,소변,구토 얼룩", "대변, 소변, 구토 얼룩"),
+        ]
+        for index, query, expected in cases:
+            with self.subTest(query=query):
+                self.assertEqual(self._best(index, query), expected)
+                self.assertEqual(index.match(query)[0].kind, "exact")
+
+    def test_partial_and_typo(self):
+        self.assertEqual(self._best(self.stains, "커피 얼룩"), "커피")
+        self.assertEqual(self._best(self.stains, "겨드랑이"), "땀과 겨드랑이 얼룩")
+        self.assertEqual(self._best(self.materials, "Cotton 100%"), "면(Cotton)")
+        typo = self.stains.best("카피")
+        self.assertEqual((typo.name, typo.kind), ("커피", "fuzzy"))
+
+    def test_short_or_generic_input_is_not_auto_picked(self):
+        # 한 글자 부분 포함은 후보도 아님
+        for query in ("피", "물"):
+            with self.subTest(query=query):
+                self.assertEqual(self.stains.match(query), ())
+        # 여러 얼룩에 똑같이 걸리는 일반어 / 짧은 별칭이 긴 입력의 일부일 뿐인 경우 → 후보만
+        for index, query in ((self.stains, "얼룩"), (self.stains, "소변"), (self.materials, "폴리우레탄")):
+            with self.subTest(query=query):
+                self.assertTrue(index.match(query))
+                self.assertIsNone(index.best(query))
+
+    def test_unknown_input(self):
+        self.assertEqual(self.materials.match(""), ())
+        self.assertIsNone(self.materials.best("알 수 없는 소재 zzz"))
+
+    def test_confident_rules(self):
+        Match = alias_index.Match
+        exact = Match(0, "a", 1.0, "exact", "ab")
+        close = [Match(0, "a", 0.8, "contains", "abcd"), Match(1, "b", 0.78, "contains", "abce")]
+        self.assertIs(alias_index.confident("ab", [exact, close[0]]), exact)
+        self.assertIsNone(alias_index.confident("abc", close))  # 1·2위 점수 차 < AMBIGUITY_MARGIN
+        self.assertEqual(alias_index.confident("abc", close[:1]), close[0])
+        # 유일한 부분 포함 후보는 확정, 별칭이 긴 입력의 일부일 뿐이면 덮는 비율 부족으로 제외
+        sole = Match(0, "a", 0.7, "contains", "abcdefgh")
+        self.assertIs(alias_index.confident("ab", [sole]), sole)
+        self.assertIsNone(alias_index.confident("abcdefgh", [Match(0, "a", 0.68, "contained", "ab")]))
+        self.assertIsNone(alias_index.confident("ab", [sole, Match(1, "b", 0.6, "contains", "xabyyyyy")]))
+        self.assertIsNone(alias_index.confident("ab", []))
+
+    def test_upload_page_options_resolve(self):
+        # 업로드 화면 '직접 입력하기' 버튼 값은 모두 확정 후보가 있어야 함(없으면 추천에서 미해결로 빠짐)
+        path = os.path.join(os.path.dirname(__file__), "templates", "laundry_manager", "laundry-upload.html")
+        with open(path, encoding="utf-8") as f:
+            html = f.read()
+        groups = {"material-selection": self.materials, "stain-selection": self.stains}
+        for group_id, index in groups.items():
+            block = html.split(f'id="{group_id}"', 1)[1].split('class="selection-group"', 1)[0]
+            values = re.findall(r'data-value="([^"]+)"', block)
+            self.assertTrue(values, group_id)
+            for value in values:
+                with self.subTest(group=group_id, value=value):
+                    self.assertIsNotNone(index.best(value))
+        self.assertEqual(self._best(self.materials, "청"), "데님(Denim)")
+        self.assertEqual(self._best(self.stains, "과일"), "과일 및 야채 얼룩")
+        self.assertEqual(self._best(self.stains, "기름"), "윤활유 및 기름 얼룩")
+
+    def test_index_is_shared_per_snapshot(self):
+        self.assertIs(alias_index.materials(), self.materials)
+        self.assertIs(alias_index.stains(), self.stains)
+
+
+# ---- 혼방 소재/여러 얼룩 추천 병합 (user-024) -----------------------------------------
+class RecommendationMergeTests(SimpleTestCase):
+    def setUp(self):
+        self.engine = recommendation.RecommendationEngine(maxsize=8)
+
+    def test_canonical_key_ignores_order_and_spacing(self):
+        self.assertEqual(
+            recommendation.canonical("폴리,  면", ["커피", "땀"], ["b", "a"]),
+            recommendation.canonical(["면", "폴리", "면"], ["땀", " 커피 "], ["a", "b"]),
+        )
+        # 얼룩 문자열은 쉼표로 나누지 않는다(제목에 쉼표가 있음)
+        self.assertEqual(
+            recommendation.canonical(stains="대변, 소변, 구토 얼룩")[1], ("대변, 소변, 구토 얼룩",)
+        )
+
+    def test_max_temperature(self):
+        self.assertEqual(recommendation.max_temperature("30~40도"), 40)
+        self.assertEqual(recommendation.max_temperature("세탁 온도 최대 40°C"), 40)
+        self.assertEqual(recommendation.max_temperature("차가운 물세탁"), 30)
+        self.assertEqual(recommendation.max_temperature("물세탁 금지"), 0)
+        self.assertIsNone(recommendation.max_temperature("드라이크리닝"))
+
+    def test_blend_takes_strictest_temperature_and_all_warnings(self):
+        single = {m: self.engine.recommend(m)["material_guide"] for m in ("면", "폴리")}
+        guide = self.engine.recommend("폴리, 면")
+        material = guide["material_guide"]
+        self.assertEqual([g["name"] for g in material["members"]], ["면(Cotton)", "폴리(Poly)"])
+        self.assertEqual(material["max_temperature"], 30)  # 면(찬물) < 폴리(미온수)
+        for g in single.values():
+            self.assertIn(g["warning"], material["warning"])
+            self.assertIn(g["warning"], guide["merged"]["warnings"])
+        self.assertEqual(guide["merged"]["max_temperature"], 30)
+        self.assertFalse(guide["merged"]["no_water_wash"])
+
+    def test_multiple_stains_are_all_kept(self):
+        guide = self.engine.recommend("면", ["커피", "대변, 소변, 구토 얼룩", "커피 얼룩"])
+        stain = guide["stain_guide"]
+        self.assertEqual(guide["merged"]["stains"], ["대변, 소변, 구토 얼룩", "커피"])
+        self.assertEqual(len(stain["members"]), 2)
+        self.assertTrue(any(step.startswith("[커피] ") for step in stain["Washing_Steps"]))
+        self.assertTrue(any(step.startswith("[대변, 소변, 구토 얼룩] ") for step in stain["Washing_Steps"]))
+        self.assertEqual(len(stain["Not_to_do"]), len(set(stain["Not_to_do"])))
+
+    def test_single_and_missing_inputs(self):
+        guide = self.engine.recommend("면")
+        self.assertEqual(guide["material_guide"]["name"], "면(Cotton)")
+        self.assertEqual(guide["stain_guide"], recommendation.NO_STAIN)
+        guide = self.engine.recommend("없는 소재 zzz", ["얼룩"])
+        self.assertIsNone(guide["material_guide"])
+        self.assertEqual(
+            guide["merged"]["unresolved"], {"materials": ["없는 소재 zzz"], "stains": ["얼룩"]}
+        )
+
+    def test_merge_helpers(self):
+        a = {"name": "A", "description": "d1", "warning": "w", "max_temperature": 40}
+        b = {"name": "B", "description": "d2", "warning": "w", "max_temperature": None}
+        merged = recommendation.merge_materials([a, b])
+        self.assertEqual((merged["name"], merged["warning"], merged["max_temperature"]), ("A, B", "w", 40))
+        self.assertIsNone(recommendation.merge_materials([]))
+        self.assertEqual(recommendation.merge_stains([]), recommendation.NO_STAIN)
+
+    def test_results_are_cached_and_read_only(self):
+        first = self.engine.recommend("폴리, 면", ["커피"])
+        self.assertIs(self.engine.recommend(["면", "폴리"], "커피"), first)
+        self.assertEqual(self.engine.stats()["hits"], 1)
+        with self.assertRaises(TypeError):
+            first["merged"]["max_temperature"] = 100
+
+    def test_recommend_many_groups_equal_inputs(self):
+        keys, guides = self.engine.recommend_many([("면, 폴리", ["커피"], []), ("폴리,면", "커피", None), ("울", [], [])])
+        self.assertEqual(keys[0], keys[1])
+        self.assertEqual(len(guides), 2)
+        self.assertEqual(self.engine.stats()["misses"], 2)
+
+
+@override_settings(**ARTIFACT_SETTINGS)
+class UpdateSelectionTests(TestCase):
+    def setUp(self):
+        self.url = reverse("update_selection")
+
+    def test_stain_titles_with_commas_are_not_split(self):
+        response = self.client.post(self.url, {
+            "field": "stains", "value": "커피, 대변, 소변, 구토 얼룩", "materials[]": ["면"],
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["stains_text"], "커피, 대변, 소변, 구토 얼룩")
+
+        response = self.client.post(self.url, {"field": "stains", "value[]": ["대변, 소변, 구토 얼룩"]})
+        self.assertEqual(response.json()["stains_text"], "대변, 소변, 구토 얼룩")
+
+    def test_split_stains(self):
+        from .views.info_flow import _split_stains
+
+        self.assertEqual(_split_stains("커피, 대변, 소변, 구토 얼룩"), ["커피", "대변, 소변, 구토 얼룩"])
+        self.assertEqual(_split_stains("커피,땀"), ["커피", "땀"])
+        self.assertEqual(_split_stains("대변, 소변"), ["대변", "소변"])
+
+    def test_materials_split_on_commas(self):
+        response = self.client.post(self.url, {"field": "materials", "value": "면, 폴리"})
+        self.assertEqual(response.json()["materials_text"], "면, 폴리")
+
+    def test_bad_request(self):
+        self.assertEqual(self.client.post(self.url, {"field": "symbols", "value": "x"}).status_code, 400)
+        self.assertEqual(self.client.post(self.url, {"field": "stains", "value": " "}).status_code, 400)
+
+
+# ---- 일괄 추천 API (user-025) -------------------------------------------------------
+@override_settings(**ARTIFACT_SETTINGS)
+class RecommendBatchTests(TestCase):
+    def setUp(self):
+        self.url = reverse("recommend_batch")
+
+    def _post(self, body, raw=False):
+        payload = body if raw else json.dumps(body, ensure_ascii=False)
+        return self.client.post(self.url, payload, content_type="application/json")
+
+    def test_equal_combinations_share_a_group(self):
+        response = self._post([
+            {"materials": ["면", "폴리"], "stains": ["커피"]},
+            {"materials": ["폴리", " 면"], "stains": "커피"},
+            {"materials": "울"},
+            {"materials": ["면", "폴리"], "stains": ["커피"], "symbols": []},
+        ])
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual((data["count"], data["unique"]), (4, 2))
+        self.assertEqual([r["group"] for r in data["results"]], [0, 0, 1, 0])
+        first = data["groups"][0]
+        self.assertEqual((first["materials"], first["stains"]), (["면", "폴리"], ["커피"]))
+        self.assertEqual(first["merged"]["materials"], ["면(Cotton)", "폴리(Poly)"])
+        self.assertEqual(data["groups"][1]["material_guide"]["name"], "울(Wool)")
+
+    def test_items_wrapper_and_empty_list(self):
+        data = self._post({"items": [{"materials": "면"}]}).json()
+        self.assertEqual((data["count"], data["unique"]), (1, 1))
+        data = self._post([]).json()
+        self.assertEqual((data["count"], data["groups"]), (0, []))
+
+    @override_settings(RECOMMEND_BATCH_MAX=2)
+    def test_rejects_too_many_items(self):
+        response = self._post([{"materials": "면"}] * 3)
+        self.assertEqual(response.status_code, 400)
+
+    def test_rejects_bad_payload(self):
+        for body in ("not json", '{"items": "면"}', '"면"', '[1]', '[{"materials": [1]}]', '[{"stains": {"a": 1}}]'):
+            with self.subTest(body=body):
+                response = self._post(body, raw=True)
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.json()["status"], "error")
+
+    def test_post_only(self):
+        self.assertEqual(self.client.get(self.url).status_code, 405)
+
+
+# ---- OCR·분류 결과 융합 (user-007) ---------------------------------------------------
+class FuseTests(SimpleTestCase):
+    def _labels(self, instructions, confidences):
+        classification = {"raw": {"confidences": confidences}} if confidences is not None else None
+        return {e["code"]: e for e in recognition.fuse(instructions, classification)["labels"]}
+
+    def test_agreement_adds_classifier_score(self):
+        e = self._labels([{"code": "tumble_dry", "state": "allow"}], {"Tumble Dry": 0.8})["tumble_dry"]
+        self.assertEqual((e["state"], e["conflict"], e["score"]), ("allow", False, 0.92))
+        self.assertEqual(e["sources"], ["text", "classifier"])
+
+    def test_conflict_keeps_text_state_and_subtracts(self):
+        text = [{"code": "tumble_dry", "state": "deny"}]
+        e = self._labels(text, {"Tumble Dry": 0.5})["tumble_dry"]
+        self.assertEqual((e["state"], e["classifier_state"], e["conflict"]), ("deny", "allow", True))
+        self.assertEqual(e["score"], 0.4)
+        # 반대 근거가 아주 강해도 0 아래로 내려가지 않음
+        self.assertEqual(self._labels(text, {"Tumble Dry": 1.0})["tumble_dry"]["score"], 0.2)
+
+    def test_classifier_only_and_deny_prefix(self):
+        labels = self._labels([], {"Do-Not Bleach": 0.7})
+        e = labels["bleach"]
+        self.assertEqual((e["state"], e["conflict"], e["score"], e["sources"]), ("deny", False, 0.28, ["classifier"]))
+
+    def test_classifier_allow_and_deny_for_same_code_takes_higher_confidence(self):
+        for confs in ({"Bleach": 0.3, "Do Not Bleach": 0.9}, {"Do Not Bleach": 0.9, "Bleach": 0.3}):
+            with self.subTest(confs=confs):
+                e = self._labels([{"code": "bleach", "state": "allow"}], confs)["bleach"]
+                self.assertEqual((e["classifier_state"], e["classifier_score"], e["conflict"]), ("deny", 0.9, True))
+
+    def test_labels_sorted_by_score(self):
+        fused = recognition.fuse(
+            [{"code": "iron", "state": "allow"}], {"raw": {"predictions": [{"class": "Dry Clean", "confidence": 0.9}]}}
+        )
+        self.assertEqual([e["code"] for e in fused["labels"]], ["iron", "dry_clean"])
+        self.assertEqual(fused["weights"], recognition.FUSION_WEIGHTS)
+        self.assertEqual(recognition.fuse([], None)["labels"], [])
+
+
+# ---- 사전 전문 검색/자동완성 (user-012) -----------------------------------------------
+class DictionarySearchTests(SimpleTestCase):
+    def setUp(self):
+        items = [
+            {"title": "세탁 세제 보관", "description": "세제는 서늘한 곳에"},
+            {"title": "중성 세제", "description": "울/실크용"},
+            {"title": "세제 사용법", "description": "적정량"},
+            {"title": "섬유 유연제", "description": "헹굼 단계에서 넣는다. 세제와 섞지 않는다"},
+            {"title": "건조기", "description": "저온 건조"},
+        ]
+        docs = [
+            {"id": n, "slug": f"doc-{n}", "category": "c", "title": it["title"], "item": it}
+            for n, it in enumerate(items)
+        ]
+        self.index = dictionary_search.SearchIndex(docs)
+
+    def _titles(self, results):
+        return [(r[1] if isinstance(r, tuple) else r)["title"] for r in results]
+
+    def test_title_prefix_then_title_substring_then_body(self):
+        titles = self._titles(self.index.search("세제"))
+        self.assertEqual(titles[0], "세제 사용법")
+        self.assertEqual(set(titles[1:3]), {"세탁 세제 보관", "중성 세제"})
+        self.assertEqual(titles[3], "섬유 유연제")  # 본문에만 있음
+        self.assertNotIn("건조기", titles)
+
+    def test_partial_syllable_and_typo(self):
+        self.assertEqual(self._titles(self.index.search("셎"))[0], "세제 사용법")
+        self.assertIn("세제 사용법", self._titles(self.index.search("세재")))
+        self.assertEqual(self.index.search(""), [])
+        self.assertEqual(self.index.search("zzzz"), [])
+
+    def test_complete_prefers_title_start_then_shorter(self):
+        self.assertEqual(self._titles(self.index.complete("세")), ["세제 사용법", "세탁 세제 보관", "중성 세제"])
+        self.assertEqual(self._titles(self.index.complete("세제")), ["세제 사용법", "중성 세제", "세탁 세제 보관"])
+
+    def test_suggest_fills_with_search_without_duplicates(self):
+        titles = self._titles(self.index.suggest("세제", limit=4))
+        self.assertEqual(titles[:3], ["세제 사용법", "중성 세제", "세탁 세제 보관"])
+        self.assertEqual(titles[3], "섬유 유연제")
+        self.assertEqual(len(titles), len(set(titles)))
+
+    def test_suggest_endpoint(self):
+        data = self.client.get(reverse("dictionary_suggest"), {"q": "드라이", "limit": 2}).json()
+        self.assertEqual(len(data["results"]), 2)
+        self.assertTrue(all(r["title"].startswith("드라이클리닝") for r in data["results"]))
+        self.assertTrue(data["results"][0]["url"].startswith("/"))
+        self.assertEqual(self.client.get(reverse("dictionary_suggest"), {"q": " "}).json()["results"], [])
+
+
+# ---- 얼룩 데이터 무중단 교체 (user-020) ----------------------------------------------
+@override_settings(**ARTIFACT_SETTINGS)
+class StainDatasetReloadTests(SimpleTestCase):
+    def setUp(self):
+        self.path = os.path.join(_ARTIFACTS, f"stains_{self._testMethodName}.json")
+        self._mtime = 1_700_000_000
+        for target, attr, value in (
+            (kb, "STAINS", self.path), (stain_dataset, "_active", None), (stain_dataset, "_last_error", None),
+        ):
+            patcher = mock.patch.object(target, attr, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _write(self, titles=None, raw=None):
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(raw if raw is not None else json.dumps(
+                {"washing_tips_categories": [{"title": t} for t in titles]}, ensure_ascii=False
+            ))
+        # 같은 초 안의 재작성도 새 버전으로 보이도록 mtime을 직접 올림
+        self._mtime += 10
+        os.utime(self.path, (self._mtime, self._mtime))
+
+    def test_reload_swaps_snapshot_and_keeps_old_one_intact(self):
+        self._write(["커피", "껌 얼룩"])
+        first = stain_dataset.current()
+        self.assertIs(stain_dataset.current(), first)
+        self.assertEqual([s["slug"] for s in first.items], ["커피", "껌_얼룩"])
+        self.assertEqual(first.by_slug["껌_얼룩"]["category"], "생활")
+
+        self._write(["커피", "껌 얼룩", "토마토 얼룩"])
+        second = stain_dataset.current()
+        self.assertIsNot(second, first)
+        self.assertEqual((len(first), len(second)), (2, 3))  # 진행 중 요청의 스냅샷은 그대로
+        status = stain_dataset.status()
+        self.assertEqual((status["version"], status["count"], status["last_error"]), (second.version, 3, None))
+
+    def test_broken_file_keeps_last_good_version(self):
+        self._write(["커피"])
+        good = stain_dataset.current()
+        with self.assertLogs("laundry_manager.services.knowledge_base", "WARNING"):
+            self._write(raw="{not json")
+            self.assertIs(stain_dataset.current(), good)
+        self.assertIn("로드 실패", stain_dataset.status()["last_error"])
+
+        self._write(["커피", "녹 얼룩"])
+        self.assertEqual(len(stain_dataset.current()), 2)
+        self.assertIsNone(stain_dataset.status()["last_error"])
+
+    def test_missing_file_without_previous_version_is_not_cached(self):
+        with self.assertLogs("laundry_manager.services.knowledge_base", "WARNING"):
+            empty = stain_dataset.current()
+        self.assertEqual(len(empty), 0)
+        self.assertIsNone(stain_dataset.status()["version"])
+        self._write(["커피"])
+        self.assertEqual(len(stain_dataset.current()), 1)
+
+
+# ---- 소재 × 얼룩 가이드 행렬 (user-022) ---------------------------------------------
+class GuideMatrixFileTests(SimpleTestCase):
+    def setUp(self):
+        self.path = os.path.join(_ARTIFACTS, f"matrix_{self._testMethodName}.pkl")
+        self.addCleanup(self._remove)
+        override = override_settings(GUIDE_MATRIX_PATH=self.path)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.sources = guide_matrix.current_sources()
+
+    def _remove(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def _saved(self, **changes):
+        data = guide_matrix.build_current()
+        data["materials"][0]["name"] = "파일에서 읽음"  # 묶음(pairs)도 같은 객체를 공유
+        data.update(changes)
+        guide_matrix.save(data)
+        return os.stat(self.path).st_mtime_ns
+
+    def _first_material(self, matrix):
+        return matrix.pair(0, None)["material"]["name"]
+
+    def test_fresh_file_is_used(self):
+        self._saved()
+        matrix = guide_matrix._open(self.sources)
+        self.assertEqual(self._first_material(matrix), "파일에서 읽음")
+        self.assertEqual(matrix.lookup("면", "커피")["stain"]["title"], "커피")
+
+    def test_stale_sources_rebuild_in_memory_without_writing(self):
+        before = self._saved(sources={kb.MATERIALS: "old", kb.STAINS: "old"})
+        with self.assertLogs(guide_matrix.logger, "WARNING") as logs:
+            matrix = guide_matrix._open(self.sources)
+        self.assertIn("원본과 다름", logs.output[0])
+        self.assertEqual(self._first_material(matrix), "면(Cotton)")
+        self.assertEqual(matrix.sources, self.sources)
+        self.assertEqual(os.stat(self.path).st_mtime_ns, before)  # 요청 중에는 파일을 고치지 않음
+
+    def test_old_format_or_missing_file_rebuilds(self):
+        self._saved(version=guide_matrix.FORMAT_VERSION - 1)
+        with self.assertLogs(guide_matrix.logger, "WARNING") as logs:
+            self.assertEqual(self._first_material(guide_matrix._open(self.sources)), "면(Cotton)")
+        self.assertIn("버전 불일치", logs.output[0])
+
+        os.remove(self.path)
+        with self.assertLogs(guide_matrix.logger, "WARNING"):
+            guide_matrix._open(self.sources)
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_get_reopens_only_when_source_snapshots_change(self):
+        self._saved()
+        with mock.patch.object(guide_matrix, "_matrix", None), mock.patch.object(guide_matrix, "_versions", None):
+            first = guide_matrix.get()
+            self.assertIs(guide_matrix.get(), first)
+            guide_matrix._versions = ("이전 스냅샷",)
+            with mock.patch.object(guide_matrix, "_open", wraps=guide_matrix._open) as reopened:
+                self.assertIsNot(guide_matrix.get(), first)
+            reopened.assert_called_once_with(self.sources)
+
+
+# ---- 인식 결과 저장소 (user-010) ---------------------------------------------------
+class ResultStoreTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username="store", password="pw")
+
+    def _output(self, filename, texts):
+        return {
+            "filename": f"/media/laundry_symbols/{filename}",
+            "recognized_texts": texts,
+            "symbol_definition": "물세탁 30도",
+            "ocr_raw_response": {"images": [{"fields": [{"inferText": "30℃ 세탁"}]}]},
+            "roboflow_classify_raw": None,
+            "fused_scores": {"면": 0.9},
+        }
+
+    def test_payload_round_trip(self):
+        data = self._output("label.jpg", ["면 100%", "30℃"])
+        row = result_store.save(data, session_key="s1")
+        row.refresh_from_db()
+        out = result_store.as_output(row)
+        # 파일명은 basename만, 원본 응답은 압축 payload에서 그대로 복원
+        self.assertEqual(out, {**data, "filename": "label.jpg", "roboflow_detect_raw": None})
+        self.assertEqual(result_store.decompress(result_store.compress({"한글": [1, None]})), {"한글": [1, None]})
+        self.assertEqual(result_store.decompress(b""), {})
+
+    def test_lookups_are_scoped_to_session_or_user(self):
+        result_store.save(self._output("a.jpg", ["첫"]), session_key="s1")
+        latest = result_store.save(self._output("a.png", ["둘"]), session_key="s1")
+        RecognitionResult.objects.filter(pk=latest.pk).update(created_at=timezone.now() + timedelta(seconds=1))
+        result_store.save(self._output("b.jpg", ["남의 것"]), session_key="s2", user=self.user)
+
+        self.assertEqual(result_store.latest_texts("s1"), ["둘"])
+        self.assertEqual(result_store.latest_texts("", self.user), ["남의 것"])
+        self.assertEqual(result_store.latest_texts(None), [])
+        # 확장자가 달라도 같은 이름이면 최신, 다른 범위의 파일은 안 보임
+        self.assertEqual(result_store.for_filename("a.webp", "s1").pk, latest.pk)
+        self.assertIsNone(result_store.for_filename("b.jpg", "s1"))
+        self.assertIsNotNone(result_store.for_filename("b.jpg", "s1", self.user))
+
+    def test_anonymous_user_is_not_stored(self):
+        from django.contrib.auth.models import AnonymousUser
+
+        row = result_store.save(self._output("a.jpg", []), session_key="s1", user=AnonymousUser())
+        self.assertIsNone(row.user)
+        self.assertIsNone(result_store.latest(None, AnonymousUser()))
+
+
+# ---- 인식 작업 큐 (user-006) -------------------------------------------------------
+class _InlineExecutor:
+    """워커 풀 대신 submit 즉시 실행(호출 기록)."""
+
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, fn, *args):
+        self.submitted.append(args)
+        fn(*args)
+
+
+class RecognitionJobTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username="job", password="pw")
+        self.image = UploadedImage.objects.create(image="laundry_symbols/label.png")
+        self.executor = _InlineExecutor()
+        patcher = mock.patch.object(jobs, "_get_executor", return_value=self.executor)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _fake_ocr(self, result=None, error=None):
+        calls = []
+
+        def handler(job):
+            calls.append(job)
+            if error:
+                raise RuntimeError(error)
+            return result or {"recognized_texts": ["30"]}
+        patcher = mock.patch.dict(jobs.HANDLERS, {"ocr": handler})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return calls
+
+    def test_submit_runs_after_commit_and_keeps_user(self):
+        calls = self._fake_ocr()
+        with self.captureOnCommitCallbacks(execute=True):
+            job = jobs.submit("ocr", self.image, "sess", self.user)
+            self.assertEqual(self.executor.submitted, [])  # 커밋 전에는 제출하지 않음
+        job.refresh_from_db()
+        self.assertEqual(job.status, RecognitionJob.STATUS_DONE)
+        self.assertEqual(jobs.as_status(job)["result"], {"recognized_texts": ["30"]})
+        self.assertEqual(calls[0].user, self.user)
+
+        # 이미 끝난 작업은 다시 실행해도 선점 실패 → 처리기 호출 없음
+        jobs._execute(job.pk)
+        self.assertEqual(len(calls), 1)
+
+    def test_anonymous_user_is_not_stored(self):
+        from django.contrib.auth.models import AnonymousUser
+
+        job = jobs.submit("ocr", self.image, "sess", AnonymousUser())
+        self.assertIsNone(job.user)
+        with self.assertRaises(ValueError):
+            jobs.submit("unknown", self.image)
+
+    def test_run_ocr_passes_job_user_to_recognize(self):
+        job = RecognitionJob.objects.create(kind="ocr", image=self.image, session_key="sess", user=self.user)
+        with mock.patch("laundry_manager.services.image_prep.ensure_derivative", return_value="/tmp/x.jpg"), \
+                mock.patch("laundry_manager.services.recognition.recognize", return_value={"error": None}) as rec:
+            jobs._run_ocr(job)
+        self.assertEqual(rec.call_args.kwargs["user"], self.user)
+        self.assertEqual(rec.call_args.kwargs["session_key"], "sess")
+
+    def test_handler_error_marks_failed(self):
+        self._fake_ocr(error="OCR 오류")
+        job = RecognitionJob.objects.create(kind="ocr", image=self.image)
+        with self.assertLogs(jobs.logger, "ERROR"):
+            jobs._execute(job.pk)
+        job.refresh_from_db()
+        status = jobs.as_status(job)
+        self.assertEqual((status["status"], status["finished"], status["error"]), ("failed", True, "OCR 오류"))
+        self.assertIsNone(status["result"])
+
+    @override_settings(RECOGNITION_JOB_STALE_SECONDS=60)
+    def test_requeue_only_stale_jobs_once(self):
+        calls = self._fake_ocr()
+        job = RecognitionJob.objects.create(kind="ocr", image=self.image, status=RecognitionJob.STATUS_RUNNING)
+
+        # 아직 기준 시간 안 → 그대로
+        self.assertEqual(jobs.requeue_if_stale(job).status, RecognitionJob.STATUS_RUNNING)
+        self.assertEqual(self.executor.submitted, [])
+
+        old = timezone.now() - timedelta(seconds=120)
+        RecognitionJob.objects.filter(pk=job.pk).update(updated_at=old)
+        stale = RecognitionJob.objects.get(pk=job.pk)
+        # 폴링 사이 워커가 진행해 갱신했으면(메모리의 job은 오래된 값) DB 조건에 걸리지 않아 제출 없음
+        RecognitionJob.objects.filter(pk=job.pk).update(updated_at=timezone.now())
+        self.assertEqual(jobs.requeue_if_stale(stale).status, RecognitionJob.STATUS_RUNNING)
+        self.assertEqual(self.executor.submitted, [])
+
+        RecognitionJob.objects.filter(pk=job.pk).update(updated_at=old)
+        with self.assertLogs(jobs.logger, "WARNING"):
+            first = jobs.requeue_if_stale(stale)
+        self.assertEqual(first.status, RecognitionJob.STATUS_DONE)
+        self.assertEqual(len(calls), 1)
+        # 같은 (오래된) 스냅샷으로 다시 폴링해도 이미 다시 넣었으므로 제출 1번뿐
+        jobs.requeue_if_stale(stale)
+        self.assertEqual(len(self.executor.submitted), 1)
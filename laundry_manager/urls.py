@@ -1,6 +1,6 @@
 # laundry_manager/urls.py
 from django.urls import path
-from .views import pages, ocr, stains, info_flow, maps, history, classify
+from .views import pages, ocr, stains, info_flow, maps, history, classify, health
 import laundry_manager.views.dictionary as dictionary_views  # 이전 이슈 피하려고 모듈 임포트
 ## 테스트를 위한 import들 ##
 from django.views.generic import TemplateView
@@ -14,6 +14,7 @@ urlpatterns = [
     path("laundry-upload-page/", pages.laundry_upload_page, name="laundry-upload-page"),
     path("stain-upload/", stains.stain_guide_view, name="stain-upload"),
     path("result/", ocr.result_view, name="result"),
+    path("jobs/<uuid:job_id>/", ocr.job_status_view, name="job_status"),
     # path("history/<int:pk>/update/", info_flow.update_history_field, name="lh_update"),
     path("result/update-selection/", info_flow.update_selection_view, name="update_selection"),
 
@@ -27,8 +28,14 @@ urlpatterns = [
     path("first-info/", info_flow.first_info_view, name="first_info"),
     path("final-info/", info_flow.final_info_view, name="final_info"),
     path("dictionary/", dictionary_views.dictionary_view, name="dictionary"),
+    path("dictionary/suggest/", dictionary_views.dictionary_suggest, name="dictionary_suggest"),
+    path("dictionary/toggle_favorite/", dictionary_views.toggle_favorite, name="toggle_favorite"),
+    path("dictionary/favorites/", dictionary_views.favorites_bulk, name="dictionary_favorites"),
     path("dictionary/<path:item_title>/", dictionary_views.dictionary_detail, name="dictionary_detail"),
     path("map-test/", maps.map_test_view, name="map-test"),
+    path("api/laundromats/nearby/", maps.laundromats_nearby, name="laundromats_nearby"),
+    path("api/recommend/batch/", info_flow.recommend_batch_view, name="recommend_batch"),
+    path("api/recommend/batch", info_flow.recommend_batch_view),  # POST는 슬래시 리다이렉트 불가
     # path("api/shops/mapo/", maps.shops_mapo, name="shops-mapo"),
     # path('laundry-upload/', views.upload_and_classify, name='laundry-upload'),
     path("stain-info/", pages.stain_info_page, name="stain-info"),
@@ -66,6 +73,7 @@ urlpatterns = [
         name="laundry_history_detail",
     ),
     path("classify/", classify.classify_symbol_view, name="classify"),
+    path("health/", health.health_view, name="health"),
 
 
     # ... 기존 라우트들 ...
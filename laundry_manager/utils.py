@@ -2,10 +2,11 @@ import os
 import uuid
 import time
 import json
-import re
-import requests
 from decouple import config
 from django.conf import settings
+from .services import knowledge_base as kb
+from .services.symbol_matcher import matcher_for
+from .services import http_client, upload_stream
 
 # def load_washing_definitions():
 #     path = os.path.join(settings.BASE_DIR, 'laundry_app', 'washing_symbol.json')
@@ -31,9 +32,8 @@ def load_washing_definitions():
     for p in candidates:
         try:
             if p and os.path.exists(p):
-                with open(p, 'r', encoding='utf-8') as f:
-                    print(f"세탁 기호 정의 로드: {p}")
-                    return json.load(f)
+                # 지식 베이스 레지스트리 경유(프로세스당 1회 파싱, 읽기 전용)
+                return kb.get_json(os.path.abspath(p))
         except Exception as e:
             print(f"세탁 기호 정의 로드 오류({p}): {e}")
 
@@ -71,27 +71,29 @@ def symbols_to_guides(labels, definitions):
     return guides
 
 
-def perform_ocr(image_path):
+def perform_ocr(image):
+    """
+    Clova OCR 호출. image는 파일 경로 또는 Django File(UploadedFile 포함).
+    이미지는 청크 단위로 multipart 본문에 흘려보낸다(전체를 메모리에 읽지 않음).
+    """
     secret_key = os.getenv("SECRET_KEY_OCR")
     apigw_url = config("APIGW_URL")
-    ext = os.path.splitext(image_path)[1][1:].lower()
+    name = upload_stream.name_of(image)
+    ext = os.path.splitext(name)[1][1:].lower()
 
     try:
-        with open(image_path, 'rb') as f:
-            image_bytes = f.read()
-
         req_data = {
-            'images': [{'format': ext, 'name': os.path.basename(image_path)}],
+            'images': [{'format': ext, 'name': name}],
             'requestId': str(uuid.uuid4()),
             'version': 'V2',
             'timestamp': int(round(time.time() * 1000))
         }
 
-        headers = {'X-OCR-SECRET': secret_key}
-        files = [('file', image_bytes)]
-        payload = {'message': json.dumps(req_data).encode('UTF-8')}
+        fields = [('message', json.dumps(req_data).encode('UTF-8'))]
+        body = upload_stream.MultipartStream.for_file('file', image, fields=fields, filename='file')
+        headers = {'X-OCR-SECRET': secret_key, 'Content-Type': body.content_type}
 
-        res = requests.post(apigw_url, headers=headers, data=payload, files=files)
+        res = http_client.post("ocr", apigw_url, headers=headers, data=body)
         res.raise_for_status()
         return res.json()
 
@@ -112,26 +114,25 @@ def get_washing_symbol_definition(ocr_result, definitions):
     if not full_text:
         return "텍스트 인식 실패", extracted
 
-    lower_text = full_text.lower()
-
-    for definition in definitions:
-        for keyword in definition.get("keywords", []):
-            key_lower = keyword.lower()
-            if re.match(r'^\d+\s?°?C$', key_lower):
-                if re.search(r'(\d+)\s?°?C', lower_text):
-                    return definition["description"], extracted
-            elif key_lower in lower_text:
-                return definition["description"], extracted
+    # 소문자 기준 "키워드 ⊂ 텍스트"인 파일 순서상 첫 정의 (텍스트 1회 스캔)
+    # 예전 온도 정규식 분기는 소문자 키워드에 대문자 'C'를 매칭해서 실제로는 동작하지 않았음
+    definition = matcher_for(definitions, lower=True).first_in_text(full_text)
+    if definition is not None:
+        return definition["description"], extracted
 
     return "인식된 기호 설명 없음", extracted
 
 
-def classify_laundry_symbol(image_path):
+def classify_laundry_symbol(image):
+    """
+    image: 파일 경로 / Django File, 또는 미리 만든 MultipartStream(전송 후 .sha256 확인용).
+    """
     try:
         api_key = config("ROBOFLOW_API_KEY")
         url = f"https://classify.roboflow.com/laundry-symbols-o1ui8/3?api_key={api_key}"
-        with open(image_path, "rb") as f:
-            res = requests.post(url, files={"file": f})
+        body = image if isinstance(image, upload_stream.MultipartStream) \
+            else upload_stream.MultipartStream.for_file("file", image)
+        res = http_client.post("roboflow", url, data=body, headers={"Content-Type": body.content_type})
         result = res.json()
         pred = result["predictions"][0]
         return pred["class"], pred["confidence"]
@@ -161,9 +162,13 @@ def save_classification_result_json(image_path, classification_result):
 
 
 def save_result_json(image_path, texts, definition, ocr_raw,
-                     rf_detect_raw=None, rf_class_raw=None, fused_scores=None):
-    folder = config("OUTPUT_RESULTS_FOLDER", default="output/")
-    os.makedirs(folder, exist_ok=True)
+                     rf_detect_raw=None, rf_class_raw=None, fused_scores=None,
+                     session_key="", user=None, image=None):
+    """
+    인식 결과를 RecognitionResult 테이블(세션/사용자 인덱스, 원본 응답 압축)에 저장.
+    RESULT_JSON_EXPORT가 켜져 있으면 예전처럼 output/{이름}_result.json도 남긴다(디버깅/벤치마크용).
+    """
+    from .services import result_store
 
     output_data = {
         "filename": os.path.basename(image_path),
@@ -174,7 +179,13 @@ def save_result_json(image_path, texts, definition, ocr_raw,
         "roboflow_classify_raw": rf_class_raw,
         "fused_scores": fused_scores,
     }
+    row = result_store.save(output_data, session_key=session_key, user=user, image=image)
 
+    if not getattr(settings, "RESULT_JSON_EXPORT", True):
+        return row
+
+    folder = config("OUTPUT_RESULTS_FOLDER", default="output/")
+    os.makedirs(folder, exist_ok=True)
     filename = os.path.join(
         folder, f"{os.path.splitext(os.path.basename(image_path))[0]}_result.json"
     )
@@ -184,3 +195,4 @@ def save_result_json(image_path, texts, definition, ocr_raw,
         print(f"결과 저장 완료: {filename}")
     except Exception as e:
         print(f"결과 저장 오류: {e}")
+    return row
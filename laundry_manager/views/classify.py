@@ -1,9 +1,12 @@
 # laundry_manager/views/classify.py
-from django.shortcuts import render
+from django.shortcuts import render, redirect
 from django.contrib import messages
 from django.conf import settings
+from django.urls import reverse
 from ..forms import ImageUploadForm  # 기존 폼 경로에 맞춰 조정
 from .roboflow_client import classify_file
+from ..services import jobs
+from ..services.image_prep import ensure_derivative
 
 def classify_symbol_view(request):
     """
@@ -16,11 +19,27 @@ def classify_symbol_view(request):
         "error": None,
     }
 
+    job_id = request.GET.get("job")
+    if job_id:
+        job = jobs.get_for_session(job_id, request.session.session_key)
+        if job is not None and job.is_finished:
+            context["result"] = job.result
+            context["error"] = job.error or (job.result or {}).get("error")
+        elif job is not None:
+            context["job_pending"] = True
+            context["job_status_url"] = reverse("job_status", args=[job.pk])
+
     if request.method == "POST":
         form = ImageUploadForm(request.POST, request.FILES)
+        if form.is_valid() and jobs.async_requested(request):
+            # 작업 큐 모드: Roboflow 호출은 워커에서, 화면은 상태를 폴링
+            instance = form.save()
+            job = jobs.submit("classify", instance, jobs.session_key_for(request), request.user)
+            return redirect(f"{reverse('classify')}?job={job.pk}")
         if form.is_valid():
             instance = form.save()
-            image_path = instance.image.path
+            # 전처리된 축소본 전송(실패 시 원본)
+            image_path = ensure_derivative(instance)
             result = classify_file(image_path)
             context["form"] = form
             context["result"] = result
@@ -1,107 +1,34 @@
 # laundry_manager/views/dictionary.py
-import os, json, logging
-from datetime import date
-import requests
-from django.conf import settings
+import json, logging, hashlib
 from django.shortcuts import render
-from django.http import JsonResponse
+from django.http import Http404, HttpResponse, JsonResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.urls import reverse
 from urllib.parse import unquote
 from django.template.loader import render_to_string
-from django.contrib.staticfiles.finders import find
-from ..models import FavoriteItem  # FavoriteItem 모델을 import
+from ..services import knowledge_base as kb
+from ..services import trends
+from ..services import dictionary_search
+from ..services import asset_manifest
+from ..services import favorites
 from django.contrib.auth.decorators import login_required
-from django.templatetags.static import static
 
 logger = logging.getLogger(__name__)
 
-# ★ settings.py에서 정의한 값을 사용 (decouple 사용 X)
-NAVER_CLIENT_ID = getattr(settings, "NAVER_CLIENT_ID", "")
-NAVER_CLIENT_SECRET = getattr(settings, "NAVER_CLIENT_SECRET", "")
 
-
-def _load_dictionary_data():
-    try:
-        p = os.path.join(
-            settings.BASE_DIR, "laundry_manager", "json_data", "dictionary.json"
-        )
-
-        with open(p, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except Exception as e:
-        logger.warning("dictionary.json 로드 실패: %s", e)
-        return {}
-
-
-def _ymd(d: date) -> str:
-    return d.strftime("%Y-%m-%d")
-
-
-def _start_end_for_months(months_back: int = 18):
-    today = date.today()
-    total = today.year * 12 + (today.month - 1) - months_back
-    sy, sm = divmod(total, 12)
-    sm += 1
-    start = date(sy, sm, 1)
-    return _ymd(start), _ymd(today)
-
-
-def get_naver_trend_data(keywords, timeframe="today 3-m"):
-    url = "https://naveropenapi.apigw.ntruss.com/datalab/v1/search"
-    headers = {
-        "X-NCP-APIGW-API-KEY-ID": NAVER_CLIENT_ID,
-        "X-NCP-APIGW-API-KEY": NAVER_CLIENT_SECRET,
-        "Content-Type": "application/json",
-    }
-
-    # API 호출을 위해 키워드 그룹을 구성
-    # API는 최대 5개의 키워드 그룹을 지원하지만, 여기서는 전체 키워드를 하나의 그룹으로 묶습니다.
-    # 키워드 수가 너무 많으면 API 오류가 발생할 수 있으니 주의해야 합니다.
-    keyword_groups = [
-        {"groupName": "인기 검색어", "keywords": keywords[:5]}
-    ]  # 최대 5개 키워드만 사용 예시
-
-    body = {
-        "startDate": "2023-01-01",  # 더 긴 기간으로 설정
-        "endDate": "2024-08-31",
-        "timeUnit": "month",
-        "keywordGroups": keyword_groups,
-    }
-
-    try:
-        response = requests.post(url, data=json.dumps(body), headers=headers)
-        # --- 디버깅용 코드 추가 ---
-        print(f"디버깅: API 호출 상태 코드 -> {response.status_code}")
-        print(f"디버깅: API 응답 내용 -> {response.text}")
-        # ------------------------
-
-        if response.status_code == 200:
-            result = response.json()
-
-            # 키워드 데이터를 직접 가져와 반환
-            # result['results'][0]['keywords']에는 API 호출에 사용된 키워드가 들어있습니다.
-            if "results" in result and len(result["results"]) > 0:
-                return result["results"][0]["keywords"]
-            else:
-                return []
-
-    except requests.exceptions.RequestException as e:
-        print(f"네트워크 오류: {e}")
-        return []
+def load_dictionary_data():
+    # 지식 베이스 레지스트리 경유(읽기 전용). 수정이 필요하면 dict(item)으로 복사해서 사용
+    return kb.get_json(kb.DICTIONARY)
 
 
-def load_dictionary_data():
-    try:
-        dictionary_path = os.path.join(
-            settings.BASE_DIR, "laundry_manager", "json_data", "dictionary.json"
-        )
-        with open(dictionary_path, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except FileNotFoundError:
-        print("Error: dictionary.json not found.")
-        return {}
-    except json.JSONDecodeError:
-        print("Error: dictionary.json is not a valid JSON file.")
-        return {}
+def find_entry(key):
+    """slug / 제목 / id → 사전 항목 인덱스 항목(knowledge_base._index_dictionary). 없으면 None."""
+    index = kb.load(kb.DICTIONARY).index
+    key = unquote(key or "").strip()
+    entry = index.get("by_slug", {}).get(key) or index.get("by_title", {}).get(key)
+    if entry is None and key.isdigit():
+        entry = index.get("by_id", {}).get(int(key))
+    return entry
 
 
 def dictionary(request):
@@ -118,40 +45,21 @@ def dictionary(request):
     category_list = list(category_map.values())
     processed_data = {}
 
-    item_index = 0  # 이미지 파일명에 사용할 인덱스를 초기화
+    # 사용자별 캐시된 즐겨찾기 제목 집합 (비로그인은 빈 집합)
+    favorites_titles = favorites.titles(request.user)
 
-    favorites_titles = []
-    if request.user.is_authenticated:
-        favorites_titles = list(
-            FavoriteItem.objects.filter(user=request.user).values_list(
-                "title", flat=True
-            )
-        )
+    by_title = kb.get_index(kb.DICTIONARY, "by_title")
 
     def preprocess_item(item):
         processed = item.copy()
 
-        # The image_url from the JSON is a relative path.
-        # Use Django's `static` tag to get the absolute URL.
-        relative_path = item.get("image_url", "")
+        # 이미지 경로는 항목 id로 정해짐. 존재 여부는 정적 자산 매니페스트에서 조회 (파일시스템 탐색 없음)
+        entry = by_title.get(item.get("title"))
+        relative_path = entry["image"] if entry else ""
+        processed["slug"] = entry["slug"] if entry else item.get("title", "")
         processed["image_url"] = relative_path
-
-        # The rest of your code for finding the file on the server.
-        # Note: `static()` above handles the browser URL.
-        # `find()` below is for server-side file checks.
-
-        # Correct `image_filename` for the `find` function.
-        image_filename = relative_path
-
-        # Use a try-except block to gracefully handle when `find()` fails.
-        try:
-            image_path = find(image_filename)
-            processed["has_image"] = os.path.exists(image_path)
-        except Exception as e:
-            processed["has_image"] = False
-            print(f"Error finding image path for {image_filename}: {e}")
-
-        # ... (rest of your function)
+        processed["has_image"] = asset_manifest.exists(relative_path)
+        processed["is_favorite"] = item.get("title") in favorites_titles
         return processed
 
     if query:
@@ -165,26 +73,14 @@ def dictionary(request):
                     preprocess_item(item) for item in dictionary_data[category_key]
                 ]
         else:
-            for category_key, display_name in category_map.items():
-                items = dictionary_data.get(category_key, [])
-                filtered_items = []
-                for item in items:
-                    search_string = item.get("title", "").lower()
-                    if query.lower() in search_string:
-                        filtered_items.append(preprocess_item(item))
-                if filtered_items:
-                    processed_data[display_name] = filtered_items
-            pass
+            # 전문 검색 인덱스(제목/설명/본문, 자모 n-gram + BM25) → 순위 순서대로 카테고리별 묶음
+            for _score, doc in dictionary_search.search(query, limit=50):
+                display_name = category_map.get(doc["category"], doc["category"])
+                processed_data.setdefault(display_name, []).append(preprocess_item(doc["item"]))
     else:
-        favorites_data_list = []
-        full_dictionary_data = load_dictionary_data()
-        for category_key in full_dictionary_data:
-            for item in full_dictionary_data[category_key]:
-                if item.get("title") in favorites_titles:
-                    favorites_data_list.append(item)
-
+        # 즐겨찾기 집합 ∩ 제목 인덱스 (사전 전체를 다시 훑지 않음)
         processed_data[category_map["enjoy_looking"]] = [
-            preprocess_item(item) for item in favorites_data_list
+            preprocess_item(entry["item"]) for entry in favorites.entries(request.user)
         ]
 
         for category_key, display_name in category_map.items():
@@ -193,30 +89,8 @@ def dictionary(request):
                     preprocess_item(item)
                     for item in dictionary_data.get(category_key, [])
                 ]
-    # Naver Trend API를 활용하여 인기 검색어 목록을 가져오는 로직 추가
-    # 수정할 코드 (views.py 파일 내)
-    all_keyword_data = []
-    temp_item_index = 0
-    for category_key in dictionary_data:
-        for item in dictionary_data.get(category_key, []):
-            temp_item_index += 1
-            title = item.get("title")
-            image_filename = f"dictionary_image/{temp_item_index}.jpg"
-            if title:
-                all_keyword_data.append(
-                    {"title": title, "image_filename": image_filename}
-                )
-
-    unique_keywords_map = {item["title"]: item for item in all_keyword_data}
-    unique_keywords = list(unique_keywords_map.keys())
-
-    # get_naver_trend_data를 한 번만 호출하도록 수정
-    naver_frequent_searches = get_naver_trend_data(unique_keywords)
-
-    frequent_searches = []
-    for keyword in naver_frequent_searches:
-        if keyword in unique_keywords_map:
-            frequent_searches.append(unique_keywords_map[keyword])
+    # 인기 검색어: 백그라운드로 미리 계산된 네이버 트렌드 순위만 읽음 (외부 API를 기다리지 않음)
+    frequent_searches = trends.ranking(trends.ALL_GROUP)
 
     context = {
         "query": query,
@@ -229,51 +103,73 @@ def dictionary(request):
     return render(request, "laundry_manager/dictionary.html", context)
 
 
+def dictionary_suggest(request):
+    """입력 중 자동완성 JSON: GET ?q=...&limit=8"""
+    q = (request.GET.get("q") or "").strip()
+    try:
+        limit = max(1, min(int(request.GET.get("limit", 8)), 20))
+    except ValueError:
+        limit = 8
+    results = [
+        {
+            "id": doc["id"],
+            "title": doc["title"],
+            "category": doc["category"],
+            "url": reverse("dictionary_detail", args=[doc["slug"]]),
+        }
+        for doc in (dictionary_search.suggest(q, limit) if q else [])
+    ]
+    return JsonResponse({"query": q, "results": results})
+
+
 # 과거 호환
 # dictionary = dictionary_view
 dictionary_view = dictionary
 
 
-def dictionary_detail(request, item_title):
-    decoded_title = unquote(item_title)
-    dictionary_data = load_dictionary_data()
-    item_data = None
-    item_index = 0  # Index to track the image filename
-
-    for category_key in dictionary_data:
-        for item in dictionary_data.get(category_key, []):
-            item_index += 1  # Increment the index for each item
-            if item.get("title") == decoded_title:
-                item_data = item
-                break
-        if item_data:
-            break
-
-    if not item_data:
-        return render(
-            request,
-            "laundry_manager/not_found.html",
-            {"message": f"'{decoded_title}'에 대한 세탁 정보를 찾을 수 없습니다."},
+DETAIL_SECTIONS = {
+    "description": "설명",
+    "content": "상세 내용",
+    "Washing_Steps": "세탁 단계",
+    "tip": "팁",
+    "not_to_do": "주의 사항",
+    "Other_Information": "기타 정보",
+}
+
+
+def _detail_page(entry):
+    """
+    항목 id별 상세 페이지 HTML과 ETag. 사용자와 무관한 페이지라 사전 스냅샷 단위로 한 번만 렌더링
+    (dictionary.json이 바뀌면 새 스냅샷과 함께 비워짐).
+    """
+    pages = kb.derived(kb.DICTIONARY, "detail_pages", lambda snap: {})
+    page = pages.get(entry["id"])
+    if page is None:
+        item_data = dict(entry["item"])  # 레지스트리 데이터는 읽기 전용이므로 복사본에 덧붙임
+        item_data["image_filename"] = entry["image"]
+        item_data["image_url"] = asset_manifest.url(entry["image"])
+        html = render_to_string(
+            "laundry_manager/dictionary-detail.html",
+            {"item": item_data, "category_map": DETAIL_SECTIONS},
         )
+        etag = '"d%s-%s"' % (entry["id"], hashlib.sha1(html.encode("utf-8")).hexdigest()[:16])
+        page = pages[entry["id"]] = (html, etag)
+    return page
 
-    # ★★★ This is the key section to add/modify ★★★
-    # Attach the image filename and URL to the item_data
-    item_data["image_filename"] = f"dictionary_image/{item_index}.jpg"
-    item_data["image_url"] = f"/static/{item_data['image_filename']}"
 
-    context = {
-        "item": item_data,
-        "category_map": {
-            "description": "설명",
-            "content": "상세 내용",
-            "Washing_Steps": "세탁 단계",
-            "tip": "팁",
-            "not_to_do": "주의 사항",
-            "Other_Information": "기타 정보",
-        },
-    }
+def dictionary_detail(request, item_title):
+    # item_title: slug(기본) / 제목(예전 링크) / 숫자 id 모두 해시 조회
+    entry = find_entry(item_title)
+    if entry is None:
+        # not_found.html 템플릿이 없어 500이 나던 경로 → 404
+        raise Http404(f"'{unquote(item_title)}'에 대한 세탁 정보를 찾을 수 없습니다.")
 
-    return render(request, "laundry_manager/dictionary-detail.html", context)
+    html, etag = _detail_page(entry)
+    response = HttpResponse(html)
+    response["ETag"] = etag
+    # 매번 ETag로 재검증 → 내용이 같으면 304
+    patch_cache_control(response, max_age=0, must_revalidate=True)
+    return get_conditional_response(request, etag=etag, response=response)
 
 
 @login_required
@@ -291,13 +187,16 @@ def toggle_favorite(request):
 
         if is_favorite:
             # 즐겨찾기 추가 (이미 있으면 무시)
-            FavoriteItem.objects.get_or_create(user=user, title=title)
+            if not favorites.add(user, [title]):
+                return JsonResponse(
+                    {"status": "error", "message": "사전에 없는 항목입니다."}, status=400
+                )
             return JsonResponse(
                 {"status": "success", "message": "즐겨찾기에 추가되었습니다."}
             )
         else:
             # 즐겨찾기 삭제
-            FavoriteItem.objects.filter(user=user, title=title).delete()
+            favorites.remove(user, [title])
             return JsonResponse(
                 {"status": "success", "message": "즐겨찾기에서 제거되었습니다."}
             )
@@ -305,3 +204,36 @@ def toggle_favorite(request):
     return JsonResponse(
         {"status": "error", "message": "잘못된 요청입니다."}, status=405
     )
+
+
+@login_required
+def favorites_bulk(request):
+    """
+    즐겨찾기 일괄 조회/변경.
+    GET  → {"titles": [...]}
+    POST {"add": [제목...], "remove": [제목...]} → 추가/삭제를 각각 쿼리 1번으로
+    """
+    if request.method == "GET":
+        return JsonResponse({"status": "success", "titles": sorted(favorites.titles(request.user))})
+    if request.method != "POST":
+        return JsonResponse({"status": "error", "message": "잘못된 요청입니다."}, status=405)
+
+    try:
+        data = json.loads(request.body or b"{}")
+    except ValueError:
+        return JsonResponse({"status": "error", "message": "JSON 형식이 아닙니다."}, status=400)
+    if not isinstance(data, dict) or not all(
+        isinstance(data.get(k, []), list) for k in ("add", "remove")
+    ):
+        return JsonResponse(
+            {"status": "error", "message": "add/remove는 제목 목록이어야 합니다."}, status=400
+        )
+
+    removed = favorites.remove(request.user, data.get("remove"))
+    added = favorites.add(request.user, data.get("add"))
+    return JsonResponse({
+        "status": "success",
+        "added": added,
+        "removed": removed,
+        "titles": sorted(favorites.titles(request.user)),
+    })
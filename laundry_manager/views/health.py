@@ -0,0 +1,24 @@
+# laundry_manager/views/health.py
+from django.http import JsonResponse
+from django.views.decorators.cache import never_cache
+
+from ..services import http_client
+from ..services import knowledge_base as kb
+from ..services import ocr_cache
+from ..services import recommendation
+from ..services import stain_dataset
+
+
+@never_cache
+def health_view(request):
+    """배포/콘텐츠 갱신 확인용: 현재 사용 중인 데이터 버전."""
+    stains = stain_dataset.current()
+    info = stain_dataset.status()
+    return JsonResponse({
+        "status": "degraded" if info["last_error"] or not len(stains) else "ok",
+        "datasets": {"stains": info},
+        "knowledge_base": kb.versions(),
+        "recommendation_cache": recommendation.get_engine().stats(),
+        "ocr_cache": ocr_cache.stats(),
+        "http": http_client.metrics(),
+    })
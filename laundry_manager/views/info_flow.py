@@ -1,20 +1,39 @@
-import os, json
-from django.http import JsonResponse, HttpResponseBadRequest, HttpResponseRedirect
+import json
+from django.http import JsonResponse, HttpResponseBadRequest
 from django.shortcuts import render, redirect
 from django.views.decorators.csrf import csrf_exempt
-from django.contrib.auth.decorators import login_required
-from ..functions.recommend import laundry_recommend, get_material_guide, get_stain_guide
+from ..functions.recommend import get_material_guide, get_stain_guide
 from ..functions.info import first_info, final_info
 from django.conf import settings
 
 from ..models import LaundryHistory
-from ..functions.recommend import laundry_recommend
 from ..functions.result import format_result
+from ..services import alias_index, recommendation
 
 # 맨 위 import에 몇 개 추가
 from django.views.decorators.http import require_POST
 from django.template.loader import render_to_string
 
+def _split_stains(raw: str) -> list:
+    """
+    '커피, 대변, 소변, 구토 얼룩' → ['커피', '대변, 소변, 구토 얼룩'].
+    쉼표로 나눈 조각을 앞에서부터, 이어 붙였을 때 얼룩 별칭과 정확히 일치하는 가장 긴 묶음으로 합친다.
+    """
+    index = alias_index.stains()
+    parts = [x.strip() for x in raw.split(",") if x.strip()]
+    out, i = [], 0
+    while i < len(parts):
+        j = len(parts)
+        while j > i + 1:
+            found = index.best(", ".join(parts[i:j]), fuzzy=False)
+            if found is not None and found.kind == "exact":
+                break
+            j -= 1
+        out.append(", ".join(parts[i:j]))
+        i = j
+    return out
+
+
 # ===== 여기부터 새로 추가 =====
 @require_POST
 def update_selection_view(request):
@@ -23,6 +42,8 @@ def update_selection_view(request):
     요청 파라미터:
       - field: 'materials' | 'stains'
       - value: 사용자가 수정한 문자열 (쉼표 허용: '면, 폴리에스터')
+               얼룩은 제목 자체에 쉼표가 있을 수 있어('대변, 소변, 구토 얼룩') 얼룩 색인과 대조하며 나눔
+      - value[]: (선택) 얼룩을 목록으로 보낼 때 — 있으면 나누지 않고 그대로 사용
       - materials[]: 현재 선택(리스트) — field가 stains일 때 기준값으로 사용
       - stains[]: 현재 선택(리스트) — field가 materials일 때 기준값으로 사용
       - symbols[]: 현재 선택(리스트) — 항상 필요
@@ -39,29 +60,24 @@ def update_selection_view(request):
 
     # 모달에서 변경된 값 적용
     raw_value = (request.POST.get("value") or "").strip()
-    if not raw_value:
+    value_list = [x.strip() for x in request.POST.getlist("value[]") if x.strip()]
+    if not (raw_value or value_list):
         return HttpResponseBadRequest("empty value")
 
     if field == "materials":
         # 쉼표로 여러 개 입력 허용
-        materials = [x.strip() for x in raw_value.split(",") if x.strip()]
+        materials = value_list or [x.strip() for x in raw_value.split(",") if x.strip()]
     else:  # field == "stains"
-        # 단일 대표 얼룩만 사용(필요 시 쉼표 분리로 복수 처리 가능)
-        stains = [x.strip() for x in raw_value.split(",") if x.strip()]
-        if not stains:
-            stains = [""]  # 빈 문자열로 안전 처리
-
-    # 추천 재계산
-    material_json = load_json('blackup.json')
-    stain_json = load_json('persil_v2.json')
-    symbol_json = load_json('washing_symbol.json')
+        # 쉼표로 여러 얼룩 입력 허용(쉼표가 든 얼룩 제목은 한 덩어리로)
+        stains = value_list or _split_stains(raw_value)
 
+    # 추천 재계산: 혼방 소재/여러 얼룩을 각각 찾아 합친 가이드 (같은 조합은 추천 엔진 캐시에서)
     info = {
         "material": ", ".join(materials),
-        "stains": stains[0] if stains else "",
+        "stains": ", ".join(stains),
         "symbols": symbols,
     }
-    guides = laundry_recommend(info, material_json, stain_json, symbol_json)
+    guides = recommendation.recommend(materials, stains, symbols)
 
     # 로그인 + history_id가 있으면 최신 추천을 DB에 반영(선택)
     history_id = request.POST.get("history_id")
@@ -102,28 +118,22 @@ def update_selection_view(request):
 
 
 
-def load_json(filename):
-    path = os.path.join(settings.BASE_DIR, 'laundry_manager', 'json_data', filename)
-    with open(path, 'r', encoding='utf-8') as f:
-        return json.load(f)
-
 def laundry_result_view(request):
     if request.method == "POST":
+        materials = [x.strip() for x in (request.POST.get("material") or "").split(",") if x.strip()]
+        stains = [x.strip() for x in request.POST.getlist("stains") if x.strip()]
         info = {
-            "material": request.POST.get("material"),
-            "stains": request.POST.get("stains"),
+            "material": ", ".join(materials),
+            "stains": ", ".join(stains),
             "symbols": request.POST.getlist("symbols"),
         }
-        material_json = load_json('blackup.json')
-        stain_json = load_json('persil_v2.json')
-        symbol_json = load_json('washing_symbol.json')
-        guides = laundry_recommend(info, material_json, stain_json, symbol_json)
-        return render(request, "laundry_manager/laundry_info.html", {
+        guides = recommendation.recommend(materials, stains, info["symbols"])
+        return render(request, "laundry_manager/laundry-info.html", {
             "material": guides.get('material_guide'),
             "stain": guides.get("stain_guide"),
             "symbols": guides.get("symbol_guide"),
             "info": info,
-            "materials": [info["material"]],
+            "materials": materials,
             "stains": info["stains"],
         })
     return redirect("laundry-upload")
@@ -148,7 +158,8 @@ def first_info_view(request):
         filename = request.POST.get("filename")
         selected_materials = request.POST.getlist("materials[]")
         selected_stains = request.POST.getlist("stains[]")
-        result = first_info(filename=filename, selected_materials=selected_materials, selected_stains=selected_stains)
+        result = first_info(filename=filename, selected_materials=selected_materials, selected_stains=selected_stains,
+                            session_key=request.session.session_key, user=request.user)
         return render(request, "laundry_manager/result.html", {
             "materials": result.get("materials", []),
             "symbols": result.get("symbols", []),
@@ -165,22 +176,17 @@ def final_info_view(request):
         manual_symbols = request.POST.getlist("manual_symbols[]")
         manual_stain = request.POST.get("manual_stain")
 
-        first_result = first_info(filename=filename)
-        final_result = final_info(first_info=first_result,
+        first_result = first_info(filename=filename, session_key=request.session.session_key, user=request.user)
+        manual_stain = (manual_stain or "").strip()
+        final_result = final_info(first_result,
                                   manual_materials=manual_materials,
                                   manual_symbols=manual_symbols,
-                                  manual_stain=manual_stain)
-        # 1. 추천 결과 텍스트 생성
-        material_json = load_json('blackup.json')
-        stain_json = load_json('persil_v2.json')
-        symbol_json = load_json('washing_symbol.json')
-
-        stain_name = final_result.get("stain") or (manual_stain or "")
-        guides = laundry_recommend(
-            {"material": ", ".join(final_result.get("materials", [])),
-             "stains": stain_name,                     
-             "symbols": final_result.get("symbols", [])},
-            material_json, stain_json, symbol_json
+                                  manual_stains=[manual_stain] if manual_stain else None)
+        # 1. 추천 결과 텍스트 생성 (인식/선택/직접 입력한 소재·얼룩 전체를 합친 가이드)
+        final_stains = final_result.get("stains", [])
+        stain_name = ", ".join(final_stains)
+        guides = recommendation.recommend(
+            final_result.get("materials", []), final_stains, final_result.get("symbols", [])
         )
         recommendation_text = format_result(guides)
 
@@ -194,7 +200,7 @@ def final_info_view(request):
                 recommendation_result=recommendation_text
             )
         
-        return render(request, "laundry_manager/laundry_info.html", {
+        return render(request, "laundry_manager/laundry-info.html", {
             "materials": final_result.get("materials", []),
             "symbols": final_result.get("symbols", []),
             "stains": stain_name,
@@ -205,4 +211,65 @@ def final_info_view(request):
                 'stains': stain_name,
                 'material': ", ".join(final_result.get("materials", []))
             }
-        })
\ No newline at end of file
+        })
+
+def _batch_field(item, name):
+    # 문자열 1개 또는 문자열 목록만 허용
+    value = item.get(name)
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, list) and all(isinstance(v, str) for v in value):
+        return value
+    raise ValueError(name)
+
+
+@csrf_exempt
+@require_POST
+def recommend_batch_view(request):
+    """
+    여러 의류의 세탁 가이드를 한 번에 (제휴 빨래방 연동용, HTML 렌더링 없음).
+    POST JSON: [{"materials": [...], "stains": [...], "symbols": [...]}, ...]  (또는 {"items": [...]})
+    → {"status": "success", "count": n, "unique": m,
+       "results": [{"group": i}, ...],            # 입력 순서, groups 색인
+       "groups": [{"materials", "stains", "symbols", "material_guide", "stain_guide",
+                   "symbol_guide", "merged"}, ...]}  # 같은 조합은 1번만 계산/전송
+    """
+    try:
+        data = json.loads(request.body or b"[]")
+    except ValueError:
+        return JsonResponse({"status": "error", "message": "JSON 형식이 아닙니다."}, status=400)
+    items = data.get("items") if isinstance(data, dict) else data
+    if not isinstance(items, list):
+        return JsonResponse({"status": "error", "message": "의류 목록(배열)이어야 합니다."}, status=400)
+    limit = int(getattr(settings, "RECOMMEND_BATCH_MAX", 100))
+    if len(items) > limit:
+        return JsonResponse(
+            {"status": "error", "message": f"한 번에 최대 {limit}개까지 요청할 수 있습니다."}, status=400
+        )
+
+    inputs = []
+    for i, item in enumerate(items):
+        if not isinstance(item, dict):
+            return JsonResponse({"status": "error", "message": f"{i}번째 항목이 객체가 아닙니다."}, status=400)
+        try:
+            inputs.append(tuple(_batch_field(item, k) for k in ("materials", "stains", "symbols")))
+        except ValueError as e:
+            return JsonResponse(
+                {"status": "error", "message": f"{i}번째 항목의 {e}은(는) 문자열 또는 문자열 목록이어야 합니다."},
+                status=400,
+            )
+
+    keys, guides = recommendation.recommend_many(inputs)
+    group_of = {key: n for n, key in enumerate(guides)}
+    return JsonResponse({
+        "status": "success",
+        "count": len(keys),
+        "unique": len(guides),
+        "results": [{"group": group_of[key]} for key in keys],
+        "groups": [
+            {"materials": list(key[0]), "stains": list(key[1]), "symbols": list(key[2]), **guide}
+            for key, guide in guides.items()
+        ],
+    }, json_dumps_params={"ensure_ascii": False})
@@ -1,185 +1,73 @@
 # 인식된 정보 받아오기 / json 파일 매칭 / 세탁 정보 출력
-import os, json, re
-from django.conf import settings
 from django.shortcuts import render, redirect
 from django.views.decorators.http import require_http_methods
 
 # utils 모듈 전체 임포트 (이름 임포트로 인한 ImportError/AttributeError 회피)
 from .. import utils as U
+from ..services import alias_index, guide_matrix
 
 
-# ---- JSON 로더 -------------------------------------------------------------
-def _load_json(filename: str):
-    """앱의 json_data 폴더에서 JSON을 로드. 없으면 안전한 기본 구조 반환."""
-    path = os.path.join(settings.BASE_DIR, "laundry_manager", "json_data", filename)
-    try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except Exception as e:
-        print(f"[dev] JSON 로드 실패 {filename}: {e}")
-        if filename == "blackup.json":
-            return {"material_washing_tips": []}
-        if filename == "persil_v2.json":
-            return []
-        return {}
+# ---- 가이드 조회(미리 만든 소재 × 얼룩 행렬) ----------------------------------
+def _candidates(matches) -> list:
+    """별칭 색인 후보 → [{title, score, kind}] (결과 화면 '혹시 이 얼룩?' 표시용)"""
+    return [{"title": m.name, "score": m.score, "kind": m.kind} for m in matches]
 
 
-# ---- JSON 매칭/요약 유틸 ---------------------------------------------------
-def _first_line(text) -> str:
-    """문자열/리스트/딕셔너리를 받아 첫 문장만 뽑아 간단 요약."""
-    if text is None:
-        return ""
-    # 리스트면 첫 항목
-    if isinstance(text, list):
-        text = text[0] if text else ""
-    # 딕셔너리면 첫 value
-    if isinstance(text, dict):
-        text = next((str(v) for v in text.values() if v), "")
-    t = str(text).strip()
-    for sep in ["\n", "•", "·", "．", ". "]:
-        if sep in t:
-            return t.split(sep)[0].strip()
-    return t
-
-
-def _make_summary(material_guide, stain_guide, symbol_guides):
-    """상단 요약 카드용 텍스트 구성."""
-    wash_summary = _first_line(material_guide.get("description"))
-
-    # 기호로 건조 요약 추론
-    labels = {g.get("label") for g in (symbol_guides or [])}
-    dry_summary = None
-    if "do_not_machine_dry" in labels:
-        dry_summary = "건조기 사용 금지"
-
-    stain_text = stain_guide.get("Washing_Steps") or stain_guide.get("detail")
-    stain_summary = _first_line(stain_text)
-
-    return {
-        "wash": wash_summary or None,
-        "dry": dry_summary,
-        "stain": stain_summary or None,
-    }
-
-
-def _material_guide_from_json(material_name: str, material_json: dict) -> dict:
-    """
-    blackup.json 가정 스키마:
-    {'material_washing_tips': [{material, description, warning}, ...]}
-    """
-    if not material_name:
-        return {}
-    items = material_json.get("material_washing_tips", [])
-    target = material_name.strip().lower()
-    for it in items:
-        name = (it.get("material") or "").strip().lower()
-        if name == target or target in name:
-            return {
-                "name": it.get("material"),
-                "description": it.get("description"),
-                "warning": it.get("warning"),
-            }
-    return {}
-
-
-# ------- 얼룩 매칭(한글/영문, 부분 포함 허용) ---------------------------------
-def _norm(s: str) -> str:
-    """공백/구두점 제거 + 소문자 → 비교용 정규화"""
-    return re.sub(r"[\s\W_]+", "", (s or "").lower())
-
-
-def _candidate_strings_from_item(item):
+def _resolve_stains(matrix, stains):
     """
-    항목에서 매칭 후보 문자열을 최대한 수집.
-    - dict: title/aliases/keywords 등
-    - str : 그 자체를 후보로
-    - list: 내부의 str/dict를 재귀 수집
+    얼룩 이름들 → (행렬 얼룩 id 목록(확실한 후보만, 중복 제거, 입력 순서), 이름마다의 후보를 합친 목록)
+    애매한 이름("얼룩")은 id 없이 후보로만 남아 화면에서 '혹시 이 얼룩?'으로 보여 준다.
     """
-    if isinstance(item, str):
-        return [item]
-
-    if isinstance(item, list):
-        out = []
-        for v in item:
-            out.extend(_candidate_strings_from_item(v))
-        return out
-
-    if isinstance(item, dict):
-        cands = []
-        # 대표 타이틀류
-        for k in ["title", "Title", "name", "Name", "ko", "kr", "korean", "slug", "_key"]:
-            v = item.get(k)
-            if v:
-                cands.append(str(v))
-        # 배열형 키워드/별칭류
-        for k in ["aliases", "keywords", "tags"]:
-            for v in item.get(k) or []:
-                cands.append(str(v))
-        return cands
-
-    return []
-
-
-def _stain_guide_from_json(stain_name: str, stain_json) -> dict:
+    ids, candidates = [], {}
+    for name in stains or []:
+        matches = matrix.stain_matches(name)
+        found = alias_index.confident(name, matches)
+        if found and found.id not in ids:
+            ids.append(found.id)
+        for c in _candidates(matches):
+            # 같은 얼룩이 여러 이름의 후보로 나오면 점수가 높은 쪽
+            if c["title"] not in candidates or c["score"] > candidates[c["title"]]["score"]:
+                candidates[c["title"]] = c
+    return ids, sorted(candidates.values(), key=lambda c: -c["score"])
+
+
+def _join_lines(values) -> str:
+    out = []
+    for v in values:
+        for line in str(v or "").splitlines():
+            if line.strip() and line not in out:
+                out.append(line)
+    return "\n".join(out) or None
+
+
+def _merge_stain_guides(guides):
     """
-    title/aliases/keywords 문자열에 '입력 얼룩명'이 포함되면 매칭(정규화 비교).
-    - dict 항목 우선 매칭
-    - dict가 없고 문자열만 매칭되면 제목만 채운 최소 가이드를 반환
+    여러 얼룩 가이드 → 템플릿이 쓰는 얼룩 가이드 1개.
+    단계는 얼룩 이름을 붙여 이어 붙이고, 주의사항/팁/기타 정보는 중복 없이 합침.
     """
-    if not stain_name:
-        return {}
-
-    target_norm = _norm(stain_name)
-
-    # 순회 리스트 표준화
-    items = []
-    if isinstance(stain_json, list):
-        items = stain_json
-    elif isinstance(stain_json, dict):
-        for k, v in stain_json.items():
-            if isinstance(v, dict):
-                v = {"_key": k, **v}
-            items.append(v)
-
-    best = None            # dict로 매칭된 최선
-    provisional_title = "" # 문자열로만 매칭되었을 때 제목 보관
-
-    for it in items:
-        cands = _candidate_strings_from_item(it)
-        for s in cands:
-            if target_norm in _norm(s):
-                if isinstance(it, dict):
-                    best = it
-                    break
-                else:
-                    # 문자열/리스트에서 찾은 경우: 제목 후보만 확보
-                    provisional_title = s
-        if best:
-            break
-
-    if not best:
-        if provisional_title:
-            # 최소 가이드 반환(제목만)
-            return {
-                "title": provisional_title,
-                "Washing_Steps": None,
-                "detail": None,
-                "tip": None,
-                "Not_to__do": None,
-                "Other_Information": None,
-            }
-        return {}
-
+    if len(guides) <= 1:
+        return guides[0] if guides else {}
     return {
-        "title": best.get("title") or best.get("Title") or best.get("_key") or stain_name,
-        "Washing_Steps": best.get("Washing_Steps"),
-        "detail": best.get("detail"),
-        "tip": best.get("tip"),
-        "Not_to__do": best.get("Not_to__do") or best.get("not_to_do"),
-        "Other_Information": best.get("Other_Information") or best.get("other_information"),
+        "title": ", ".join(g.get("title") or "" for g in guides),
+        "Washing_Steps": _join_lines(
+            f"[{g.get('title')}] {line}"
+            for g in guides for line in str(g.get("Washing_Steps") or "").splitlines() if line.strip()
+        ),
+        "detail": None,
+        "tip": _join_lines(g.get("tip") for g in guides),
+        "Not_to__do": _join_lines(g.get("Not_to__do") for g in guides),
+        "Other_Information": _join_lines(g.get("Other_Information") for g in guides),
     }
 
 
+def _dry_summary(symbol_guides):
+    """기호로 건조 요약 추론."""
+    labels = {g.get("label") for g in (symbol_guides or [])}
+    if "do_not_machine_dry" in labels:
+        return "건조기 사용 금지"
+    return None
+
+
 def _symbols_to_guides_safe(labels, defs_obj):
     """
     utils.symbols_to_guides가 없거나 실패해도 동작하도록 안전 폴백.
@@ -240,14 +128,15 @@ def guide_from_result(request):
     if not (material or stains or symbols):
         return redirect("result")
 
-    # 2) JSON/정의 로드
-    material_json = _load_json("blackup.json")
-    stain_json = _load_json("persil_v2.json")
-    washing_defs = U.load_washing_definitions()  # 런타임 로드(모듈 상단 X)
-
-    # 3) 가이드 구성
-    material_guide = _material_guide_from_json(material, material_json)
-    stain_guide = _stain_guide_from_json(stains[0] if stains else "", stain_json)
+    # 2) 가이드 구성: 소재/얼룩은 행렬에서 id로 조회, 기호 정의는 런타임 로드(모듈 상단 X)
+    #    얼룩은 입력된 것 모두 조회(소재 × 얼룩 묶음마다 미리 만든 가이드/요약을 합침)
+    matrix = guide_matrix.get()
+    material_id = matrix.material_id(material)
+    stain_ids, stain_candidates = _resolve_stains(matrix, stains)
+    bundles = [matrix.pair(material_id, sid) for sid in stain_ids] or [matrix.pair(material_id, None)]
+    material_guide = bundles[0]["material"]
+    stain_guide = _merge_stain_guides([b["stain"] for b in bundles if b["stain"]])
+    washing_defs = U.load_washing_definitions()
     symbol_guides = _symbols_to_guides_safe(symbols, washing_defs)
 
     # 템플릿 호환: 문자열 설명 리스트도 함께 제공
@@ -257,13 +146,19 @@ def guide_from_result(request):
         if (g.get("description") or g.get("name") or g.get("label"))
     ]
 
-    # 4) 상단 요약
-    summary = _make_summary(material_guide, stain_guide, symbol_guides)
+    # 3) 상단 요약 (소재/얼룩 부분은 행렬에 미리 계산됨)
+    stain_summaries = [b["summary"]["stain"] for b in bundles if b["summary"]["stain"]]
+    summary = {
+        **bundles[0]["summary"],
+        "stain": " / ".join(stain_summaries) or None,
+        "dry": _dry_summary(symbol_guides),
+    }
 
-    # 5) 렌더
+    # 4) 렌더
     ctx = {
         "material": material_guide,
         "stain": stain_guide,
+        "stain_guides": [b["stain"] for b in bundles if b["stain"]],
         "symbol_guides": symbol_guides,
         "symbols": symbol_descs,  # 문자열 설명 배열(템플릿 호환)
         "info": {
@@ -273,5 +168,6 @@ def guide_from_result(request):
         "materials": [material] if material else [],
         "stains": stains,
         "summary": summary,
+        "stain_candidates": stain_candidates,
     }
     return render(request, "laundry_manager/laundry-info.html", ctx)
@@ -1,24 +1,50 @@
 # laundry_manager/maps.py
 
-import json
-import os
+import math
 from django.shortcuts import render
 from django.conf import settings
+from django.http import JsonResponse
+from django.urls import reverse
+from ..services import laundromats
+
 
 def map_test_view(request):
     naver_map_client_key = getattr(settings, "NAVER_MAP_CLIENT_KEY", None)
-    file_path = os.path.join(settings.BASE_DIR, 'laundry_manager', 'json_data', 'laundromats.json')
-    laundromats_data = []
-
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            laundromats_data = json.load(f)
-    except Exception as e:
-        print(f"JSON 파일 처리 오류: {e}")
 
+    # 빨래방 목록은 더 이상 페이지에 통째로 싣지 않고, 지도가 보이는 범위만 nearby API로 가져옴
     context = {
         "naver_map_client_key": naver_map_client_key,
-        "laundromats_data": laundromats_data,  # 파이썬 객체를 그대로 전달
+        "nearby_url": reverse("laundromats_nearby"),
     }
 
-    return render(request, "laundry_manager/map-test.html", context)
\ No newline at end of file
+    return render(request, "laundry_manager/map-test.html", context)
+
+
+def _float_param(request, name, default=None):
+    raw = request.GET.get(name)
+    if raw in (None, ""):
+        return default
+    value = float(raw)
+    # "inf"/"nan"도 float()는 받아들이지만 거리/격자 계산에서 500이 남
+    if not math.isfinite(value):
+        raise ValueError(f"{name}: 유한한 숫자가 아님")
+    return value
+
+
+def laundromats_nearby(request):
+    """GET ?lat=&lng=&radius=(m)&limit= → 가까운 빨래방 (거리 오름차순)"""
+    try:
+        lat = _float_param(request, "lat")
+        lng = _float_param(request, "lng")
+        radius = _float_param(request, "radius", laundromats.DEFAULT_RADIUS_M)
+        limit = int(_float_param(request, "limit", laundromats.DEFAULT_LIMIT))
+    except ValueError:
+        return JsonResponse({"status": "error", "message": "lat/lng/radius/limit는 숫자여야 합니다."}, status=400)
+    if lat is None or lng is None or not (-90 <= lat <= 90 and -180 <= lng <= 180):
+        return JsonResponse({"status": "error", "message": "lat/lng 값이 올바르지 않습니다."}, status=400)
+
+    results = [
+        {**shop, "distance_m": round(distance, 1)}
+        for distance, shop in laundromats.nearby(lat, lng, radius, limit)
+    ]
+    return JsonResponse({"status": "success", "count": len(results), "results": results})
@@ -1,34 +1,31 @@
 # laundry_manager/views/ocr.py
 import os
 import uuid
-import json
 from typing import List, Dict, Any, Optional
 
+from django.http import JsonResponse
 from django.shortcuts import render, redirect
 from django.contrib import messages
+from django.urls import reverse
 
 from ..forms import ImageUploadForm
+from ..models import RecognitionJob
 from ..utils import (
-    perform_ocr,
-    get_washing_symbol_definition,
     classify_laundry_symbol,
-    load_washing_definitions,
-    save_result_json,
     save_classification_result_json,
 )
 
+from ..services import jobs, upload_stream
+from ..services.recognition import recognize
+from ..services.image_prep import ensure_derivative
+
 # 룰 엔진 (services/text_rules.py)
 # views/ 폴더 기준 상대 경로 주의: '..services'
 from ..services.text_rules import (
-    analyze_texts,
     load_latest_recognized_texts_from_output,
-    extract_rule_keywords,
+    ENGINE as RULE_ENGINE,
 )
 
-# 세탁 기호 정의 로드(앱 시작 시 1회)
-WASHING_SYMBOLS_DEFINITIONS = load_washing_definitions()
-
-
 def upload_view(request):
     """
     이미지 업로드 → OCR 수행 → 세션 저장 → result 페이지로 리다이렉트
@@ -53,27 +50,36 @@ def upload_view(request):
             context["uploaded_image_url"] = uploaded_instance.image.url
             context["uploaded_image_name"] = uploaded_instance.image.name
 
-            # 2) OCR
-            ocr_result = perform_ocr(image_path)
-            if ocr_result.get("error"):
-                context["error_message"] = ocr_result.get("message", "OCR 오류가 발생했습니다.")
-                return render(request, "laundry_manager/laundry-upload.html", context)
-
-            # 3) OCR 결과 → 세탁 기호 설명 / 인식 텍스트 추출
-            definition, texts = get_washing_symbol_definition(
-                ocr_result, WASHING_SYMBOLS_DEFINITIONS
-            )
-
-            # 4) 세션 저장 (다음 result 페이지에서 사용)
-            request.session["recognized_texts"] = texts or []
-            request.session["symbol_definition"] = definition or ""
             request.session["material"] = request.POST.get("material")
             request.session["stains"] = request.POST.getlist("stains")
 
-            # 5) 로깅/디버깅용 결과 JSON 저장 (output/{원본파일명}_result.json)
-            save_result_json(image_path, texts, definition, ocr_result)
+            # (작업 큐 모드) 작업 id만 받고 바로 반환 → 워커가 OCR/분류/룰 분석 수행
+            if jobs.async_requested(request):
+                job = jobs.submit("ocr", uploaded_instance, jobs.session_key_for(request), request.user)
+                request.session["recognition_job"] = str(job.pk)
+                if _wants_json(request):
+                    return JsonResponse(
+                        {"ok": True, "job_id": str(job.pk), "status_url": reverse("job_status", args=[job.pk])},
+                        status=202,
+                    )
+                return redirect(f"{reverse('result')}?job={job.pk}")
+
+            # 2) OCR + Roboflow 분류 병렬 실행 → 룰 분석/융합 → 결과 저장
+            #    (OCR은 해시 캐시 경유, RecognitionResult에 세션/사용자 기준으로 fused_scores 포함 저장)
+            #    전송은 전처리된 축소본(EXIF 회전/크롭/리사이즈), 원본은 그대로 보관
+            recognized = recognize(
+                ensure_derivative(uploaded_instance), result_path=image_path,
+                session_key=jobs.session_key_for(request), user=request.user, image=uploaded_instance,
+            )
+            if recognized.get("error"):
+                context["error_message"] = recognized["error"]
+                return render(request, "laundry_manager/laundry-upload.html", context)
+
+            # 3) 세션 저장 (다음 result 페이지에서 사용)
+            request.session["recognized_texts"] = recognized["recognized_texts"]
+            request.session["symbol_definition"] = recognized["symbol_definition"]
 
-            # 6) 결과 페이지로 이동
+            # 4) 결과 페이지로 이동
             return redirect("result")
 
         # form.is_valid()가 아니면 아래로 떨어져 템플릿 렌더링
@@ -86,24 +92,40 @@ def result_view(request):
     """
     결과 페이지:
       - 세션에서 recognized_texts, material, stains 등을 가져옴
-      - (옵션) 세션이 비었을 경우 output 폴더의 최신 *_result.json에서 복구
+      - (옵션) 세션이 비었을 경우 이 세션/사용자의 최신 인식 결과(RecognitionResult)에서 복구
       - 룰 엔진으로 지시문 생성(instructions)
       - RULES에 정의된 키워드만 추출(rule_keywords)하여 "인식된 기호"에 표시
     """
+    job_id = request.GET.get("job")
+    if job_id:
+        job = jobs.get_for_session(job_id, request.session.session_key)
+        if job is None:
+            return redirect("result")
+        if job.status == RecognitionJob.STATUS_FAILED:
+            messages.error(request, job.error or "이미지 분석에 실패했습니다.")
+            return redirect("laundry-upload")
+        if job.status != RecognitionJob.STATUS_DONE:
+            # 아직 처리 중: 상태 URL을 폴링하다가 끝나면 새로고침
+            return render(request, "laundry_manager/result.html", {
+                "job_pending": True,
+                "job_status_url": reverse("job_status", args=[job.pk]),
+            })
+        request.session["recognized_texts"] = job.result.get("recognized_texts", [])
+        request.session["symbol_definition"] = job.result.get("symbol_definition", "")
+
     texts: List[str] = request.session.get("recognized_texts", [])
     definition: str = request.session.get("symbol_definition", "")
     material: str = request.session.get("material", "")
     stains: List[str] = request.session.get("stains", [])
 
-    # 세션이 비었을 때 직접 접근/새로고침 대비 복구
+    # 세션이 비었을 때 직접 접근/새로고침 대비 복구 (이 세션/사용자의 최신 결과만)
     if not texts:
-        texts = load_latest_recognized_texts_from_output()
+        texts = load_latest_recognized_texts_from_output(request.session.session_key, request.user)
 
-    # OCR 텍스트 → 룰 엔진 분석
-    instructions = analyze_texts(texts)  # [{code,state,message,...}, ...]
-
-    # OCR 텍스트에서 RULES에 정의된 키워드만 표시용 라벨로 추출
-    rule_keywords = extract_rule_keywords(texts)  # ["드라이클리닝", "손세탁", ...]
+    # OCR 텍스트 → 룰 엔진 1회 스캔으로 지시문 + 표시 라벨 동시 추출
+    evaluated = RULE_ENGINE.evaluate(texts)
+    instructions = evaluated["instructions"]  # [{code,state,message,...}, ...]
+    rule_keywords = evaluated["keywords"]     # ["드라이클리닝", "손세탁", ...]
 
     return render(
         request,
@@ -119,10 +141,26 @@ def result_view(request):
     )
 
 
+def job_status_view(request, job_id):
+    """작업 상태 JSON (요청 세션이 만든 작업만)."""
+    job = jobs.get_for_session(job_id, request.session.session_key)
+    if job is None:
+        return JsonResponse({"ok": False, "error": "작업을 찾을 수 없습니다."}, status=404)
+    job = jobs.requeue_if_stale(job)
+    return JsonResponse({"ok": True, **jobs.as_status(job)})
+
+
+def _wants_json(request) -> bool:
+    return (
+        "application/json" in request.headers.get("Accept", "")
+        or request.headers.get("X-Requested-With") == "XMLHttpRequest"
+    )
+
+
 def upload_and_classify(request):
     """
     (별도) 분류 모델만 돌리는 업로드 엔드포인트.
-    temp/에 저장 후 분류 → JSON 저장 → temp 삭제
+    업로드 청크를 그대로 Roboflow로 스트리밍(임시 파일 없음) → 같은 패스에서 구한 해시로 JSON 저장
     """
     result: Optional[Dict[str, Any]] = None
 
@@ -130,26 +168,12 @@ def upload_and_classify(request):
         form = ImageUploadForm(request.POST, request.FILES)
         if form.is_valid():
             image_file = request.FILES["image"]
+            body = upload_stream.MultipartStream.for_file("file", image_file)
 
-            os.makedirs("temp", exist_ok=True)
-            ext = image_file.name.split(".")[-1]
-            filename = f"{uuid.uuid4().hex}.{ext}"
-            image_path = os.path.join("temp", filename)
-
-            # 파일 저장
-            with open(image_path, "wb+") as dst:
-                for chunk in image_file.chunks():
-                    dst.write(chunk)
-
-            # 분류 수행 및 결과 저장
-            result = classify_laundry_symbol(image_path)
-            save_classification_result_json(image_path, result)
-
-            # 임시 파일 제거
-            try:
-                os.remove(image_path)
-            except OSError:
-                pass
+            # 분류 수행 및 결과 저장 (결과 파일명 = 이미지 내용 해시)
+            result = classify_laundry_symbol(body)
+            ext = os.path.splitext(image_file.name)[1]
+            save_classification_result_json(f"{body.sha256 or uuid.uuid4().hex}{ext}", result)
         else:
             # 검증 실패 시 폼 그대로 렌더
             return render(
@@ -9,9 +9,9 @@ def result_view(request):
     material = request.session.get('material', '')
     stains = request.session.get('stains', [])
 
-    # 세션에 없으면(새로고침/직접접속 등) output 최신 파일에서 복구 (옵션)
+    # 세션에 없으면(새로고침/직접접속 등) 이 세션/사용자의 최신 인식 결과에서 복구 (옵션)
     if not texts:
-        texts = load_latest_recognized_texts_from_output()
+        texts = load_latest_recognized_texts_from_output(request.session.session_key, request.user)
 
     instructions = analyze_texts(texts)
 
@@ -1,27 +1,15 @@
 # laundry_manager/utils/roboflow_client.py
-import io
 import os
 import logging
 import requests
 from typing import Dict, Any, Optional
-from requests.adapters import HTTPAdapter, Retry
 from django.conf import settings
+from ..services import http_client, upload_stream
 
 logger = logging.getLogger(__name__)
 
 _ROBOFLOW_BASE = "https://classify.roboflow.com"
 
-def _session() -> requests.Session:
-    s = requests.Session()
-    retries = Retry(
-        total=3,
-        backoff_factor=0.5,
-        status_forcelist=(429, 500, 502, 503, 504),
-        allowed_methods=frozenset(["GET", "POST"])
-    )
-    s.mount("https://", HTTPAdapter(max_retries=retries))
-    return s
-
 def _endpoint() -> str:
     model = settings.RF_CLASSIFY_MODEL
     version = str(settings.RF_CLASSIFY_VERSION)
@@ -46,9 +34,11 @@ def classify_file(file_path: str) -> Dict[str, Any]:
     }
 
     try:
-        with open(file_path, "rb") as f:
-            files = {"file": f}
-            resp = _session().post(url, params=params, files=files, timeout=20)
+        # 파일은 청크 단위로 스트리밍(전체 버퍼링 없음), 재시도 시 처음부터 다시 읽음
+        body = upload_stream.MultipartStream.for_file("file", file_path)
+        # 공통 풀(keep-alive) + 재시도/서킷 브레이커는 http_client 프로필("roboflow")에서 관리
+        resp = http_client.post("roboflow", url, params=params, data=body,
+                                headers={"Content-Type": body.content_type})
         resp.raise_for_status()
         data = resp.json()
         label, conf = _extract_label_confidence(data, settings.RF_CLASSIFY_THRESHOLD)